@@ -0,0 +1,110 @@
+"""Headless batch renderer: renders every frame of every animation on the chosen actor sets to image files, without
+a window or GPU. Uses Panda3D's software renderer (TinyDisplay) in an offscreen buffer. With --workers, the export
+is split into (actor, animation) shards and rendered across that many processes.
+
+Run from the main directory:
+    ppython batch_render.py [--install-dir DIR] [--output-dir DIR] [--sets SET [SET ...]] [--skelecog]
+                            [--animations ANIM [ANIM ...]] [--size WIDTH HEIGHT] [--format png] [--workers N]
+
+If no install directory is given, the one stored in TTR_INSTALL_PATH is used.
+"""
+import sys
+import os
+import argparse
+# Load config - must happen before any other Panda3D import
+from panda3d.core import loadPrcFile, loadPrcFileData
+
+loadPrcFile("VisorConfig.prc")
+
+import src.globals.visorview_globals as visorview_globals
+
+DEFAULT_SIZE = (800, 600)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Render every frame of every animation to image files, headlessly.")
+    parser.add_argument("--install-dir", help="Toontown Rewritten install directory; defaults to TTR_INSTALL_PATH.")
+    parser.add_argument("--output-dir", default=visorview_globals.BATCH_RENDER_DIR,
+                        help="Directory to write renders to (default: %(default)s).")
+    parser.add_argument("--sets", nargs="+", metavar="SET",
+                        help="Actor sets to render, i.e. sellbots bosses (default: all sets).")
+    parser.add_argument("--skelecog", action="store_true", help="Render cogs as skelecogs.")
+    parser.add_argument("--animations", nargs="+", metavar="ANIM", help="Only render these animations.")
+    parser.add_argument("--size", nargs=2, type=int, default=DEFAULT_SIZE, metavar=("WIDTH", "HEIGHT"),
+                        help="Size of the rendered images (default: %(default)s).")
+    parser.add_argument("--format", default="png", help="Image file format (default: %(default)s).")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of worker processes; 0 uses one per CPU core (default: %(default)s).")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    loadPrcFileData("", visorview_globals.HEADLESS_PRC_DATA)
+    loadPrcFileData("", "win-size {} {}".format(*args.size))
+
+    from panda3d.core import Filename
+    from src.util.phase_files import mount_phase_files, print_mount_report
+
+    if args.install_dir is not None:
+        install_dir = Filename.from_os_specific(args.install_dir)
+    elif os.path.exists("TTR_INSTALL_PATH"):
+        with open("TTR_INSTALL_PATH", "r") as f:
+            install_dir = Filename(f.read())
+    else:
+        print("No install directory given and TTR_INSTALL_PATH does not exist.")
+        sys.exit(1)
+
+    is_success, mount_times, total_mount_time = mount_phase_files(install_dir)
+    if not is_success:
+        print("Failed to mount the phase files in '{}'.".format(install_dir.to_os_specific()))
+        sys.exit(1)
+    print_mount_report(mount_times, total_mount_time)
+
+    from direct.showbase.ShowBase import ShowBase
+    from src.globals.actor_globals import COG_SET_NAMES
+    from src.util.batch_renderer import BatchRenderer, get_render_jobs, write_manifest
+    from src.util.sharded_renderer import ShardedRenderer
+    from src.actors.animation_cache import get_animation_cache
+    from src.util.render_cache import get_render_cache
+
+    set_names = args.sets if args.sets is not None else COG_SET_NAMES
+    for name in set_names:
+        if name not in COG_SET_NAMES:
+            print("Unknown actor set '{}'; expected one of: {}".format(name, ", ".join(COG_SET_NAMES)))
+            sys.exit(1)
+
+    if args.workers == 1:
+        base = ShowBase()
+        renderer = BatchRenderer(args.output_dir, args.format, get_render_cache())
+        for name in set_names:
+            renderer.queue_actor_set(name, args.skelecog, args.animations)
+        print("Rendering {} actors to '{}'...".format(renderer.get_queue_length(), args.output_dir))
+        renderer.run()
+        base.destroy()
+    else:
+        renderer = ShardedRenderer(install_dir, args.output_dir, args.size, args.format,
+                                   args.workers if args.workers > 0 else None)
+        jobs = get_render_jobs(set_names, args.skelecog, args.animations)
+        print("Rendering {} animations to '{}' with {} workers...".format(len(jobs), args.output_dir,
+                                                                         renderer.workers))
+        renderer.run(jobs)
+        if renderer.get_failed_shards():
+            print("{} shards failed and were skipped.".format(len(renderer.get_failed_shards())))
+
+    manifest_path = write_manifest(renderer.get_manifest(), args.output_dir)
+    print("Rendered {} frames in {:.2f} s ({:.1f} fps)".format(renderer.get_frame_count(), renderer.get_render_time(),
+                                                            renderer.get_frames_per_second()))
+    print("Wrote manifest to '{}'".format(manifest_path))
+    if args.workers == 1:
+        cache = get_animation_cache()
+        print("Animation cache: {} animations, {:.2f} MB, {:.0%} hit rate".format(
+            cache.get_num_animations(), cache.get_memory_usage() / (1024 * 1024), cache.get_hit_rate()))
+        render_cache = get_render_cache()
+        if render_cache is not None:
+            print("Render cache: {} renders, {:.2f} MB, {:.0%} hit rate".format(
+                render_cache.get_num_renders(), render_cache.get_size() / (1024 * 1024), render_cache.get_hit_rate()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark comparing the cold-start cost of animation discovery: one glob walk per animation prefix (the old path)
+against a single scan of the character directories (VfsScanner).
+
+Run from the main directory:
+    ppython -m benchmarks.bench_animation_discovery [path to Toontown Rewritten install] [repeats]
+
+If no path is given, the one stored in TTR_INSTALL_PATH is used.
+"""
+import sys
+import os
+import posixpath
+from timeit import default_timer
+from panda3d.core import loadPrcFileData
+
+loadPrcFileData("", "window-type none")
+
+from panda3d.core import Filename
+import src.util.vfs_glob as vfs_glob
+from src.util.vfs_scanner import VfsScanner, CHARACTER_DIRECTORIES
+from src.util.phase_files import mount_phase_files, print_mount_report
+
+# every prefix the actor data modules look up on startup
+ANIMATION_PREFIXES = ("ttr_a_ene_cga_", "ttr_a_ene_cgb_", "ttr_a_ene_cgc_",
+                      "bossCog-head-", "bossCog-torso-", "bossCog-legs-",
+                      "ttr_a_chr_ene_cogGoonie_", "ttr_a_chr_cbg_boss_", "ttr_a_ara_cbe_cogdoSell_")
+DEFAULT_REPEATS = 10
+
+
+def discover_with_glob():
+    """The old path: one glob per prefix."""
+    return [vfs_glob.glob(posixpath.join(CHARACTER_DIRECTORIES, prefix + "*.bam")) for prefix in ANIMATION_PREFIXES]
+
+
+def discover_with_scanner():
+    """The new path: one scan, then a prefix query per prefix."""
+    scanner = VfsScanner()
+    return [scanner.find(prefix) for prefix in ANIMATION_PREFIXES]
+
+
+def time_function(function, repeats):
+    """Calls function repeats times, returning the time taken by each call.
+
+    :rtype: list[float]
+    """
+    times = []
+    for _ in range(repeats):
+        start = default_timer()
+        function()
+        times.append(default_timer() - start)
+    return times
+
+
+def main():
+    if len(sys.argv) > 1:
+        install_dir = Filename.from_os_specific(sys.argv[1])
+    elif os.path.exists("TTR_INSTALL_PATH"):
+        with open("TTR_INSTALL_PATH", "r") as f:
+            install_dir = Filename(f.read())
+    else:
+        print("No install path given and TTR_INSTALL_PATH does not exist.")
+        sys.exit(1)
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_REPEATS
+
+    is_success, mount_times, total_mount_time = mount_phase_files(install_dir)
+    if not is_success:
+        print("Failed to mount the phase files in '{}'.".format(install_dir.to_os_specific()))
+        sys.exit(1)
+    print_mount_report(mount_times, total_mount_time)
+
+    glob_results = discover_with_glob()
+    scanner_results = discover_with_scanner()
+    if [sorted(x) for x in glob_results] != [sorted(x) for x in scanner_results]:
+        print("WARNING: glob and scanner results differ!")
+    print("Found {} animations across {} prefixes.".format(sum(len(x) for x in glob_results),
+                                                            len(ANIMATION_PREFIXES)))
+
+    for name, function in (("glob", discover_with_glob), ("scanner", discover_with_scanner)):
+        times = time_function(function, repeats)
+        print("{:<8} min {:8.2f} ms   mean {:8.2f} ms   ({} runs)".format(
+            name, min(times) * 1000, sum(times) / len(times) * 1000, repeats))
+
+
+if __name__ == "__main__":
+    main()
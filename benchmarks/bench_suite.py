@@ -0,0 +1,361 @@
+"""Benchmark suite for the paths that decide how responsive VisorView feels: mounting the phase files, discovering
+animations, building actors, swapping between them, toggling skelecogs, scrubbing poses and capturing screenshots.
+
+Run from the main directory:
+    ppython -m benchmarks.bench_suite [--install-dir DIR] [--repeats N] [--output FILE] [--baseline FILE]
+                                      [--fixture-animations N] [--fixture-frames MIN MAX]
+
+Unless an install directory is given, the benchmarks run against the synthetic phase files written by
+benchmarks.fixture, which are generated on the first run and reused until the fixture options change. Mounting and
+animation discovery only happen once per process, so every repeat of them runs in a fresh process; everything else runs
+in one process that renders offscreen with the software renderer. The timings are summarized as percentiles and written
+to a JSON file named after the current commit; pass an earlier file as --baseline to compare against it.
+"""
+import sys
+import os
+import json
+import argparse
+import platform
+import subprocess
+import tempfile
+from datetime import datetime, timezone
+from timeit import default_timer
+# Load config - must happen before any other Panda3D import
+from panda3d.core import loadPrcFile, loadPrcFileData
+
+loadPrcFile("VisorConfig.prc")
+
+import src.globals.visorview_globals as visorview_globals
+
+DEFAULT_REPEATS = 20
+RESULTS_DIR = os.path.join("benchmarks", "results")
+PERCENTILES = (50, 90, 99)
+SCRUB_STEP = 0.25  # fraction of a frame the pose scrubbing benchmark moves by
+SCREENSHOT_SIZE = (800, 600)
+HIGH_RESOLUTION_SCREENSHOT_SIZE = (2048, 2048)
+# one actor of each type, as (actor set, index within the set)
+ACTOR_TYPE_SAMPLES = {"cog": ("sellbots", 0), "boss": ("bosses", 0), "goon": ("misc", 0), "generic": ("misc", 5)}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Time loading, swapping and capturing actors.")
+    parser.add_argument("--install-dir",
+                        help="Toontown Rewritten install directory to benchmark against (default: synthetic phase "
+                             "files generated by benchmarks.fixture).")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS,
+                        help="Number of times to run each benchmark (default: %(default)s).")
+    parser.add_argument("--output", help="File to write the results to (default: {}).".format(
+        os.path.join(RESULTS_DIR, "<commit>.json")))
+    parser.add_argument("--baseline", help="Earlier results to compare against.")
+    parser.add_argument("--fixture-animations", type=int, metavar="N",
+                        help="Number of animations to generate for each suit type, boss part, goon and generic actor "
+                             "in the synthetic phase files (default: the named ones only).")
+    parser.add_argument("--fixture-frames", nargs=2, type=int, metavar=("MIN", "MAX"),
+                        help="Pick the length of every animation in the synthetic phase files between MIN and MAX "
+                             "frames.")
+    # used when the suite runs itself in a separate process
+    parser.add_argument("--stage", choices=("cold", "warm"), help=argparse.SUPPRESS)
+    parser.add_argument("--index-file", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def time_function(function, repeats):
+    """Calls function repeats times, returning the time taken by each call.
+
+    :rtype: list[float]
+    """
+    times = []
+    for _ in range(repeats):
+        start = default_timer()
+        function()
+        times.append(default_timer() - start)
+    return times
+
+
+def get_percentile(sorted_times, percentile):
+    """Returns a percentile of a sorted list of times, interpolating between the two nearest times.
+
+    :param sorted_times: The times, sorted from fastest to slowest.
+    :type sorted_times: list[float]
+    :param percentile: The percentile, from 0 to 100.
+    :type percentile: float
+    :rtype: float
+    """
+    position = (len(sorted_times) - 1) * percentile / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_times) - 1)
+    return sorted_times[lower] + (sorted_times[upper] - sorted_times[lower]) * (position - lower)
+
+
+def get_stats(times):
+    """Summarizes a list of times.
+
+    :param times: The times in seconds.
+    :type times: list[float]
+    :return: A dict of the number of runs and the min, max, mean and percentiles of the times in milliseconds.
+    :rtype: dict
+    """
+    sorted_times = sorted(times)
+    stats = {"runs": len(times),
+             "min_ms": sorted_times[0] * 1000,
+             "mean_ms": sum(times) / len(times) * 1000}
+    for percentile in PERCENTILES:
+        stats["p{}_ms".format(percentile)] = get_percentile(sorted_times, percentile) * 1000
+    stats["max_ms"] = sorted_times[-1] * 1000
+    return stats
+
+
+def _mount(install_dir):
+    """Mounts the phase files in install_dir, exiting if they can't be mounted.
+
+    :return: The time taken in seconds.
+    :rtype: float
+    """
+    from panda3d.core import Filename
+    from src.util.phase_files import mount_phase_files
+    start = default_timer()
+    is_success, _, _ = mount_phase_files(Filename.from_os_specific(install_dir))
+    end = default_timer()
+    if not is_success:
+        print("Failed to mount the phase files in '{}'.".format(install_dir))
+        sys.exit(1)
+    return end - start
+
+
+def run_cold_stage(install_dir, index_file):
+    """Times mounting and animation discovery, which can only be timed once per process.
+
+    :param install_dir: The directory holding the phase files.
+    :type install_dir: str
+    :param index_file: The animation index to use. Discovery reads it if it exists, and writes it if it doesn't.
+    :type index_file: str
+    :return: A dict of benchmark names and lists of times.
+    :rtype: dict
+    """
+    import src.actors.cog_actor_data as cog_actor_data
+    import src.actors.boss_actor_data as boss_actor_data
+    import src.actors.goon_actor_data as goon_actor_data
+
+    suffix = ".indexed" if os.path.exists(index_file) else ""
+    visorview_globals.ANIMATION_INDEX_FILE = index_file
+    results = {"mount": [_mount(install_dir)]}
+    for name, function in (("cog", lambda: [cog_actor_data.load_suit_animations(suit_type) for suit_type in "abc"]),
+                           ("boss", boss_actor_data.load_boss_animations),
+                           ("goon", goon_actor_data.load_goon_animations)):
+        results["discovery.{}{}".format(name, suffix)] = time_function(function, 1)
+    return results
+
+
+def _wait_for_animations(manager):
+    """Steps the task manager until every animation the manager is loading has been played."""
+    while any(manager.is_loading_animation(part) for part in manager.get_actor_parts()):
+        base.task_mgr.step()
+
+
+def run_warm_stage(install_dir, repeats):
+    """Times building, swapping, posing and capturing actors, all in this process.
+
+    :param install_dir: The directory holding the phase files.
+    :type install_dir: str
+    :param repeats: The number of times to run each benchmark.
+    :type repeats: int
+    :return: A dict of benchmark names and lists of times.
+    :rtype: dict
+    """
+    loadPrcFileData("", visorview_globals.HEADLESS_PRC_DATA)
+    loadPrcFileData("", "win-size {} {}".format(*SCREENSHOT_SIZE))
+    # run as a module, the main directory is benchmarks/ rather than the one the phase files are mounted to
+    from panda3d.core import Filename
+    loadPrcFileData("", "model-path {}".format(Filename.from_os_specific(os.getcwd())))
+    _mount(install_dir)
+
+    from direct.showbase.ShowBase import ShowBase
+    from src.globals.actor_globals import ACTORS, COG_SET_NAMES
+    from src.actors.actor_manager import ActorManager
+    from src.actors.animation_cache import get_animation_cache
+    from src.actors.skelecog_actor_data import make_skelecog_data_from_cog_data
+    from src.util.screenshot_writer import ScreenshotWriter
+    from src.util.high_resolution_capture import HighResolutionCapture
+
+    ShowBase()
+    results = {}
+
+    # generate_actor per actor type, after a first build so discovery isn't counted
+    samples = {actor_type: ACTORS[set_name][index]
+               for actor_type, (set_name, index) in ACTOR_TYPE_SAMPLES.items()}
+    samples["skelecog"] = make_skelecog_data_from_cog_data(samples["cog"])
+    for actor_type, actor_data in samples.items():
+        actor_data.generate_actor().cleanup()
+        results["generate_actor." + actor_type] = time_function(lambda: actor_data.generate_actor().cleanup(),
+                                                                repeats)
+
+    # set_actor_data cycling through every actor of each set; the first cycle builds, later ones hit the actor pool
+    manager = ActorManager()
+    manager.reparent_to(render)
+    for set_name in COG_SET_NAMES:
+        times = results["set_actor_data." + set_name] = []
+        for _ in range(repeats):
+            for actor_data in ACTORS[set_name]:
+                times.extend(time_function(lambda: manager.set_actor_data(actor_data), 1))
+        _wait_for_animations(manager)
+
+    # skelecog toggle on a cog that is animating
+    manager.set_actor_data(samples["cog"])
+    manager.animate("neutral")
+    _wait_for_animations(manager)
+    results["toggle_skelecog"] = time_function(manager.toggle_skelecog, repeats * 2)
+    if manager.is_skelecog():
+        manager.toggle_skelecog()
+
+    # pose scrubbing through fractional frames and stepping frame by frame
+    manager.set_pose_mode(True)
+    measured_count = get_animation_cache().get_measured_count()
+    num_frames = manager.get_num_frames()
+    frames = [step * SCRUB_STEP for step in range(int(num_frames / SCRUB_STEP))]
+    times = results["pose_scrub.set_pose_frame"] = []
+    for _ in range(repeats):
+        for frame in frames:
+            times.extend(time_function(lambda: manager.set_pose_frame(frame), 1))
+    results["pose_scrub.increment_pose"] = time_function(lambda: manager.increment_pose(1), repeats * num_frames)
+    if get_animation_cache().get_measured_count() != measured_count:
+        # the posed animation is already cached, so scrubbing should never measure it again
+        raise RuntimeError("Posing re-cached an animation that was already in the animation cache")
+    manager.set_pose_mode(False)
+
+    # offscreen screenshot capture: the framebuffer readback, and the background write it hands off to
+    writer = ScreenshotWriter()
+    high_resolution_capture = HighResolutionCapture()
+    with tempfile.TemporaryDirectory() as screenshot_dir:
+        capture_times = results["screenshot.capture"] = []
+        write_times = results["screenshot.write"] = []
+        for i in range(repeats):
+            base.graphics_engine.render_frame()
+            path = os.path.join(screenshot_dir, "screenshot-{}.png".format(i))
+            capture_times.extend(time_function(lambda: writer.capture(path), 1))
+            write_times.extend(time_function(writer.flush, 1))
+        results["screenshot.high_resolution"] = time_function(
+            lambda: high_resolution_capture.capture(*HIGH_RESOLUTION_SCREENSHOT_SIZE), max(1, repeats // 4))
+    high_resolution_capture.release()
+    return results
+
+
+def run_stage(stage, install_dir, result_file, *args):
+    """Runs a stage of the suite in a separate process.
+
+    :return: A dict of benchmark names and lists of times.
+    :rtype: dict
+    """
+    command = [sys.executable, "-m", "benchmarks.bench_suite", "--stage", stage, "--install-dir", install_dir,
+               "--result-file", result_file] + list(args)
+    subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+    with open(result_file, "r") as f:
+        return json.load(f)
+
+
+def merge_results(results, new_results):
+    """Adds the times in new_results to results."""
+    for name, times in new_results.items():
+        results.setdefault(name, []).extend(times)
+
+
+def get_commit():
+    """Returns the current commit's short hash, with "-dirty" appended if there are uncommitted changes, or None if
+    it can't be found.
+
+    :rtype: str
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + "-dirty" if status else commit
+
+
+def print_results(benchmarks, baseline=None):
+    """Prints a table of benchmark stats, with the change in median from a baseline if one is given.
+
+    :param benchmarks: A dict of benchmark names and stats, from get_stats().
+    :type benchmarks: dict
+    :param baseline: A dict of benchmark names and stats to compare against.
+    :type baseline: dict
+    """
+    print("{:<32} {:>6} {:>10} {:>10} {:>10} {:>10}{}".format(
+        "benchmark", "runs", "min ms", "p50 ms", "p90 ms", "p99 ms", "   vs baseline" if baseline else ""))
+    for name, stats in benchmarks.items():
+        line = "{:<32} {:>6} {:>10.3f} {:>10.3f} {:>10.3f} {:>10.3f}".format(
+            name, stats["runs"], stats["min_ms"], stats["p50_ms"], stats["p90_ms"], stats["p99_ms"])
+        if baseline and name in baseline and baseline[name]["p50_ms"]:
+            line += "   {:+6.1%}".format(stats["p50_ms"] / baseline[name]["p50_ms"] - 1)
+        print(line)
+
+
+def main():
+    args = parse_args()
+    if args.stage == "cold":
+        results = run_cold_stage(args.install_dir, args.index_file)
+    elif args.stage == "warm":
+        results = run_warm_stage(args.install_dir, args.repeats)
+    if args.stage is not None:
+        with open(args.result_file, "w") as f:
+            json.dump(results, f)
+        return
+
+    from panda3d.core import PandaSystem
+    from benchmarks.fixture import DEFAULT_FIXTURE_DIR, generate_fixture, get_fixture_info, is_fixture_current
+
+    install_dir = args.install_dir
+    fixture_info = None
+    if install_dir is None:
+        install_dir = DEFAULT_FIXTURE_DIR
+        fixture_options = [args.fixture_animations] * 4 + [args.fixture_frames]
+        fixture_info = get_fixture_info(*fixture_options)
+        if not is_fixture_current(install_dir, fixture_info):
+            print("Generating synthetic phase files in '{}'...".format(install_dir))
+            generate_fixture(install_dir, *fixture_options)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        result_file = os.path.join(temp_dir, "result.json")
+        index_file = os.path.join(temp_dir, "animation_index.json")
+        for i in range(args.repeats):
+            print("Timing mounting and discovery ({}/{})...".format(i + 1, args.repeats))
+            if os.path.exists(index_file):
+                os.remove(index_file)
+            # the first run writes the index, the second reads it
+            merge_results(results, run_stage("cold", install_dir, result_file, "--index-file", index_file))
+            merge_results(results, run_stage("cold", install_dir, result_file, "--index-file", index_file))
+        print("Timing actors and screenshots...")
+        merge_results(results, run_stage("warm", install_dir, result_file, "--repeats", str(args.repeats)))
+
+    commit = get_commit()
+    output = {
+        "commit": commit,
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "panda3d": PandaSystem.get_version_string(),
+        "install_dir": args.install_dir,
+        "fixture": fixture_info,
+        "repeats": args.repeats,
+        "benchmarks": {name: get_stats(times) for name, times in results.items()},
+    }
+    output_path = args.output or os.path.join(RESULTS_DIR, "{}.json".format(commit or "unknown"))
+    if os.path.dirname(output_path):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w") as f:
+        json.dump(output, f, indent=2)
+
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)["benchmarks"]
+    print_results(output["benchmarks"], baseline)
+    print("Wrote results to '{}'.".format(output_path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,509 @@
+"""Generates a synthetic set of phase files that stand in for a Toontown Rewritten install, so VisorView can be tested
+and benchmarked without one. Every model, texture and animation VisorView looks up is present under its real path and
+name, but the models are boxes rigidly skinned to a skeleton with the joints VisorView attaches things to, and the
+animations swing those joints back and forth.
+
+The number of animations and their lengths are configurable, so the fixture can also be used to see how VisorView
+scales with thousands of animations. Animations beyond the named ones are called stress-0000, stress-0001 and so on,
+and are spread across the phases like the real ones.
+
+Run from the main directory:
+    ppython -m benchmarks.fixture [output directory] [--suit-animations N] [--boss-animations N]
+                                  [--goon-animations N] [--generic-animations N] [--frames MIN MAX] [--seed N]
+"""
+import os
+import json
+import math
+import random
+import argparse
+import tempfile
+from panda3d.core import loadPrcFileData
+
+loadPrcFileData("", "window-type none")
+
+from panda3d.core import Filename, Multifile, NodePath, ModelRoot, PNMImage, StringStream, PTA_stdfloat
+from panda3d.core import AnimBundle, AnimBundleNode, AnimGroup, AnimChannelMatrixXfmTable
+from panda3d.egg import EggData, load_egg_data
+from src.util.phase_files import PHASE_FILES
+
+FIXTURE_VERSION = 2
+FIXTURE_INFO_FILE = "fixture.json"
+DEFAULT_FIXTURE_DIR = os.path.join("cache", "benchmark-fixture")
+ANIMATION_FRAME_RATE = 24
+ANIMATION_SWING = 30  # degrees each joint swings either way over an animation
+STRESS_ANIMATION_NAME = "stress-{:04d}"
+TEXTURE_SIZE = 4
+
+# (joint name, parent joint name, position relative to the parent)
+SUIT_JOINTS = (("joint_root", None, (0, 0, 0)),
+               ("joint_hips", "joint_root", (0, 0, 2)),
+               ("joint_spine", "joint_hips", (0, 0, 0.8)),
+               ("joint_chest", "joint_spine", (0, 0, 0.8)),
+               ("def_M_head_01", "joint_chest", (0, 0, 1.2)),
+               ("jnt_M_attachMeter_01", "joint_chest", (0, -0.5, 0)),
+               ("joint_L_shoulder", "joint_chest", (0.9, 0, 0.6)),
+               ("joint_L_elbow", "joint_L_shoulder", (0.3, 0, -0.8)),
+               ("joint_L_hand", "joint_L_elbow", (0, 0, -0.8)),
+               ("joint_R_shoulder", "joint_chest", (-0.9, 0, 0.6)),
+               ("joint_R_elbow", "joint_R_shoulder", (-0.3, 0, -0.8)),
+               ("joint_R_hand", "joint_R_elbow", (0, 0, -0.8)),
+               ("joint_L_hip", "joint_hips", (0.4, 0, 0)),
+               ("joint_L_knee", "joint_L_hip", (0, 0, -1)),
+               ("joint_L_foot", "joint_L_knee", (0, 0, -0.9)),
+               ("joint_R_hip", "joint_hips", (-0.4, 0, 0)),
+               ("joint_R_knee", "joint_R_hip", (0, 0, -1)),
+               ("joint_R_foot", "joint_R_knee", (0, 0, -0.9)),
+               ("jnt_M_shadow_01", "joint_root", (0, 0, 0)))
+# (part name, joint name, center of its box)
+SUIT_PARTS = (("torso", "joint_spine", (0, 0, 3.2)),
+              ("legs", "joint_hips", (0, 0, 1)),
+              ("arms", "joint_L_shoulder", (1.1, 0, 2.8)),
+              ("hands", "joint_L_hand", (1.2, 0, 1.8)),
+              ("tie", "joint_chest", (0, -0.6, 3.4)))
+# (name, phase, number of frames)
+SUIT_ANIMATIONS = (("neutral", "3.5", 24), ("walk", "3.5", 16), ("lose", "4", 48), ("victory", "4", 32),
+                   ("pie-small-react", "4", 20), ("slip-forward", "4", 40), ("throw-paper", "5", 36),
+                   ("finger-wag", "5", 28))
+SUIT_HEADS = ("factoryforeman", "factoryforemanshades", "factoryforemanangry", "factoryforemanshadesangry",
+              "mintauditor", "officeclerk", "clubpresident", "coldcaller", "telemarketer", "numbercruncher",
+              "gladhander", "movershaker", "twoface", "yesman", "pennypincher", "tightwad", "beancounter", "moneybags",
+              "loanshark", "ambulancechaser", "backstabber", "legaleagle", "bigwig", "flunky", "glasses",
+              "pencilpusher", "micromanager", "headhunter", "bigcheese")
+SUIT_TEXTURE_PREFIXES = ("s", "m", "l", "c", "ttr_t_ene_sellbotForeman", "ttr_t_ene_cashbotAuditor",
+                         "ttr_t_ene_lawbotClerk", "ttr_t_ene_bossbotClubPresident")
+HEAD_TEXTURES = ("phase_4/maps/name-dropper.jpg", "phase_4/maps/mingler.jpg", "phase_4/maps/robber-baron.jpg",
+                 "phase_4/maps/blood-sucker.jpg", "phase_4/maps/double-talker.jpg", "phase_4/maps/spin-doctor.jpg",
+                 "phase_3.5/maps/bottom-feeder.jpg", "phase_3.5/maps/corporate-raider.jpg")
+
+GOON_JOINTS = (("joint_root", None, (0, 0, 0)),
+               ("joint_body", "joint_root", (0, 0, 1)),
+               ("joint_hat", "joint_body", (0, 0, 1)),
+               ("joint_L_leg", "joint_root", (0.5, 0, 0.5)),
+               ("joint_R_leg", "joint_root", (-0.5, 0, 0.5)))
+GOON_PARTS = (("hard_hat", "joint_hat", (0, 0, 2)),
+              ("security_hat", "joint_hat", (0, 0, 2.2)),
+              ("eye", "joint_body", (0, -0.5, 1)))
+GOON_ANIMATIONS = (("walk", "9", 12), ("collapse", "9", 30), ("recovery", "9", 30))
+
+BOSS_HEAD_JOINTS = (("joint_head_root", None, (0, 0, 0)),
+                    ("joint_eyes", "joint_head_root", (0, -0.8, 1)))
+BOSS_TORSO_JOINTS = (("joint_torso_root", None, (0, 0, 0)),
+                     ("joint_L_arm", "joint_torso_root", (1.5, 0, 2)),
+                     ("joint_R_arm", "joint_torso_root", (-1.5, 0, 2)),
+                     ("joint34", "joint_torso_root", (0, 0, 3)))
+BOSS_LEGS_JOINTS = (("joint_legs_root", None, (0, 0, 0)),
+                    ("joint_axle", "joint_legs_root", (0, 0, 0.5)),
+                    ("joint_pelvis", "joint_legs_root", (0, 0, 2)))
+BOSS_PART_JOINTS = (("head", BOSS_HEAD_JOINTS), ("torso", BOSS_TORSO_JOINTS), ("legs", BOSS_LEGS_JOINTS))
+BOSS_DEPARTMENTS = (("sellbot", "9"), ("cashbot", "10"), ("lawbot", "11"), ("bossbot", "12"))
+BOSS_ANIMATIONS = (("Ff_neutral", "9", 20), ("Bb_neutral", "9", 20), ("Ff_speech", "9", 40),
+                   ("Bb2Ff_spin", "9", 30))
+
+GENERIC_JOINTS = (("joint_root", None, (0, 0, 0)),
+                  ("joint_top", "joint_root", (0, 0, 1)))
+GENERIC_PARTS = (("body", "joint_root", (0, 0, 1)),)
+# (model path, animation prefix)
+GENERIC_ACTORS = (("phase_5/models/char/ttr_r_chr_cbg_boss.bam", "ttr_a_chr_cbg_boss_"),
+                  ("phase_5/models/char/ttr_r_ara_cbe_cogdoSell.bam", "ttr_a_ara_cbe_cogdoSell_"))
+GENERIC_ANIMATIONS = (("idle", "5", 8), ("fall", "5", 16))
+
+BOX_FACES = ((0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3))
+
+
+def _get_box_egg(name, center, size=0.5):
+    """Returns egg syntax for a vertex pool and the polygons of a box, both named name."""
+    lines = ["<VertexPool> {}.verts {{".format(name)]
+    index = 0
+    for dx in (-size, size):
+        for dy in (-size, size):
+            for dz in (-size, size):
+                lines.append("  <Vertex> {} {{ {} {} {} }}".format(index, center[0] + dx, center[1] + dy,
+                                                                   center[2] + dz))
+                index += 1
+    lines.append("}")
+    for face in BOX_FACES:
+        lines.append("<Polygon> {{ <RGBA> {{ 1 1 1 1 }} <VertexRef> {{ {} <Ref> {{ {}.verts }} }} }}".format(
+            " ".join(str(i) for i in face), name))
+    return lines
+
+
+def _get_joint_children(joints, parent):
+    return [joint for joint in joints if joint[1] == parent]
+
+
+def get_character_egg(name, joints, parts):
+    """Returns egg syntax for a character: a box per part, each rigidly skinned to a joint. Every joint is exposed as
+    a node, so things can be attached to it.
+
+    :param name: The name of the character.
+    :type name: str
+    :param joints: (joint name, parent joint name or None, position relative to the parent) tuples.
+    :type joints: tuple
+    :param parts: (part name, joint name, center) tuples.
+    :type parts: tuple
+    :rtype: str
+    """
+    lines = ["<CoordinateSystem> { Z-Up }", "<Group> {} {{".format(name), "<Dart> { structured }"]
+    for part_name, _, center in parts:
+        lines.append("<Group> {} {{ <Model> {{ 1 }}".format(part_name))
+        lines.extend(_get_box_egg(part_name, center))
+        lines.append("}")
+
+    def add_joint(joint):
+        joint_name, _, pos = joint
+        lines.append("<Joint> {} {{ <DCS> {{ 1 }}".format(joint_name))
+        lines.append("<Transform> {{ <Translate> {{ {} {} {} }} }}".format(*pos))
+        for part_name, part_joint, _ in parts:
+            if part_joint == joint_name:
+                lines.append("<VertexRef> {{ 0 1 2 3 4 5 6 7 <Ref> {{ {}.verts }} }}".format(part_name))
+        for child in _get_joint_children(joints, joint_name):
+            add_joint(child)
+        lines.append("}")
+
+    for root in _get_joint_children(joints, None):
+        add_joint(root)
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def make_animation(name, joints, num_frames, phase=0.0):
+    """Builds an animation that swings every joint of a character back and forth, ending where it started so it
+    loops cleanly.
+
+    :param name: The name of the character the animation is for.
+    :type name: str
+    :param joints: (joint name, parent joint name or None, position relative to the parent) tuples, as given to
+        get_character_egg().
+    :type joints: tuple
+    :param num_frames: The number of frames.
+    :type num_frames: int
+    :param phase: How far into the swing the animation starts, from 0 to 1.
+    :type phase: float
+    :return: The animation, ready to be written to a bam file.
+    :rtype: NodePath
+    """
+    bundle = AnimBundle(name, ANIMATION_FRAME_RATE, num_frames)
+    skeleton = AnimGroup(bundle, "<skeleton>")
+
+    def add_joint(joint, parent, depth):
+        joint_name, _, pos = joint
+        table = AnimChannelMatrixXfmTable(parent, joint_name)
+        for table_id, value in zip("xyz", pos):
+            if value:
+                table.set_table(table_id, PTA_stdfloat([value]))
+        # deeper joints lag behind their parents, so the pose differs from frame to frame along the whole chain
+        offset = (phase + depth * 0.1) * 2 * math.pi
+        table.set_table("h", PTA_stdfloat([ANIMATION_SWING * math.sin(frame * 2 * math.pi / num_frames + offset)
+                                           for frame in range(num_frames)]))
+        for child in _get_joint_children(joints, joint_name):
+            add_joint(child, table, depth + 1)
+
+    for root in _get_joint_children(joints, None):
+        add_joint(root, skeleton, 0)
+    model = NodePath(ModelRoot(name))
+    model.attach_new_node(AnimBundleNode(name, bundle))
+    return model
+
+
+def get_group_egg(names):
+    """Returns egg syntax for a static model holding a small triangle per name, each in a group of that name.
+
+    :param names: The names of the groups.
+    :type names: tuple
+    :rtype: str
+    """
+    lines = ["<CoordinateSystem> { Z-Up }", "<Group> root {"]
+    for name in names:
+        lines.append("<Group> {0} {{ <VertexPool> {0}.verts {{ <Vertex> 0 {{ 0 0 0 }} <Vertex> 1 {{ 1 0 0 }} "
+                     "<Vertex> 2 {{ 0 0 1 }} }} <Polygon> {{ <VertexRef> {{ 0 1 2 <Ref> {{ {0}.verts }} }} }} }}"
+                     .format(name))
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def get_animation_list(named_animations, count, frame_range, rng):
+    """Returns the animations to generate for a character: its named animations, followed by as many stress
+    animations as it takes to reach count.
+
+    :param named_animations: (name, phase, number of frames) tuples of the character's real animations.
+    :type named_animations: tuple
+    :param count: The number of animations to generate. If None, only the named animations are generated.
+    :type count: int
+    :param frame_range: The (shortest, longest) number of frames to pick each animation's length from. If None, the
+        named animations keep their own lengths and stress animations are as long as the first named one.
+    :type frame_range: tuple
+    :param rng: The random number generator lengths are picked with.
+    :type rng: random.Random
+    :return: A list of (name, phase, number of frames) tuples.
+    :rtype: list[tuple]
+    """
+    count = len(named_animations) if count is None else count
+    animations = list(named_animations[:count])
+    for i in range(count - len(animations)):
+        phase = PHASE_FILES[i % len(PHASE_FILES)]
+        animations.append((STRESS_ANIMATION_NAME.format(i), phase, named_animations[0][2]))
+    if frame_range is not None:
+        animations = [(name, phase, rng.randint(*frame_range)) for name, phase, _ in animations]
+    return animations
+
+
+class FixtureWriter:
+    """Writes files into a staging directory, then packs them into one multifile per phase."""
+
+    def __init__(self, staging_dir):
+        """Initializes the FixtureWriter.
+
+        :param staging_dir: The directory to write files to before they are packed.
+        :type staging_dir: str
+        """
+        self._staging_dir = staging_dir
+        self._files = {}  # phase -> list of paths within the multifile
+
+    def _get_staging_path(self, path):
+        """Returns where a file is staged, registering it with the multifile of its phase."""
+        phase = path.split("/")[0][len("phase_"):]
+        self._files.setdefault(phase, []).append(path)
+        staging_path = os.path.join(self._staging_dir, *path.split("/"))
+        os.makedirs(os.path.dirname(staging_path), exist_ok=True)
+        return staging_path
+
+    def add_model(self, path, model):
+        """Writes a model or animation to a bam file.
+
+        :param path: The path of the file within the phase files, i.e. "phase_3/models/props/drop_shadow.bam"
+        :type path: str
+        :param model: The model or animation.
+        :type model: NodePath
+        """
+        model.write_bam_file(Filename.from_os_specific(self._get_staging_path(path)))
+
+    def add_egg(self, path, egg_text):
+        """Converts egg syntax to a bam file.
+
+        :param path: The path of the file within the phase files, i.e. "phase_3/models/props/drop_shadow.bam"
+        :type path: str
+        :param egg_text: The egg syntax.
+        :type egg_text: str
+        """
+        egg = EggData()
+        if not egg.read(StringStream(egg_text.encode())):
+            raise ValueError("Could not read the generated egg for '{}'.".format(path))
+        self.add_model(path, NodePath(load_egg_data(egg)))
+
+    def add_texture(self, path, color=(0.5, 0.5, 0.5)):
+        """Writes a small image of a single color.
+
+        :param path: The path of the file within the phase files. The format is chosen by the extension.
+        :type path: str
+        :param color: The color of the image.
+        :type color: tuple
+        """
+        image = PNMImage(TEXTURE_SIZE, TEXTURE_SIZE)
+        image.fill(*color)
+        image.write(Filename.from_os_specific(self._get_staging_path(path)))
+
+    def get_num_files(self):
+        """Returns the number of files written so far.
+
+        :rtype: int
+        """
+        return sum(len(paths) for paths in self._files.values())
+
+    def write_multifiles(self, output_dir, phases=PHASE_FILES):
+        """Packs the staged files into phase_*.mf files. Phases without any files get an empty multifile.
+
+        :param output_dir: The directory to write the multifiles to.
+        :type output_dir: str
+        :param phases: The phases to write a multifile for.
+        :type phases: tuple[str]
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        for phase in phases:
+            path = os.path.join(output_dir, "phase_{}.mf".format(phase))
+            if os.path.exists(path):
+                os.remove(path)
+            multifile = Multifile()
+            multifile.open_write(Filename.from_os_specific(path))
+            for subfile in self._files.get(phase, []):
+                staging_path = Filename.from_os_specific(os.path.join(self._staging_dir, *subfile.split("/")))
+                multifile.add_subfile(subfile, Filename.binary_filename(staging_path), 0)
+            multifile.flush()
+            multifile.close()
+
+
+def add_cogs(writer, animations):
+    """Adds the suits, skelecogs, heads, suit textures and suit animations.
+
+    :param writer: The writer to add the files to.
+    :type writer: FixtureWriter
+    :param animations: (name, phase, number of frames) tuples of the animations to add for each suit type.
+    :type animations: list[tuple]
+    """
+    for suit_type in "abc":
+        writer.add_egg("phase_3.5/models/char/ttr_r_ene_cg{}_suit.bam".format(suit_type),
+                       get_character_egg("suit", SUIT_JOINTS, SUIT_PARTS))
+        writer.add_egg("phase_5/models/char/ttr_r_ene_cg{}_skelecog.bam".format(suit_type),
+                       get_character_egg("suit", SUIT_JOINTS, SUIT_PARTS))
+        for i, (animation, phase, num_frames) in enumerate(animations):
+            writer.add_model("phase_{}/models/char/ttr_a_ene_cg{}_{}.bam".format(phase, suit_type, animation),
+                             make_animation("suit", SUIT_JOINTS, num_frames, i / len(animations)))
+    writer.add_egg("phase_4/models/char/ttr_r_ene_cga_heads.bam", get_group_egg(SUIT_HEADS))
+    writer.add_egg("phase_4/models/char/ttr_r_ene_cgb_heads.bam", get_group_egg(SUIT_HEADS))
+    writer.add_egg("phase_3.5/models/char/ttr_r_ene_cgc_heads.bam", get_group_egg(SUIT_HEADS))
+    writer.add_egg("phase_3/models/gui/ttr_m_gui_gen_cogIcons.bam",
+                   get_group_egg(("SalesIcon", "MoneyIcon", "LegalIcon", "CorpIcon")))
+    for prefix in SUIT_TEXTURE_PREFIXES:
+        for piece in ("arm", "blazer", "leg", "sleeve"):
+            writer.add_texture("phase_3.5/maps/{}_{}.jpg".format(prefix, piece))
+    for department in ("sales", "money", "legal", "boss"):
+        writer.add_texture("phase_5/maps/cog_robot_tie_{}.jpg".format(department))
+    for path in HEAD_TEXTURES:
+        writer.add_texture(path)
+
+
+def add_bosses(writer, animations):
+    """Adds the boss heads, torsos, legs and treads, and their animations.
+
+    :param writer: The writer to add the files to.
+    :type writer: FixtureWriter
+    :param animations: (name, phase, number of frames) tuples of the animations to add for each part.
+    :type animations: list[tuple]
+    """
+    for department, phase in BOSS_DEPARTMENTS:
+        writer.add_egg("phase_{}/models/char/{}Boss-head-zero.bam".format(phase, department),
+                       get_character_egg("head", BOSS_HEAD_JOINTS, (("headgeo", "joint_head_root", (0, 0, 1)),)))
+        writer.add_egg("phase_{}/models/char/{}Boss-torso-zero.bam".format(phase, department),
+                       get_character_egg("torso", BOSS_TORSO_JOINTS, (("torsogeo", "joint_torso_root", (0, 0, 1)),)))
+    writer.add_egg("phase_9/models/char/bossCog-legs-zero.bam",
+                   get_character_egg("legs", BOSS_LEGS_JOINTS, (("legsgeo", "joint_legs_root", (0, 0, 1)),)))
+    writer.add_egg("phase_9/models/char/bossCog-treads.bam", get_group_egg(("treads",)))
+    for i, (animation, phase, num_frames) in enumerate(animations):
+        for part, joints in BOSS_PART_JOINTS:
+            writer.add_model("phase_{}/models/char/bossCog-{}-{}.bam".format(phase, part, animation),
+                             make_animation(part, joints, num_frames, i / len(animations)))
+
+
+def add_misc(writer, goon_animations, generic_animations):
+    """Adds the goon, the generic actors, their animations and the drop shadow.
+
+    :param writer: The writer to add the files to.
+    :type writer: FixtureWriter
+    :param goon_animations: (name, phase, number of frames) tuples of the goon's animations.
+    :type goon_animations: list[tuple]
+    :param generic_animations: (name, phase, number of frames) tuples of the animations for each generic actor.
+    :type generic_animations: list[tuple]
+    """
+    writer.add_egg("phase_9/models/char/ttr_r_chr_ene_cogGoonie.bam",
+                   get_character_egg("goon", GOON_JOINTS, GOON_PARTS))
+    for i, (animation, phase, num_frames) in enumerate(goon_animations):
+        writer.add_model("phase_{}/models/char/ttr_a_chr_ene_cogGoonie_{}.bam".format(phase, animation),
+                         make_animation("goon", GOON_JOINTS, num_frames, i / len(goon_animations)))
+    for model_path, animation_prefix in GENERIC_ACTORS:
+        writer.add_egg(model_path, get_character_egg("generic", GENERIC_JOINTS, GENERIC_PARTS))
+        for i, (animation, phase, num_frames) in enumerate(generic_animations):
+            writer.add_model("phase_{}/models/char/{}{}.bam".format(phase, animation_prefix, animation),
+                             make_animation("generic", GENERIC_JOINTS, num_frames, i / len(generic_animations)))
+    writer.add_egg("phase_3/models/props/drop_shadow.bam", get_group_egg(("shadow",)))
+
+
+def get_fixture_info(suit_animations=None, boss_animations=None, goon_animations=None, generic_animations=None,
+                     frame_range=None, seed=0):
+    """Returns a description of the fixture generate_fixture() writes with the given options, which is stored
+    alongside it to tell if it's stale. Takes the same options as generate_fixture().
+
+    :rtype: dict
+    """
+    return {"version": FIXTURE_VERSION,
+            "suit_animations": suit_animations,
+            "boss_animations": boss_animations,
+            "goon_animations": goon_animations,
+            "generic_animations": generic_animations,
+            "frame_range": list(frame_range) if frame_range is not None else None,
+            "seed": seed}
+
+
+def is_fixture_current(output_dir, fixture_info):
+    """Returns whether a fixture matching a description exists in a directory.
+
+    :param output_dir: The directory the fixture was generated in.
+    :type output_dir: str
+    :param fixture_info: The description of the fixture, from get_fixture_info().
+    :type fixture_info: dict
+    :rtype: bool
+    """
+    try:
+        with open(os.path.join(output_dir, FIXTURE_INFO_FILE), "r") as f:
+            return json.load(f) == fixture_info
+    except (OSError, ValueError):
+        return False
+
+
+def generate_fixture(output_dir, suit_animations=None, boss_animations=None, goon_animations=None,
+                     generic_animations=None, frame_range=None, seed=0):
+    """Writes a full set of synthetic phase files to a directory, which can be mounted like a Toontown Rewritten install
+    directory.
+
+    :param output_dir: The directory to write the phase files to.
+    :type output_dir: str
+    :param suit_animations: The number of animations for each suit type. If None, only the named ones are written.
+    :type suit_animations: int
+    :param boss_animations: The number of animations for each part of the boss. If None, only the named ones are
+        written.
+    :type boss_animations: int
+    :param goon_animations: The number of goon animations. If None, only the named ones are written.
+    :type goon_animations: int
+    :param generic_animations: The number of animations for each generic actor. If None, only the named ones are
+        written.
+    :type generic_animations: int
+    :param frame_range: The (shortest, longest) number of frames to pick each animation's length from. If None, the
+        named animations keep their own lengths and the rest are as long as the first named one.
+    :type frame_range: tuple
+    :param seed: Seeds the picking of animation lengths, so the same options always produce the same fixture.
+    :type seed: int
+    :return: The number of files within the phase files.
+    :rtype: int
+    """
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as staging_dir:
+        writer = FixtureWriter(staging_dir)
+        add_cogs(writer, get_animation_list(SUIT_ANIMATIONS, suit_animations, frame_range, rng))
+        add_bosses(writer, get_animation_list(BOSS_ANIMATIONS, boss_animations, frame_range, rng))
+        add_misc(writer, get_animation_list(GOON_ANIMATIONS, goon_animations, frame_range, rng),
+                 get_animation_list(GENERIC_ANIMATIONS, generic_animations, frame_range, rng))
+        writer.write_multifiles(output_dir)
+    with open(os.path.join(output_dir, FIXTURE_INFO_FILE), "w") as f:
+        json.dump(get_fixture_info(suit_animations, boss_animations, goon_animations, generic_animations,
+                                   frame_range, seed), f)
+    return writer.get_num_files()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Write synthetic phase files that stand in for a Toontown Rewritten "
+                                                 "install.")
+    parser.add_argument("output_dir", nargs="?", default=DEFAULT_FIXTURE_DIR,
+                        help="Directory to write the phase files to (default: %(default)s).")
+    parser.add_argument("--suit-animations", type=int, metavar="N",
+                        help="Number of animations for each suit type (default: {}).".format(len(SUIT_ANIMATIONS)))
+    parser.add_argument("--boss-animations", type=int, metavar="N",
+                        help="Number of animations for each boss part (default: {}).".format(len(BOSS_ANIMATIONS)))
+    parser.add_argument("--goon-animations", type=int, metavar="N",
+                        help="Number of goon animations (default: {}).".format(len(GOON_ANIMATIONS)))
+    parser.add_argument("--generic-animations", type=int, metavar="N",
+                        help="Number of animations for each generic actor (default: {}).".format(
+                            len(GENERIC_ANIMATIONS)))
+    parser.add_argument("--frames", nargs=2, type=int, metavar=("MIN", "MAX"),
+                        help="Pick the length of every animation between MIN and MAX frames.")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Seed for picking animation lengths (default: %(default)s).")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    num_files = generate_fixture(args.output_dir, args.suit_animations, args.boss_animations, args.goon_animations,
+                                 args.generic_animations, args.frames, args.seed)
+    print("Wrote {} files to the phase files in '{}'.".format(num_files, args.output_dir))
+
+
+if __name__ == "__main__":
+    main()
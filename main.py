@@ -7,10 +7,10 @@ from panda3d.core import loadPrcFile
 
 loadPrcFile("VisorConfig.prc")
 
-from panda3d.core import VirtualFileSystem
 from panda3d.core import Filename
 from tkinter.messagebox import askquestion
 from tkinter.filedialog import askdirectory
+from src.util.phase_files import mount_phase_files, print_mount_report
 
 # Mount phase files
 user_system = system()
@@ -22,9 +22,6 @@ DEFAULT_INSTALL_PATHS = {
 }
 default_path = DEFAULT_INSTALL_PATHS[user_system]
 
-PHASE_FILES = ("3.5", "3", "4", "5", "5.5", "6", "7", "8", "9", "10", "11", "12", "13", "14")
-vfs = VirtualFileSystem.get_global_ptr()
-
 if os.path.exists("TTR_INSTALL_PATH"):
     f = open("TTR_INSTALL_PATH", "r")
     phase_file_dir = Filename(f.read())
@@ -33,13 +30,11 @@ else:
     phase_file_dir = default_path
 
 while True:
-    for canon in PHASE_FILES:
-        is_success = vfs.mount(phase_file_dir / Filename("phase_" + canon + ".mf"), ".", VirtualFileSystem.MF_read_only)
-        if not is_success:
+    is_success, mount_times, total_mount_time = mount_phase_files(phase_file_dir)
+    if not is_success:
+        if os.path.exists("TTR_INSTALL_PATH"):
             # well this lied.
             os.remove("TTR_INSTALL_PATH")
-            break
-    if not is_success:
         result = askquestion(title="Visorview",
                              message="Failed to locate one or more required phase files in '" +
                                      phase_file_dir.to_os_specific() +
@@ -48,6 +43,7 @@ while True:
             sys.exit(0)
         phase_file_dir = Filename.from_os_specific(askdirectory(title='Select Folder'))
     else:
+        print_mount_report(mount_times, total_mount_time)
         break
 
 # check if we have to save the path
@@ -0,0 +1,80 @@
+"""Render server: keeps the phase files mounted and actors built between renders, and renders jobs sent over a socket
+on localhost to PNG without a window or GPU. See src/util/render_server.py for the protocol, i.e. a client sends
+    {"id": 1, "set": "sellbots", "actor": "Cold Caller", "animation": "neutral", "frame": 12, "width": 512}
+as a line of JSON and reads back a line of JSON followed by the PNG's bytes.
+
+Run from the main directory:
+    ppython render_server.py [--install-dir DIR] [--host HOST] [--port PORT | --unix PATH] [--queue-size N]
+                             [--size WIDTH HEIGHT]
+
+If no install directory is given, the one stored in TTR_INSTALL_PATH is used. The server runs until interrupted, then
+prints its metrics.
+"""
+import sys
+import os
+import json
+import asyncio
+import argparse
+# Load config - must happen before any other Panda3D import
+from panda3d.core import loadPrcFile
+
+loadPrcFile("VisorConfig.prc")
+
+import src.globals.visorview_globals as visorview_globals
+from src.util.script_session import DEFAULT_SIZE
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Serve headless VisorView renders over a local socket.")
+    parser.add_argument("--install-dir", help="Toontown Rewritten install directory; defaults to TTR_INSTALL_PATH.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: %(default)s).")
+    parser.add_argument("--port", type=int, default=visorview_globals.RENDER_SERVER_PORT.get_value(),
+                        help="Port to listen on (default: %(default)s).")
+    parser.add_argument("--unix", metavar="PATH", help="Listen on a Unix socket at this path instead of a port.")
+    parser.add_argument("--queue-size", type=int, default=visorview_globals.RENDER_SERVER_QUEUE_SIZE.get_value(),
+                        help="Jobs that may wait to be rendered before clients are slowed down "
+                             "(default: %(default)s).")
+    parser.add_argument("--size", nargs=2, type=int, default=DEFAULT_SIZE, metavar=("WIDTH", "HEIGHT"),
+                        help="Size of renders that don't give their own (default: %(default)s).")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    from panda3d.core import Filename
+    from src.util.script_session import start_headless_session
+    from src.util.render_server import RenderServer
+
+    if args.install_dir is not None:
+        install_dir = Filename.from_os_specific(args.install_dir)
+    elif os.path.exists("TTR_INSTALL_PATH"):
+        with open("TTR_INSTALL_PATH", "r") as f:
+            install_dir = Filename(f.read())
+    else:
+        print("No install directory given and TTR_INSTALL_PATH does not exist.")
+        sys.exit(1)
+
+    try:
+        session = start_headless_session(install_dir, args.size)
+    except OSError as e:
+        print(e)
+        sys.exit(1)
+
+    server = RenderServer(session, args.queue_size)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix,
+                                 lambda address: print("Serving renders on {}".format(address), flush=True)))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(e)
+        sys.exit(1)
+    finally:
+        if args.unix is not None and os.path.exists(args.unix):
+            os.remove(args.unix)
+    print(json.dumps(server.get_metrics(), indent=2))
+    base.destroy()
+
+
+if __name__ == "__main__":
+    main()
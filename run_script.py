@@ -0,0 +1,76 @@
+"""Headless scripting: runs a list of commands from a JSON file against VisorView without a window or GPU, using
+Panda3D's software renderer in an offscreen buffer. See src/util/script_session.py for the available commands, i.e.
+    [{"command": "select_actor", "set_name": "sellbots", "actor": "Cold Caller"},
+     {"command": "set_skelecog", "is_skelecog": true},
+     {"command": "pose", "animation": "neutral", "frame": 12},
+     {"command": "capture", "path": "screenshots/cold-caller.png"}]
+
+Run from the main directory:
+    ppython run_script.py SCRIPT [--install-dir DIR] [--size WIDTH HEIGHT]
+
+If no install directory is given, the one stored in TTR_INSTALL_PATH is used.
+"""
+import sys
+import os
+import json
+import argparse
+from timeit import default_timer
+# Load config - must happen before any other Panda3D import
+from panda3d.core import loadPrcFile
+
+loadPrcFile("VisorConfig.prc")
+
+from src.util.script_session import DEFAULT_SIZE
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run a list of VisorView commands from a JSON file, headlessly.")
+    parser.add_argument("script", help="JSON file holding a list of commands.")
+    parser.add_argument("--install-dir", help="Toontown Rewritten install directory; defaults to TTR_INSTALL_PATH.")
+    parser.add_argument("--size", nargs=2, type=int, default=DEFAULT_SIZE, metavar=("WIDTH", "HEIGHT"),
+                        help="Size of captures that don't give their own (default: %(default)s).")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    from panda3d.core import Filename
+    from src.util.script_session import start_headless_session, COMMANDS
+
+    with open(args.script, "r") as f:
+        commands = json.load(f)
+    unknown_commands = sorted({command.get("command") for command in commands} - set(COMMANDS), key=str)
+    if unknown_commands:
+        print("Unknown commands: {}; expected one of: {}".format(", ".join(map(str, unknown_commands)),
+                                                                 ", ".join(COMMANDS)))
+        sys.exit(1)
+
+    if args.install_dir is not None:
+        install_dir = Filename.from_os_specific(args.install_dir)
+    elif os.path.exists("TTR_INSTALL_PATH"):
+        with open("TTR_INSTALL_PATH", "r") as f:
+            install_dir = Filename(f.read())
+    else:
+        print("No install directory given and TTR_INSTALL_PATH does not exist.")
+        sys.exit(1)
+
+    try:
+        session = start_headless_session(install_dir, args.size)
+    except OSError as e:
+        print(e)
+        sys.exit(1)
+
+    start = default_timer()
+    try:
+        results = session.run(commands)
+    except (ValueError, RuntimeError) as e:
+        print(e)
+        sys.exit(1)
+    run_time = default_timer() - start
+    captures = [result for command, result in zip(commands, results) if command["command"] == "capture"]
+    print("Ran {} commands with {} captures in {:.2f} s".format(len(commands), len(captures), run_time))
+    base.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+class ActorEntry:
+    """A lightweight descriptor for an ActorData instance. It stores the class and arguments needed to create the
+    ActorData, and only does so the first time it is requested.
+    """
+
+    def __init__(self, actor_data_class, name, *args, **kwargs):
+        """Initializes the ActorEntry.
+
+        :param actor_data_class: The ActorData subclass to create, i.e. CogActorData.
+        :type actor_data_class: type
+        :param name: The name of the actor; the first argument passed to the class.
+        :type name: str
+        :param args: Any further arguments to pass to the class.
+        :param kwargs: Any keyword arguments to pass to the class.
+        """
+        self._actor_data_class = actor_data_class
+        self._name = name
+        self._args = args
+        self._kwargs = kwargs
+        self._actor_data = None
+
+    def get_name(self):
+        """Returns the name of the actor without creating its ActorData.
+
+        :rtype: str
+        """
+        return self._name
+
+    def get(self):
+        """Returns the ActorData for this entry, creating it if necessary. The same instance is always returned.
+
+        :rtype: ActorData
+        """
+        if self._actor_data is None:
+            self._actor_data = self._actor_data_class(self._name, *self._args, **self._kwargs)
+        return self._actor_data
+
+
+class ActorSet:
+    """A sequence of ActorEntry objects. Indexing or iterating over the set returns ActorData instances, which are
+    created as they are accessed.
+    """
+
+    def __init__(self, entries):
+        """Initializes the ActorSet.
+
+        :param entries: The entries in this set. Entries may be shared with other sets.
+        :type entries: list[ActorEntry]
+        """
+        self._entries = list(entries)
+        self._is_loaded = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getitem__(self, index):
+        return self._entries[index].get()
+
+    def __iter__(self):
+        return (entry.get() for entry in self._entries)
+
+    def get_entry(self, index):
+        """Returns the entry at the given index without creating its ActorData.
+
+        :param index: The index of the entry.
+        :type index: int
+        :rtype: ActorEntry
+        """
+        return self._entries[index]
+
+    def get_names(self):
+        """Returns the names of every actor in the set without creating any ActorData.
+
+        :rtype: list[str]
+        """
+        return [entry.get_name() for entry in self._entries]
+
+    def load_animations(self):
+        """Creates every ActorData in the set and discovers their animations. Does nothing after the first call."""
+        if self._is_loaded:
+            return
+        for actor_data in self:
+            actor_data.load_animations()
+        self._is_loaded = True
+
+    def is_loaded(self):
+        """Returns whether load_animations has been called on this set.
+
+        :rtype: bool
+        """
+        return self._is_loaded
@@ -31,6 +31,12 @@ class ActorData:
         :return: Data from the given key, None if the key does not exist."""
         return self.__data[key] if key in self.__data else None
 
+    def get_all_data(self):
+        """Retrieves a copy of the ActorData instance's 'data' dictionary.
+
+        :rtype: dict"""
+        return dict(self.__data)
+
     def set_name(self, name):
         """Sets the name of this ActorData instance.
 
@@ -48,6 +54,12 @@ class ActorData:
         :param key: The name of the node"""
         return self._special_nodes[key] if key in self._special_nodes else None
 
+    def load_animations(self):
+        """Discovers the animations available to the actor. This is deferred until the actor is first needed, as it
+        requires searching the phase files; it is called automatically by generate_actor and get_animation_names.
+        """
+        pass
+
     def generate_actor(self):
         """Returns an actor based on the data within this class."""
         pass
@@ -56,6 +68,22 @@ class ActorData:
         """Returns a list of valid animations for the actor."""
         pass
 
+    def get_animation_set_key(self):
+        """Returns a key identifying this actor's set of animations; actors with the same key share their animations.
+
+        :rtype: tuple
+        """
+        return self.get_type(), self.get_name()
+
+    def get_asset_paths(self):
+        """Returns the paths of the models and textures generate_actor will load, so they can be loaded ahead of time.
+
+        :return: A tuple S where S[0] is a list of model paths the Actor is built from, S[1] is a list of model
+            template paths read through the asset cache and S[2] is a list of texture paths.
+        :rtype: tuple
+        """
+        return [], [], []
+
     def get_type(self):
         """Returns the type of the actor.
 
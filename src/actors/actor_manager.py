@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from direct.showbase.ShowBaseGlobal import hidden
 from panda3d.core import NodePath
 from direct.interval.IntervalGlobal import *
@@ -5,6 +6,10 @@ from direct.interval.ActorInterval import ActorInterval
 from direct.showbase.ShowBase import Loader
 import src.globals.visorview_globals as visorview_globals
 from src.actors.skelecog_actor_data import make_skelecog_data_from_cog_data
+from src.actors.actor_pool import ActorPool, reset_actor
+from src.actors.animation_loader import AnimationLoader
+from src.actors.joint_transform_table import JointTransformTable
+from src.util.profiler import profile, timer, count
 
 
 class ActorManager(NodePath):
@@ -38,16 +43,23 @@ class ActorManager(NodePath):
         self._pose_frame = {}      # used to keep track of the current frame the actor is posed on
         self._pose_animation = {}  # used to keep track of the actor's posed animation (get_current_anim dont work)
         self._looped_animation = {}  # actor intervals = .get_current_anim() isnt always accurate, store ourselves
+        self._pending_animation = {}  # animations (and their from_frame) that will be looped once they're loaded
         self._from_frame_sequence = None  # stores the sequence used to loop an animation from a certain frame
         self._skelecog_parent = None  # stores the original actor data when we swap to a skelecog
         self._head_rotation = 0  # stores the rotation of the head node, if the actor has one
 
         # actor
         self._actor = None
+        self._actor_key = None  # key of the current actor within the actor pool
+        self._actor_variants = {}  # stashed siblings of the current actor, i.e. its skelecog, keyed like the pool
         self._actor_animations = None
+        self._actor_pool = ActorPool(visorview_globals.ACTOR_POOL_SIZE.get_value())
+        self._animation_loader = AnimationLoader()
+        self._joint_tables = OrderedDict()  # JointTransformTables, keyed by animation set key and animation name
         if self._actor_data is not None:
             self._build_actor()
 
+    @profile()
     def _build_actor(self, preserve_anim=False):
         """Method that reads the actor_data stored in this ActorManager and creates an Actor.
 
@@ -69,11 +81,36 @@ class ActorManager(NodePath):
             # clear animations
             self._looped_animation = {}
 
+        # animations still loading were meant for the old actor
+        self._pending_animation = {}
+
+        new_key = self._get_pool_key()
         if self._actor is not None:
-            self._actor.cleanup()
-            self._actor.remove_node()
+            if self._from_frame_sequence is not None:
+                self._from_frame_sequence.pause()
+                self._from_frame_sequence = None
+            if self._actor_key != new_key and self._actor_key[0] is new_key[0]:
+                # another variant of the same actor (i.e. its skelecog); keep it around as a stashed sibling
+                reset_actor(self._actor)
+                self._actor.stash()
+                self._actor_variants[self._actor_key] = self._actor
+            else:
+                # park the old actor(s) in the pool so we don't have to rebuild them if we come back to them
+                self._actor_pool.put(self._actor_key, self._actor)
+                self._release_actor_variants()
 
-        self._actor = self._actor_data.generate_actor()
+        self._actor_key = new_key
+        self._actor = self._actor_variants.pop(self._actor_key, None)
+        if self._actor is not None:
+            self._actor.unstash()
+        else:
+            self._actor = self._actor_pool.take(self._actor_key)
+        if self._actor is None:
+            count("actor_pool.misses")
+            with timer("generate_actor", {"actor": self._actor_data.get_name()}):
+                self._actor = self._actor_data.generate_actor()
+        else:
+            count("actor_pool.hits")
 
         shadow_node = self._actor_data.get_special_node("shadow")
         if shadow_node:
@@ -112,6 +149,13 @@ class ActorManager(NodePath):
                     if part in looping_part_anim:
                         self.animate(looping_part_anim[part], part, looping_part_frame[part])
 
+    def _release_actor_variants(self):
+        """Moves the stashed variants of the current actor into the actor pool."""
+        for key, actor in self._actor_variants.items():
+            actor.unstash()
+            self._actor_pool.put(key, actor)
+        self._actor_variants = {}
+
     def set_head_visibility(self, is_head):
         """Updates the visibility of the actor's head within the ActorManager instance and applies it, if possible.
 
@@ -119,6 +163,8 @@ class ActorManager(NodePath):
         :type is_head: bool
         """
         self._is_head = is_head
+        if self._actor is None:
+            return
         head_node = self._actor_data.get_special_node("head")
         if head_node:
             if self._is_head:
@@ -145,6 +191,8 @@ class ActorManager(NodePath):
         :type is_body: bool
         """
         self._is_body = is_body
+        if self._actor is None:
+            return
         if self._is_body:
             self._actor.show()
         else:
@@ -193,6 +241,8 @@ class ActorManager(NodePath):
         :type is_skelecog: bool
         """
         self._is_skelecog = is_skelecog
+        if self._actor_data is None:
+            return
 
         if self._is_skelecog and self._actor_data.get_type() == "cog":
             self._skelecog_parent = self._actor_data
@@ -222,6 +272,8 @@ class ActorManager(NodePath):
         :type is_smooth: bool
         """
         self._is_animation_smoothed = is_smooth
+        if self._actor is None:
+            return
         self._actor.setBlend(frameBlend=self._is_animation_smoothed)
 
     def is_animation_smoothed(self):
@@ -252,8 +304,12 @@ class ActorManager(NodePath):
         self._is_posed[part] = is_posed
 
         if self.is_posed(part):
+            # posing takes over from any animation still loading
+            self._pending_animation.pop(part, None)
             self._pose_animation[part] = current_animation
             self._pose_frame[part] = current_animation_frame
+            if current_animation is not None and visorview_globals.PRECOMPUTE_JOINT_TABLES.get_value():
+                self.get_joint_transform_table(part)
             if current_animation is not None:
                 self._pose(self._pose_animation[part], self._pose_frame[part], part)
         else:
@@ -275,6 +331,7 @@ class ActorManager(NodePath):
         # make sure the sequence won't jarringly restart the loop
         if self._from_frame_sequence is not None:
             self._from_frame_sequence.finish()
+        self._share_animation(animation, part_name)
         if from_frame is not None:
             self._from_frame_sequence = Sequence(
                 self._actor.actorInterval(animation, startFrame=from_frame, partName=part_name),
@@ -286,19 +343,37 @@ class ActorManager(NodePath):
         # we're storing this manually as .get_current_anim isnt accurate when actorIntervals are at play.
         self._looped_animation[part_name] = animation
 
+    def _share_animation(self, animation, part=None):
+        """Binds an animation against the copy shared by every actor with the same animations, loading it (and
+        sharing it) synchronously if there isn't one.
+
+        :param animation: Animation name to bind.
+        :type animation: str
+        :param part: Actor part to target. If no part is specified, it will use the first part in the dictionary.
+        :type part: str
+        """
+        set_key = self.get_animation_set_key(part)
+        if self._animation_loader.share(self._actor, animation, part, set_key):
+            with timer("bind_anim", {"animation": animation, "part": part}):
+                self._actor.bind_anim(animation, part)
+            self._animation_loader.share(self._actor, animation, part, set_key)
+
     def _pose(self, animation, frame, part=None):
         """Method that poses a given part of the actor at a given frame.
         
         :param animation: Animation name to pose.
         :type animation: str
-        :param frame: Frame to pose the animation on.
-        :type frame: int
+        :param frame: Frame to pose the animation on. Fractional frames blend between the frames around them.
+        :type frame: float
         :param part: Actor part to target. If no part is specified, it will use the first part in the dictionary.
         :type part: str
         """
         # make sure the sequence won't jarringly restart the loop
         if self._from_frame_sequence is not None:
             self._from_frame_sequence.finish()
+        self._share_animation(animation, part)
+        # a fractional frame needs frame blending to show up as one, whether animations are smoothed or not
+        self._actor.setBlend(frameBlend=self._is_animation_smoothed or frame % 1 != 0, partName=part)
         self._actor.pose(animation, frame, part)
         # we're storing this manually as .get_current_anim isn't accurate when actorIntervals are at play.
         self._looped_animation[part] = None
@@ -350,15 +425,36 @@ class ActorManager(NodePath):
         if not self.is_posed(part):
             return
 
-        # modulo to ensure frame count loops around
-        part_frame = self.get_current_frame(part)
-        part_animation = self.get_current_animation(part)
-        current_anim_frame_count = self._actor.get_num_frames(part_animation)
+        # we know we're posed, so skip the lookups get_current_frame() and get_current_animation() would do
+        part_animation = self._pose_animation[part]
+        if part_animation is None:
+            return
+        table = self._joint_tables.get((self.get_animation_set_key(part), part_animation))
+        current_anim_frame_count = table.get_num_frames() if table is not None \
+            else self._actor.get_num_frames(part_animation, part)
         # frame count will be none if no animation is currently playing, this prevents a crash
-        if current_anim_frame_count is not None:
-            self._pose_frame[part] = (part_frame + count) % current_anim_frame_count
+        if current_anim_frame_count:
+            # modulo to ensure frame count loops around
+            self._pose_frame[part] = (self._pose_frame[part] + count) % current_anim_frame_count
             self._pose(part_animation, self._pose_frame[part], part)
 
+    def set_pose_frame(self, frame, part=None):
+        """Poses the part on any frame of its posed animation. Fractional frames blend between the two frames around
+        them, and frames past the last frame blend back into the first. Must be posed.
+
+        :param frame: The frame to pose the part on.
+        :type frame: float
+        :param part: Actor part to target. If no part is specified, it will use the first part in the dictionary.
+        :type part: str
+        """
+        part = self._get_first_part() if part is None else part
+        if not self.is_posed(part) or self._pose_animation[part] is None:
+            return
+        num_frames = self._actor.get_num_frames(self._pose_animation[part], part)
+        if num_frames:
+            self._pose_frame[part] = frame % num_frames
+            self._pose(self._pose_animation[part], self._pose_frame[part], part)
+
     def get_current_frame(self, part=None):
         """Get the current animation frame, either from a looping animation or pose.
 
@@ -375,6 +471,92 @@ class ActorManager(NodePath):
                 current_animation = self._looped_animation[part] if part in self._looped_animation else None
             return self._actor.get_current_frame(current_animation, part)
 
+    def get_num_frames(self, part=None):
+        """Get the number of frames in the current animation, posed or looping.
+
+        :param part: Actor part to target. If no part is specified, it will use the first part in the dictionary.
+        :type part: str
+        :return: The number of frames, or None if the part has no animation.
+        :rtype: int
+        """
+        part = self._get_first_part() if part is None else part
+        current_animation = self.get_current_animation(part)
+        if current_animation is None:
+            return None
+        return self._actor.get_num_frames(current_animation, part)
+
+    def get_joint_transform_table(self, part=None):
+        """Returns a table of every joint transform on every frame of the part's current animation, building it the
+        first time it's asked for. Tables are shared by every actor with the same animations; only the most recently
+        used few are kept.
+
+        :param part: Actor part to target. If no part is specified, it will use the first part in the dictionary.
+        :type part: str
+        :return: The table, or None if the part has no animation.
+        :rtype: JointTransformTable
+        """
+        part = self._get_first_part() if part is None else part
+        animation = self.get_current_animation(part)
+        if animation is None:
+            return None
+        key = (self.get_animation_set_key(part), animation)
+        if key in self._joint_tables:
+            self._joint_tables.move_to_end(key)
+            return self._joint_tables[key]
+        anim_control = self._actor.get_anim_control(animation, part)
+        if anim_control is None:
+            return None
+        with timer("JointTransformTable", {"animation": animation}):
+            self._joint_tables[key] = JointTransformTable(anim_control.get_anim())
+        while len(self._joint_tables) > visorview_globals.JOINT_TABLE_CACHE_SIZE:
+            self._joint_tables.popitem(last=False)
+        return self._joint_tables[key]
+
+    def get_joint_table_memory_usage(self):
+        """Returns the memory used by the joint transform tables that are kept, in bytes.
+
+        :rtype: int
+        """
+        return sum(table.get_memory_usage() for table in self._joint_tables.values())
+
+    def get_frame_rate(self, part=None):
+        """Get the frame rate of the current animation, posed or looping.
+
+        :param part: Actor part to target. If no part is specified, it will use the first part in the dictionary.
+        :type part: str
+        :return: The frame rate in frames per second, or None if the part has no animation.
+        :rtype: float
+        """
+        part = self._get_first_part() if part is None else part
+        current_animation = self.get_current_animation(part)
+        if current_animation is None:
+            return None
+        return self._actor.get_frame_rate(current_animation, part)
+
+    def pose_animations(self, part_animations):
+        """Poses each given part on the first frame of an animation, ready to be stepped through with
+        increment_pose().
+
+        :param part_animations: A dict of animation names with actor parts as keys.
+        :type part_animations: dict
+        :return: The parts that were posed. Parts whose animation could not be played are left out.
+        :rtype: list[str]
+        """
+        posed_parts = []
+        for part, animation in part_animations.items():
+            # unlike animate(), this has to happen right away
+            self._pending_animation.pop(part, None)
+            self.set_pose_mode(False, part)
+            self._loop(animation, part_name=part)
+            if self.get_current_frame(part) is None:
+                # not actually an animation, i.e. a model that was picked up by the animation prefix
+                continue
+            self.set_pose_mode(True, part)
+            # start from the first frame, wherever the loop had gotten to
+            self.increment_pose(-self.get_current_frame(part), part)
+            posed_parts.append(part)
+        return posed_parts
+
     def _get_first_part(self):
         """Gets the first part of the actor.
 
@@ -392,6 +574,17 @@ class ActorManager(NodePath):
         part = self._get_first_part() if part is None else part
         return self._actor_animations[part] if self._actor_animations is not None else None
 
+    def get_animation_set_key(self, part=None):
+        """Returns a key identifying the animations available to a part of the actor; actors with the same key share
+        their animations.
+
+        :param part: Actor part to target. If no part is specified, it will use the first part in the dictionary.
+        :type part: str
+        :rtype: tuple
+        """
+        part = self._get_first_part() if part is None else part
+        return self._actor_data.get_animation_set_key(), part
+
     def animate(self, animation_name, part=None, from_frame=None):
         """Loops an animation on the actor.
 
@@ -403,18 +596,42 @@ class ActorManager(NodePath):
         :type from_frame: int
         """
         part = self._get_first_part() if part is None else part
+        # the current animation keeps playing until the new one has been loaded
+        self._pending_animation[part] = (animation_name, from_frame)
+        self._animation_loader.load(self._actor, animation_name, part, self.get_animation_set_key(part),
+                                    self._play_loaded_animation, [self._actor, animation_name, part, from_frame])
+
+    def _play_loaded_animation(self, actor, animation_name, part, from_frame):
+        """Called once an animation passed to animate() has been loaded; loops it unless something else has been
+        played or posed since."""
+        if actor is not self._actor or self._pending_animation.get(part) != (animation_name, from_frame):
+            return
+        del self._pending_animation[part]
         self.set_pose_mode(False, part)
         self._loop(animation_name, from_frame=from_frame, part_name=part)
 
+    def is_loading_animation(self, part=None):
+        """Returns whether an animation passed to animate() is still being loaded for a part.
+
+        :param part: Actor part to target. If no part is specified, it will use the first part in the dictionary.
+        :type part: str
+        :rtype: bool
+        """
+        part = self._get_first_part() if part is None else part
+        return part in self._pending_animation
+
     def set_actor_data(self, actor_data):
         """Replaces the current set of actor data with a new one and builds an actor from it.
 
         :param actor_data: Actor data to use.
         :type actor_data: ActorData
         """
+        # match skelecog data here rather than through set_is_skelecog, so the actor is only built once
         self._actor_data = actor_data
-        # match skelecog data here to avoid it being called more than necessary in build_actor & cause issues
-        self.set_is_skelecog(self.is_skelecog())
+        self._skelecog_parent = None
+        if self.is_skelecog() and actor_data.get_type() == "cog":
+            self._skelecog_parent = actor_data
+            self._actor_data = make_skelecog_data_from_cog_data(actor_data)
         self._build_actor()
 
     def get_actor_parts(self):
@@ -448,6 +665,64 @@ class ActorManager(NodePath):
         else:
             self.set_head_rotation(180)
 
+    def get_head_rotation(self):
+        """Returns the rotation of the actors head.
+
+        :rtype: float"""
+        return self._head_rotation
+
+    def get_scene_state(self):
+        """Returns everything about the actor that affects how it looks: its actor data, skelecog, visibility and
+        smoothing settings, head rotation and the animation and frame each part is posed on. Two ActorManagers with
+        equal states look the same, so the state can be used to identify a render of the actor.
+
+        :return: A dict of the state, or None if the actor's look changes over time (a part is looping or loading an
+            animation) or there is no actor.
+        :rtype: dict
+        """
+        if self._actor is None:
+            return None
+        parts = {}
+        for part in self.get_actor_parts():
+            if self.is_loading_animation(part):
+                return None
+            if self.is_posed(part):
+                parts[part] = [self._pose_animation.get(part), self._pose_frame.get(part)]
+            elif self.get_current_animation(part) is None:
+                # bind pose
+                parts[part] = [None, None]
+            else:
+                return None
+        return {"type": self._actor_data.get_type(),
+                "name": self._actor_data.get_name(),
+                "data": self._actor_data.get_all_data(),
+                "is_skelecog": self.is_skelecog(),
+                "is_head": self.get_head_visibility(),
+                "is_body": self.get_body_visibility(),
+                "is_shadow": self.get_shadow_visibility(),
+                "is_animation_smoothed": self.is_animation_smoothed(),
+                "head_rotation": self.get_head_rotation(),
+                "parts": parts}
+
+    def _get_pool_key(self):
+        """Returns the key the current actor data's actor is stored under in the actor pool. Skelecogs are keyed by
+        the cog they were made from, so both variants of a cog can be found from either.
+
+        :return: A tuple of the (non-skelecog) ActorData and whether the actor is a skelecog.
+        :rtype: tuple
+        """
+        is_skelecog = self._actor_data.get_type() == "skelecog"
+        actor_data = self._skelecog_parent if is_skelecog else self._actor_data
+        return actor_data, is_skelecog
+
+    def set_actor_pool_size(self, size):
+        """Sets the number of previously built actors kept in memory for reuse.
+
+        :param size: The maximum number of actors to keep. 0 disables pooling.
+        :type size: int
+        """
+        self._actor_pool.set_size(size)
+
     def _get_actor_type(self):
         """Returns the actor's type as a string.
 
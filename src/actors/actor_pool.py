@@ -0,0 +1,93 @@
+from collections import OrderedDict
+from direct.showbase.ShowBaseGlobal import hidden
+
+
+def reset_actor(actor):
+    """Stops all animations on an actor and returns it to its default pose, so it doesn't come back frozen on some
+    random frame when it is reused.
+
+    :param actor: The actor to reset.
+    :type actor: Actor
+    """
+    actor.stop()
+    for bundle in actor.get_part_bundles():
+        bundle.clear_control_effects()
+
+
+class ActorPool:
+    """A bounded pool of built actors, evicting the least recently used actor once full. Actors in the pool are
+    parked under 'hidden' with their animations stopped, ready to be reparented and reused instead of rebuilt.
+    """
+
+    def __init__(self, size):
+        """Initializes the ActorPool.
+
+        :param size: The maximum number of actors to keep. 0 disables pooling entirely.
+        :type size: int
+        """
+        self._size = max(0, size)
+        self._actors = OrderedDict()
+
+    def put(self, key, actor):
+        """Parks an actor in the pool, evicting the least recently used actor(s) if the pool is full.
+
+        :param key: The key to store the actor under; any hashable object.
+        :param actor: The actor to store.
+        :type actor: Actor
+        """
+        if key in self._actors and self._actors[key] is not actor:
+            self._destroy(self._actors.pop(key))
+
+        reset_actor(actor)
+        actor.reparent_to(hidden)
+
+        self._actors[key] = actor
+        self._actors.move_to_end(key)
+        self._evict()
+
+    def take(self, key):
+        """Removes an actor from the pool and returns it.
+
+        :param key: The key the actor was stored under.
+        :return: The actor, or None if the pool does not contain it.
+        :rtype: Actor
+        """
+        return self._actors.pop(key, None)
+
+    def set_size(self, size):
+        """Sets the maximum number of actors to keep, evicting actors if necessary.
+
+        :param size: The maximum number of actors to keep. 0 disables pooling entirely.
+        :type size: int
+        """
+        self._size = max(0, size)
+        self._evict()
+
+    def get_size(self):
+        """Returns the maximum number of actors the pool will keep.
+
+        :rtype: int
+        """
+        return self._size
+
+    def clear(self):
+        """Destroys every actor in the pool."""
+        while self._actors:
+            self._destroy(self._actors.popitem(last=False)[1])
+
+    def _evict(self):
+        """Destroys the least recently used actors until the pool is within its size limit."""
+        while len(self._actors) > self._size:
+            self._destroy(self._actors.popitem(last=False)[1])
+
+    @staticmethod
+    def _destroy(actor):
+        """Cleans up an actor that is leaving the pool."""
+        actor.cleanup()
+        actor.remove_node()
+
+    def __len__(self):
+        return len(self._actors)
+
+    def __contains__(self, key):
+        return key in self._actors
@@ -0,0 +1,76 @@
+from collections import deque
+from panda3d.core import Filename, TexturePool
+from direct.task import Task
+from src.actors.skelecog_actor_data import make_skelecog_data_from_cog_data
+import src.util.asset_cache as asset_cache
+
+PREFETCH_TASK_CHAIN = "actor_prefetch_chain"
+TEXTURE_TASK_NAME = "actor_prefetch_texture_task"
+
+
+class ActorPrefetcher:
+    """Loads the models and textures needed by actors in the background, ahead of them being built. Models go through
+    the loader's asynchronous path and textures are loaded on a threaded task chain; both end up in Panda3D's model
+    and texture pools, so generate_actor only has to copy them when the actor is built. Model templates and textures
+    that generate_actor reads through the asset cache are also handed to it.
+    """
+
+    def __init__(self):
+        """Initializes the ActorPrefetcher and the task chain used for loading textures."""
+        self._requested = set()  # paths that have already been requested, as strings
+        self._texture_queue = deque()
+        taskMgr.setupTaskChain(PREFETCH_TASK_CHAIN, numThreads=1)
+
+    def prefetch(self, actor_data_list, is_skelecog=False):
+        """Starts loading the models and textures for the given actors in the background. Assets that have already been
+        requested are skipped.
+
+        :param actor_data_list: The ActorData of the actors that are likely to be built soon.
+        :type actor_data_list: list[ActorData]
+        :param is_skelecog: If True, cogs will be prefetched as their skelecog.
+        :type is_skelecog: bool
+        """
+        for actor_data in actor_data_list:
+            if is_skelecog and actor_data.get_type() == "cog":
+                actor_data = make_skelecog_data_from_cog_data(actor_data)
+            model_paths, template_paths, texture_paths = actor_data.get_asset_paths()
+            for path in model_paths:
+                if self._request(path):
+                    # the model pool keeps these, so the Actor copies them when it's built
+                    loader.load_model(path, blocking=False)
+            for path in template_paths:
+                if self._request(path):
+                    loader.load_model(path, blocking=False, callback=self._on_template_loaded, extraArgs=[path])
+            for path in texture_paths:
+                if self._request(path):
+                    self._texture_queue.append(path)
+
+        if self._texture_queue and not taskMgr.hasTaskNamed(TEXTURE_TASK_NAME):
+            taskMgr.add(self._texture_task, TEXTURE_TASK_NAME, taskChain=PREFETCH_TASK_CHAIN)
+
+    def _request(self, path):
+        """Marks a path as requested.
+
+        :return: True if the path had not been requested before.
+        :rtype: bool
+        """
+        key = str(path)
+        if key in self._requested:
+            return False
+        self._requested.add(key)
+        return True
+
+    def _on_template_loaded(self, path, model):
+        """Callback for asynchronous template loads. Hands the model to the asset cache, to be used as a template."""
+        if model is not None:
+            asset_cache.store_model(path, model)
+
+    def _texture_task(self, task):
+        """Task that loads queued textures into the texture pool, one per step."""
+        if not self._texture_queue:
+            return Task.done
+        path = self._texture_queue.popleft()
+        texture = TexturePool.load_texture(Filename(path))
+        if texture is not None:
+            asset_cache.store_texture(path, texture)
+        return Task.cont
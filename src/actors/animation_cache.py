@@ -0,0 +1,167 @@
+"""A process-wide cache of loaded animations, shared by every actor.
+
+Actors of the same suit type play the same animation files, but every Actor loads and holds its own copy of an
+animation when it binds it. The cache keeps one AnimBundle per animation of each set of animations (keyed by
+ActorManager.get_animation_set_key() and the animation name), which every actor binds against instead. Once the
+animations in the cache use more memory than allowed, the least recently used ones are released.
+"""
+from collections import OrderedDict
+from panda3d.core import AnimChannelMatrixXfmTable, AnimChannelScalarTable
+import src.globals.visorview_globals as visorview_globals
+
+FLOAT_SIZE = 4  # panda stores animation tables as single precision floats
+ANIM_GROUP_SIZE = 64  # rough size of an AnimGroup (a joint or slider channel) without its tables
+MATRIX_TABLE_IDS = "ijkabcrphxyz"
+
+_animation_cache = None
+
+
+def get_animation_cache():
+    """Returns the animation cache shared by every actor in this process, creating it if necessary.
+
+    :rtype: AnimationCache
+    """
+    global _animation_cache
+    if _animation_cache is None:
+        _animation_cache = AnimationCache(visorview_globals.ANIMATION_CACHE_SIZE.get_value() * 1024 * 1024)
+    return _animation_cache
+
+
+def get_anim_bundle_size(anim_bundle):
+    """Returns an estimate of the memory used by an animation: the size of its tables plus a bit for every channel.
+
+    :param anim_bundle: The animation.
+    :type anim_bundle: AnimBundle
+    :return: The size in bytes.
+    :rtype: int
+    """
+    size = 0
+    groups = [anim_bundle]
+    while groups:
+        group = groups.pop()
+        size += ANIM_GROUP_SIZE
+        if isinstance(group, AnimChannelMatrixXfmTable):
+            size += sum(len(group.get_table(table_id)) for table_id in MATRIX_TABLE_IDS) * FLOAT_SIZE
+        elif isinstance(group, AnimChannelScalarTable):
+            size += len(group.get_table()) * FLOAT_SIZE
+        groups.extend(group.get_children())
+    return size
+
+
+class AnimationCache:
+    """A least recently used cache of AnimBundles with a memory limit."""
+
+    def __init__(self, memory_limit):
+        """Initializes the AnimationCache.
+
+        :param memory_limit: The number of bytes the cached animations may use. 0 disables caching.
+        :type memory_limit: int
+        """
+        self._memory_limit = max(0, memory_limit)
+        self._animations = OrderedDict()  # (AnimBundle, size) tuples
+        self._memory_usage = 0
+        self._hits = 0
+        self._misses = 0
+        self._measured_count = 0  # number of animations whose size has been computed
+
+    def get(self, key):
+        """Returns a cached animation, marking it as the most recently used.
+
+        :param key: The (animation set key, animation name) tuple the animation was stored under.
+        :type key: tuple
+        :return: The animation, or None if it isn't cached.
+        :rtype: AnimBundle
+        """
+        if key not in self._animations:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._animations.move_to_end(key)
+        return self._animations[key][0]
+
+    def put(self, key, anim_bundle):
+        """Caches an animation as the most recently used, releasing the least recently used animations if the cache
+        goes over its memory limit. Putting the animation that is already cached under the key only marks it as the
+        most recently used; it is not a lookup, so it doesn't count as a hit or miss.
+
+        :param key: An (animation set key, animation name) tuple.
+        :type key: tuple
+        :param anim_bundle: The animation.
+        :type anim_bundle: AnimBundle
+        """
+        if key in self._animations:
+            cached_bundle, size = self._animations[key]
+            # panda returns a new wrapper of the same bundle every time, so compare the bundles rather than wrappers
+            if cached_bundle == anim_bundle:
+                self._animations.move_to_end(key)
+                return
+            self._remove(key)
+        size = get_anim_bundle_size(anim_bundle)
+        self._measured_count += 1
+        self._animations[key] = (anim_bundle, size)
+        self._memory_usage += size
+        self._evict()
+
+    def __contains__(self, key):
+        return key in self._animations
+
+    def _remove(self, key):
+        """Removes an animation from the cache."""
+        _, size = self._animations.pop(key)
+        self._memory_usage -= size
+
+    def _evict(self):
+        """Releases the least recently used animations until the cache fits its memory limit."""
+        while self._animations and self._memory_usage > self._memory_limit:
+            self._remove(next(iter(self._animations)))
+
+    def set_memory_limit(self, memory_limit):
+        """Sets the number of bytes the cached animations may use, releasing animations if necessary.
+
+        :param memory_limit: The memory limit in bytes. 0 disables caching.
+        :type memory_limit: int
+        """
+        self._memory_limit = max(0, memory_limit)
+        self._evict()
+
+    def get_memory_limit(self):
+        """Returns the number of bytes the cached animations may use.
+
+        :rtype: int
+        """
+        return self._memory_limit
+
+    def get_memory_usage(self):
+        """Returns an estimate of the memory used by the cached animations, in bytes.
+
+        :rtype: int
+        """
+        return self._memory_usage
+
+    def get_num_animations(self):
+        """Returns the number of cached animations.
+
+        :rtype: int
+        """
+        return len(self._animations)
+
+    def get_measured_count(self):
+        """Returns the number of animations whose size has been computed as they were cached. Animations that were
+        already cached are not measured again.
+
+        :rtype: int
+        """
+        return self._measured_count
+
+    def get_hit_rate(self):
+        """Returns the fraction of lookups that found their animation in the cache.
+
+        :rtype: float
+        """
+        lookups = self._hits + self._misses
+        return self._hits / lookups if lookups else 0.0
+
+    def clear(self):
+        """Releases every cached animation."""
+        self._animations.clear()
+        self._memory_usage = 0
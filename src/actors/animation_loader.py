@@ -0,0 +1,143 @@
+"""Loads actor animations in the background, so playing an animation for the first time doesn't hitch.
+
+Actor only loads an animation's file when the animation is first bound, which happens synchronously inside loop() or
+pose(). AnimationLoader loads the file on Panda3D's loader thread instead and hands the AnimBundle to the actor, so
+binding it is instant. Loaded animations go into the shared animation cache, so every actor playing the same animation
+(i.e. every cog of a suit type) binds against the same AnimBundle without loading anything.
+"""
+from panda3d.core import LoaderOptions, AnimBundleNode
+from direct.actor.Actor import Actor
+from timeit import default_timer
+from src.actors.animation_cache import get_animation_cache
+from src.util.profiler import get_profiler
+
+# loaded animations are owned by the animation cache rather than Panda3D's model pool, so they can actually be let go
+ANIMATION_LOADER_OPTIONS = LoaderOptions(Actor.animLoaderOptions.get_flags() | LoaderOptions.LF_no_ram_cache)
+
+
+class AnimationLoader:
+    """Loads the animations of actors asynchronously and shares them between actors through an AnimationCache."""
+
+    def __init__(self, cache=None):
+        """Initializes the AnimationLoader.
+
+        :param cache: The cache loaded animations are shared through. If None, the process-wide cache is used.
+        :type cache: AnimationCache
+        """
+        self._cache = cache if cache is not None else get_animation_cache()
+        self._requests = []  # loader requests that haven't finished yet
+
+    def share(self, actor, animation, part, set_key):
+        """Shares an animation between an actor and the cache: if the actor has the animation bound or loaded, the
+        cache is given it; otherwise the actor is given the cached animation, if there is one.
+
+        :param actor: The actor the animation will be played on.
+        :type actor: Actor
+        :param animation: The name of the animation.
+        :type animation: str
+        :param part: The part the animation will be played on.
+        :type part: str
+        :param set_key: The key identifying the set of animations the animation belongs to, from
+            ActorManager.get_animation_set_key().
+        :return: The Actor.AnimDefs of the animation that still have to be loaded.
+        :rtype: list[Actor.AnimDef]
+        """
+        key = (set_key, animation)
+        missing = []
+        for anim_def in _get_animation_defs(actor, animation, part):
+            if anim_def.animControl is not None:
+                self._cache.put(key, anim_def.animControl.get_anim())
+            elif anim_def.animBundle is not None:
+                self._cache.put(key, anim_def.animBundle)
+            else:
+                anim_def.animBundle = self._cache.get(key)
+                if anim_def.animBundle is None:
+                    missing.append(anim_def)
+        return missing
+
+    def load(self, actor, animation, part, set_key, callback, extra_args=None):
+        """Makes sure an animation can be bound to a part of an actor without loading anything, then calls callback.
+        If the animation is cached or already bound, callback is called immediately; otherwise it's called once the
+        animation has been loaded in the background.
+
+        :param actor: The actor the animation will be played on.
+        :type actor: Actor
+        :param animation: The name of the animation.
+        :type animation: str
+        :param part: The part the animation will be played on.
+        :type part: str
+        :param set_key: The key identifying the set of animations the animation belongs to, from
+            ActorManager.get_animation_set_key().
+        :param callback: The function to call once the animation is ready.
+        :param extra_args: The arguments to call callback with.
+        :type extra_args: list
+        :return: True if the animation was ready and callback has already been called.
+        :rtype: bool
+        """
+        missing = self.share(actor, animation, part, set_key)
+        extra_args = extra_args or []
+        if not missing:
+            callback(*extra_args)
+            return True
+
+        filenames = sorted(set(str(anim_def.filename) for anim_def in missing))
+        request = loader.loadModel(filenames, loaderOptions=ANIMATION_LOADER_OPTIONS,
+                                   callback=self._on_loaded,
+                                   extraArgs=[missing, filenames, (set_key, animation), callback, extra_args,
+                                              default_timer()])
+        self._requests.append(request)
+        return False
+
+    def _on_loaded(self, models, missing, filenames, key, callback, extra_args, start_time):
+        """Called by the loader once the files of an animation have been loaded."""
+        profiler = get_profiler()
+        if profiler is not None:
+            profiler.add_duration("load_animation_async", start_time, default_timer(), {"animation": key[1]})
+        self._requests = [request for request in self._requests if not request.done()]
+        bundles = {}
+        for filename, model in zip(filenames, models):
+            bundle = AnimBundleNode.find_anim_bundle(model.node()) if model is not None else None
+            if bundle is not None:
+                bundles[filename] = bundle
+                self._cache.put(key, bundle)
+        for anim_def in missing:
+            # anything that failed to load is left to Actor, which will report the error when binding it
+            if anim_def.animBundle is None and anim_def.animControl is None:
+                anim_def.animBundle = bundles.get(str(anim_def.filename))
+        callback(*extra_args)
+
+    def is_loading(self):
+        """Returns whether any animations are still being loaded.
+
+        :rtype: bool
+        """
+        return any(not request.done() for request in self._requests)
+
+    def get_cache(self):
+        """Returns the cache loaded animations are shared through.
+
+        :rtype: AnimationCache
+        """
+        return self._cache
+
+    def cancel(self):
+        """Cancels every pending load; their callbacks won't be called."""
+        for request in self._requests:
+            request.cancel()
+        self._requests = []
+
+
+def _get_animation_defs(actor, animation, part):
+    """Returns the Actor.AnimDefs of an animation on a part of an actor, for every LOD.
+
+    :type actor: Actor
+    :type animation: str
+    :type part: str
+    :rtype: list[Actor.AnimDef]
+    """
+    anim_defs = []
+    for part_dict in actor.get_anim_control_dict().values():
+        anim_def = part_dict.get(part, {}).get(animation)
+        if anim_def is not None:
+            anim_defs.append(anim_def)
+    return anim_defs
@@ -1,10 +1,10 @@
-from os.path import basename
-import posixpath
-import src.util.vfs_glob as glob
+import src.util.animation_index as animation_index
+import src.util.asset_cache as asset_cache
 from panda3d.core import Filename, Vec4, VBase4
 from direct.actor.Actor import Actor
 from src.actors.actor_data import ActorData
 from direct.showbase.ShowBase import Loader
+from src.util.profiler import timer
 
 TORSO_DICT = {
     "sell": "phase_9/models/char/sellbotBoss-torso-zero.bam",
@@ -23,28 +23,14 @@ HEAD_DICT = {
 TREADS_MODEL = "phase_9/models/char/bossCog-treads.bam"
 LEGS_MODEL = "phase_9/models/char/bossCog-legs-zero.bam"
 
-HEAD_ANIMATION_PATHS = glob.glob("phase_*/models/char/bossCog-head-*.bam")
-TORSO_ANIMATION_PATHS = glob.glob("phase_*/models/char/bossCog-torso-*.bam")
-LEG_ANIMATION_PATHS = glob.glob("phase_*/models/char/bossCog-legs-*.bam")
-
+# filled on demand by load_boss_animations()
 HEAD_ANIMATION_DICT = {}
 TORSO_ANIMATION_DICT = {}
 LEG_ANIMATION_DICT = {}
 
-for i in range(0, len(HEAD_ANIMATION_PATHS)):
-    HEAD_ANIMATION_DICT[basename(HEAD_ANIMATION_PATHS[i])[13:-4]] = HEAD_ANIMATION_PATHS[i]
-for i in range(0, len(TORSO_ANIMATION_PATHS)):
-    TORSO_ANIMATION_DICT[basename(TORSO_ANIMATION_PATHS[i])[14:-4]] = TORSO_ANIMATION_PATHS[i]
-for i in range(0, len(LEG_ANIMATION_PATHS)):
-    LEG_ANIMATION_DICT[basename(LEG_ANIMATION_PATHS[i])[13:-4]] = LEG_ANIMATION_PATHS[i]
-
-HEAD_ANIMATIONS = list(HEAD_ANIMATION_DICT)
-TORSO_ANIMATIONS = list(TORSO_ANIMATION_DICT)
-LEG_ANIMATIONS = list(LEG_ANIMATION_DICT)
-
-HEAD_ANIMATIONS.sort()
-TORSO_ANIMATIONS.sort()
-LEG_ANIMATIONS.sort()
+HEAD_ANIMATIONS = []
+TORSO_ANIMATIONS = []
+LEG_ANIMATIONS = []
 
 ANIMATION_NAME_DICT = {
     "head": HEAD_ANIMATIONS,
@@ -52,6 +38,26 @@ ANIMATION_NAME_DICT = {
     "leg": LEG_ANIMATIONS
 }
 
+_is_loaded = False
+
+
+def load_boss_animations():
+    """Discovers the Boss Cog animations and stores them in the module's animation dicts/lists. Does nothing if they
+    have already been discovered.
+    """
+    global _is_loaded
+    if _is_loaded:
+        return
+    with timer("load_boss_animations"):
+        HEAD_ANIMATION_DICT.update(animation_index.get_animation_dict("bossCog-head-"))
+        TORSO_ANIMATION_DICT.update(animation_index.get_animation_dict("bossCog-torso-"))
+        LEG_ANIMATION_DICT.update(animation_index.get_animation_dict("bossCog-legs-"))
+        HEAD_ANIMATIONS.extend(sorted(HEAD_ANIMATION_DICT))
+        TORSO_ANIMATIONS.extend(sorted(TORSO_ANIMATION_DICT))
+        LEG_ANIMATIONS.extend(sorted(LEG_ANIMATION_DICT))
+    _is_loaded = True
+
+
 class BossActorData(ActorData):
     """Class that stores data on and generates actors for the four Boss Cogs."""
     _actor_type = "boss"
@@ -76,6 +82,7 @@ class BossActorData(ActorData):
         :return: An actor based on the data within this class.
         :rtype: Actor
         """
+        self.load_animations()
         department = self.get_data("department")
         actor = Actor({
             'head': HEAD_DICT[department],
@@ -89,16 +96,37 @@ class BossActorData(ActorData):
         actor.attach("head", "torso", "joint34")
         actor.attach("torso", "leg", "joint_pelvis")
 
-        treads = loader.load_model(TREADS_MODEL)
         axle = actor.find('**/joint_axle')
-        treads.reparent_to(axle)
+        asset_cache.get_model(TREADS_MODEL).copy_to(axle)
 
         return actor
 
+    def get_asset_paths(self):
+        """Returns the paths of the models and textures generate_actor will load, so they can be loaded ahead of time.
+
+        :return: A tuple S where S[0] is a list of model paths the Actor is built from, S[1] is a list of model
+            template paths read through the asset cache and S[2] is a list of texture paths.
+        :rtype: tuple
+        """
+        department = self.get_data("department")
+        return [HEAD_DICT[department], TORSO_DICT[department], LEGS_MODEL], [TREADS_MODEL], []
+
+    def load_animations(self):
+        """Discovers the Boss Cog animations."""
+        load_boss_animations()
+
     def get_animation_names(self):
         """Returns a dict specifying the animation names for this actor and its parts.
 
         :return: A dict of animation names with actor parts as keys.
         :rtype: dict
         """
+        self.load_animations()
         return ANIMATION_NAME_DICT
+
+    def get_animation_set_key(self):
+        """Returns a key identifying this actor's set of animations; actors with the same key share their animations.
+
+        :rtype: tuple
+        """
+        return ("boss",)
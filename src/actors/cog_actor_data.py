@@ -1,9 +1,9 @@
-import os
-import posixpath
-import src.util.vfs_glob as glob
+import src.util.animation_index as animation_index
+import src.util.asset_cache as asset_cache
 from panda3d.core import Filename, Vec4, VBase4
 from direct.actor.Actor import Actor
 from src.actors.actor_data import ActorData
+from src.util.profiler import timer
 
 SUIT_MODELS = {"a": Filename("phase_3.5/models/char/ttr_r_ene_cga_suit.bam"),
                "b": Filename("phase_3.5/models/char/ttr_r_ene_cgb_suit.bam"),
@@ -34,26 +34,30 @@ MEDALLION_COLORS = {
     'cash': Vec4(0.749, 0.769, 0.749, 1.000),
 }
 
-SUIT_ANIMATION_PATHS = {"a": glob.glob(posixpath.join("phase_*", "models", "char", "ttr_a_ene_cga_*.bam")),
-                        "b": glob.glob(posixpath.join("phase_*", "models", "char", "ttr_a_ene_cgb_*.bam")),
-                        "c": glob.glob(posixpath.join("phase_*", "models", "char", "ttr_a_ene_cgc_*.bam"))}
+SUIT_ANIMATION_PREFIXES = {"a": "ttr_a_ene_cga_",
+                           "b": "ttr_a_ene_cgb_",
+                           "c": "ttr_a_ene_cgc_"}
 
+# filled on demand by load_suit_animations()
 SUIT_ANIMATION_DICTS = {"a": {}, "b": {}, "c": {}}
+SUIT_ANIMATIONS = {"a": [], "b": [], "c": []}
+_loaded_suit_types = set()
 
-# split em up into dictionaries for the actor
-for i in range(0, len(SUIT_ANIMATION_PATHS["a"])):
-    SUIT_ANIMATION_DICTS["a"][os.path.basename(SUIT_ANIMATION_PATHS["a"][i])[14:-4]] = SUIT_ANIMATION_PATHS["a"][i]
 
-for i in range(0, len(SUIT_ANIMATION_PATHS["b"])):
-    SUIT_ANIMATION_DICTS["b"][os.path.basename(SUIT_ANIMATION_PATHS["b"][i])[14:-4]] = SUIT_ANIMATION_PATHS["b"][i]
+def load_suit_animations(suit_type):
+    """Discovers the animations for a suit type and stores them in SUIT_ANIMATION_DICTS and SUIT_ANIMATIONS. Does
+    nothing if they have already been discovered.
 
-for i in range(0, len(SUIT_ANIMATION_PATHS["c"])):
-    SUIT_ANIMATION_DICTS["c"][os.path.basename(SUIT_ANIMATION_PATHS["c"][i])[14:-4]] = SUIT_ANIMATION_PATHS["c"][i]
-
-SUIT_ANIMATIONS = {"a": list(SUIT_ANIMATION_DICTS["a"]),
-                   "b": list(SUIT_ANIMATION_DICTS["b"]),
-                   "c": list(SUIT_ANIMATION_DICTS["c"])}
-[SUIT_ANIMATIONS[x].sort() for x in SUIT_ANIMATIONS.keys()]
+    :param suit_type: The suit type (a, b or c).
+    :type suit_type: str
+    """
+    if suit_type in _loaded_suit_types:
+        return
+    with timer("load_suit_animations", {"suit_type": suit_type}):
+        SUIT_ANIMATION_DICTS[suit_type].update(
+            animation_index.get_animation_dict(SUIT_ANIMATION_PREFIXES[suit_type]))
+        SUIT_ANIMATIONS[suit_type].extend(sorted(SUIT_ANIMATION_DICTS[suit_type]))
+    _loaded_suit_types.add(suit_type)
 
 
 class CogActorData(ActorData):
@@ -127,15 +131,46 @@ class CogActorData(ActorData):
 
         return texture_dict
 
+    def load_animations(self):
+        """Discovers the animations for this cog's suit type."""
+        suit_type = self.get_data("suit_type")
+        if suit_type is not None:
+            load_suit_animations(suit_type)
+
     def get_animation_names(self):
         """Returns a dict specifying the animation names for this actor and its parts.
 
         :return: A dict of animation names with actor parts as keys.
         :rtype: dict
         """
+        self.load_animations()
         suit_type = self.get_data("suit_type")
         return None if suit_type is None else {'modelRoot': SUIT_ANIMATIONS[suit_type]}
 
+    def get_animation_set_key(self):
+        """Returns a key identifying this actor's set of animations; actors with the same key share their animations.
+
+        :rtype: tuple
+        """
+        return "suit", self.get_data("suit_type")
+
+    def get_asset_paths(self):
+        """Returns the paths of the models and textures generate_actor will load, so they can be loaded ahead of time.
+
+        :return: A tuple S where S[0] is a list of model paths the Actor is built from, S[1] is a list of model
+            template paths read through the asset cache and S[2] is a list of texture paths.
+        :rtype: tuple
+        """
+        model_paths = [SUIT_MODELS[self.get_data("suit_type")]]
+        template_paths = [self.get_data("head_path"), COG_ICONS]
+        texture_paths = []
+        texture_dict = self.get_suit_textures(self.get_data("department"), self.get_data("is_supervisor"))
+        if texture_dict is not None:
+            texture_paths += [texture_dict["blazer"], texture_dict["leg"], texture_dict["sleeve"]]
+        if self.get_data("head_texture") is not None:
+            texture_paths.append(self.get_data("head_texture"))
+        return model_paths, template_paths, texture_paths
+
     def generate_actor(self):
         """Returns an actor based on the data within this class.
 
@@ -143,6 +178,7 @@ class CogActorData(ActorData):
         :rtype: Actor
         """
         # Begin by creating the suit + applying the appropriate textures
+        self.load_animations()
         suit_type = self.get_data("suit_type")
         suit_model_path = SUIT_MODELS[suit_type]
         suit_animation_dict = SUIT_ANIMATION_DICTS[suit_type]
@@ -151,9 +187,9 @@ class CogActorData(ActorData):
         department = self.get_data("department")
         texture_dict = self.get_suit_textures(department, is_supervisor)
         if texture_dict is not None:
-            tx_blazer = loader.load_texture(texture_dict["blazer"])
-            tx_leg = loader.load_texture(texture_dict["leg"])
-            tx_sleeve = loader.load_texture(texture_dict["sleeve"])
+            tx_blazer = asset_cache.get_texture(texture_dict["blazer"])
+            tx_leg = asset_cache.get_texture(texture_dict["leg"])
+            tx_sleeve = asset_cache.get_texture(texture_dict["sleeve"])
             cog.find('**/torso').set_texture(tx_blazer, 1)
             cog.find('**/legs').set_texture(tx_leg, 1)
             cog.find('**/arms').set_texture(tx_sleeve, 1)
@@ -163,19 +199,18 @@ class CogActorData(ActorData):
         head_nodes = self.get_data("head_nodes")
         head_color = self.get_data("head_color")
         head_texture = self.get_data("head_texture")
-        head_model = loader.load_model(head_path)
+        head_model = asset_cache.get_model(head_path)
         head_null = cog.find('**/def_M_head_01')
         [head_model.find(head_node).copy_to(head_null) for head_node in head_nodes]
-        head_model.remove_node()
         if head_color is not None:
             head_null.set_color(head_color)
         if head_texture is not None:
-            head_tx = loader.load_texture(head_texture)
+            head_tx = asset_cache.get_texture(head_texture)
             head_null.set_texture(head_tx, 1)
 
         # Load and attach insignia
         chest_null = cog.find("**/jnt_M_attachMeter_01")
-        icons = loader.load_model(COG_ICONS)
+        icons = asset_cache.get_model(COG_ICONS)
         medallion = icons.find('**/' + MEDALLION_NAME_DICT[department]).copy_to(chest_null)
         medallion.set_pos_hpr_scale(*COG_ICON_POS_HPR_SCALE)
         medallion.set_color(MEDALLION_COLORS[department])
@@ -1,6 +1,4 @@
-from os.path import basename
-import posixpath
-import src.util.vfs_glob as glob
+import src.util.animation_index as animation_index
 from panda3d.core import Filename, Vec4, VBase4
 from direct.actor.Actor import Actor
 from src.actors.actor_data import ActorData
@@ -24,14 +22,17 @@ class GenericActorData(ActorData):
         self.set_name(name)
         self.add_data("scale", scale)
         self.model_path = model_path
+        self.animation_prefix = animation_prefix
 
-        self.generic_animation_paths = glob.glob("phase_*/models/char/" + animation_prefix + "*.bam")
-        self.generic_animation_dict = {}
-        filename_length = len(animation_prefix)
-        for i in range(0, len(self.generic_animation_paths)):
-            self.generic_animation_dict[
-                basename(self.generic_animation_paths[i])[filename_length:-4]
-            ] = self.generic_animation_paths[i]
+        # filled on demand by load_animations()
+        self.generic_animation_dict = None
+        self.generic_animations = None
+
+    def load_animations(self):
+        """Discovers the animations matching this actor's animation prefix."""
+        if self.generic_animation_dict is not None:
+            return
+        self.generic_animation_dict = animation_index.get_animation_dict(self.animation_prefix)
         self.generic_animations = list(self.generic_animation_dict)
         self.generic_animations.sort()
 
@@ -41,14 +42,32 @@ class GenericActorData(ActorData):
         :return: A dict of animation names with actor parts as keys.
         :rtype: dict
         """
+        self.load_animations()
         return {'modelRoot': self.generic_animations}
 
+    def get_animation_set_key(self):
+        """Returns a key identifying this actor's set of animations; actors with the same key share their animations.
+
+        :rtype: tuple
+        """
+        return "generic", self.animation_prefix
+
+    def get_asset_paths(self):
+        """Returns the paths of the models and textures generate_actor will load, so they can be loaded ahead of time.
+
+        :return: A tuple S where S[0] is a list of model paths the Actor is built from, S[1] is a list of model
+            template paths read through the asset cache and S[2] is a list of texture paths.
+        :rtype: tuple
+        """
+        return [self.model_path], [], []
+
     def generate_actor(self):
         """Returns an actor based on the data within this class.
 
         :return: An actor based on the data within this class.
         :rtype: Actor
         """
+        self.load_animations()
         scale = self.get_data("scale")
         actor = Actor(self.model_path, self.generic_animation_dict)
         actor.set_scale(scale)
@@ -1,17 +1,28 @@
-import os
-import posixpath
-import src.util.vfs_glob as glob
+import src.util.animation_index as animation_index
 from panda3d.core import Filename, Vec4, VBase4
 from direct.actor.Actor import Actor
 from src.actors.actor_data import ActorData
+from src.util.profiler import timer
 
 GOON_MODEL = "phase_9/models/char/ttr_r_chr_ene_cogGoonie.bam"
-GOON_ANIMATION_PATHS = glob.glob("phase_*/models/char/ttr_a_chr_ene_cogGoonie_*.bam")
+# filled on demand by load_goon_animations()
 GOON_ANIMATION_DICT = {}
-for i in range(0, len(GOON_ANIMATION_PATHS)):
-    GOON_ANIMATION_DICT[os.path.basename(GOON_ANIMATION_PATHS[i])[24:-4]] = GOON_ANIMATION_PATHS[i]
-GOON_ANIMATIONS = list(GOON_ANIMATION_DICT)
-GOON_ANIMATIONS.sort()
+GOON_ANIMATIONS = []
+_is_loaded = False
+
+
+def load_goon_animations():
+    """Discovers the Goon animations and stores them in GOON_ANIMATION_DICT and GOON_ANIMATIONS. Does nothing if they
+    have already been discovered.
+    """
+    global _is_loaded
+    if _is_loaded:
+        return
+    with timer("load_goon_animations"):
+        GOON_ANIMATION_DICT.update(animation_index.get_animation_dict("ttr_a_chr_ene_cogGoonie_"))
+        GOON_ANIMATIONS.extend(sorted(GOON_ANIMATION_DICT))
+    _is_loaded = True
+
 
 PG_COLORS = [
     Vec4(0.95, 0.0, 0.0, 1.0),
@@ -44,20 +55,42 @@ class GoonActorData(ActorData):
         self.add_data("scale", scale)
         self.add_data("is_security", is_security)
 
+    def load_animations(self):
+        """Discovers the Goon animations."""
+        load_goon_animations()
+
     def get_animation_names(self):
         """Returns a dict specifying the animation names for this actor and its parts.
 
         :return: A dict of animation names with actor parts as keys.
         :rtype: dict
         """
+        self.load_animations()
         return {'modelRoot': GOON_ANIMATIONS}
 
+    def get_animation_set_key(self):
+        """Returns a key identifying this actor's set of animations; actors with the same key share their animations.
+
+        :rtype: tuple
+        """
+        return ("goon",)
+
+    def get_asset_paths(self):
+        """Returns the paths of the models and textures generate_actor will load, so they can be loaded ahead of time.
+
+        :return: A tuple S where S[0] is a list of model paths the Actor is built from, S[1] is a list of model
+            template paths read through the asset cache and S[2] is a list of texture paths.
+        :rtype: tuple
+        """
+        return [GOON_MODEL], [], []
+
     def generate_actor(self):
         """Returns an actor based on the data within this class.
 
         :return: An actor based on the data within this class.
         :rtype: Actor
         """
+        self.load_animations()
         actor = Actor(GOON_MODEL, GOON_ANIMATION_DICT)
         hat_color = self.get_data("hat_color")
         is_security = self.get_data("is_security")
@@ -0,0 +1,181 @@
+"""A compact table of every joint transform on every frame of an animation.
+
+An AnimBundle stores each joint's channels separately and only a few of them per joint, so reading a whole frame means
+walking the bundle's hierarchy. JointTransformTable walks it once and flattens the result into one contiguous array of
+floats (frames x joints x position, rotation quaternion and scale), which can then be read, interpolated and compared
+frame by frame without touching the bundle again. An animation without frames gives an empty table, which has no
+transforms to read.
+"""
+from array import array
+from panda3d.core import AnimChannelMatrixXfmTable, AnimChannelScalarTable, LVecBase3f, LQuaternionf
+
+JOINT_STRIDE = 10  # x, y, z, r, i, j, k, sx, sy, sz
+DUPLICATE_FRAME_TOLERANCE = 1e-5
+
+
+class JointTransformTable:
+    """Every joint transform and slider value of every frame of an animation."""
+
+    def __init__(self, anim_bundle):
+        """Initializes the JointTransformTable, reading every frame of an animation.
+
+        :param anim_bundle: The animation to read.
+        :type anim_bundle: AnimBundle
+        """
+        self.name = anim_bundle.get_name()
+        self._num_frames = anim_bundle.get_num_frames()
+        self._frame_rate = anim_bundle.get_base_frame_rate()
+
+        joints = []
+        sliders = []
+        groups = [anim_bundle]
+        while groups:
+            group = groups.pop(0)
+            if isinstance(group, AnimChannelMatrixXfmTable):
+                joints.append(group)
+            elif isinstance(group, AnimChannelScalarTable):
+                sliders.append(group)
+            groups.extend(group.get_children())
+        self._joint_names = [joint.get_name() for joint in joints]
+        self._slider_names = [slider.get_name() for slider in sliders]
+
+        self._transforms = array("f")
+        self._slider_values = array("f")
+        pos, quat, scale = LVecBase3f(), LQuaternionf(), LVecBase3f()
+        for frame in range(self._num_frames):
+            for joint in joints:
+                joint.get_pos(frame, pos)
+                joint.get_quat(frame, quat)
+                joint.get_scale(frame, scale)
+                self._transforms.extend((pos[0], pos[1], pos[2], quat[0], quat[1], quat[2], quat[3],
+                                         scale[0], scale[1], scale[2]))
+            for slider in sliders:
+                self._slider_values.append(slider.get_value(frame))
+
+    def get_num_frames(self):
+        """Returns the number of frames in the animation.
+
+        :rtype: int
+        """
+        return self._num_frames
+
+    def get_frame_rate(self):
+        """Returns the frame rate of the animation.
+
+        :rtype: float
+        """
+        return self._frame_rate
+
+    def get_joint_names(self):
+        """Returns the names of the animated joints, in the order their transforms are stored.
+
+        :rtype: list[str]
+        """
+        return self._joint_names
+
+    def get_slider_names(self):
+        """Returns the names of the animated sliders (morphs), in the order their values are stored.
+
+        :rtype: list[str]
+        """
+        return self._slider_names
+
+    def get_memory_usage(self):
+        """Returns the memory used by the table's values, in bytes.
+
+        :rtype: int
+        """
+        return (len(self._transforms) + len(self._slider_values)) * self._transforms.itemsize
+
+    def _get_offset(self, frame, joint):
+        """Returns the index of a joint's transform on a frame within the table. Frames loop around."""
+        if not self._num_frames:
+            raise IndexError("'{}' has no frames".format(self.name))
+        if isinstance(joint, str):
+            joint = self._joint_names.index(joint)
+        return ((frame % self._num_frames) * len(self._joint_names) + joint) * JOINT_STRIDE
+
+    def get_transform(self, frame, joint):
+        """Returns a joint's transform on a frame.
+
+        :param frame: The frame. Frames past the end of the animation loop around.
+        :type frame: int
+        :param joint: The joint's name or index in get_joint_names().
+        :type joint: str | int
+        :return: A tuple S where S[0] is the position, S[1] the rotation and S[2] the scale.
+        :rtype: tuple
+        """
+        offset = self._get_offset(frame, joint)
+        values = self._transforms[offset:offset + JOINT_STRIDE]
+        return LVecBase3f(*values[0:3]), LQuaternionf(*values[3:7]), LVecBase3f(*values[7:10])
+
+    def get_interpolated_transform(self, frame, joint):
+        """Returns a joint's transform at a fractional frame, blended between the two frames around it. The last frame
+        blends into the first.
+
+        :param frame: The fractional frame.
+        :type frame: float
+        :param joint: The joint's name or index in get_joint_names().
+        :type joint: str | int
+        :return: A tuple S where S[0] is the position, S[1] the rotation and S[2] the scale.
+        :rtype: tuple
+        """
+        first_frame = int(frame // 1)
+        t = frame - first_frame
+        pos, quat, scale = self.get_transform(first_frame, joint)
+        if t == 0:
+            return pos, quat, scale
+        next_pos, next_quat, next_scale = self.get_transform(first_frame + 1, joint)
+        if quat.dot(next_quat) < 0:
+            # take the short way around
+            next_quat = -next_quat
+        quat = quat * (1 - t) + next_quat * t
+        quat.normalize()
+        return pos + (next_pos - pos) * t, quat, scale + (next_scale - scale) * t
+
+    def get_slider_value(self, frame, slider):
+        """Returns a slider's value on a frame.
+
+        :param frame: The frame. Frames past the end of the animation loop around.
+        :type frame: int
+        :param slider: The slider's name or index in get_slider_names().
+        :type slider: str | int
+        :rtype: float
+        """
+        if not self._num_frames:
+            raise IndexError("'{}' has no frames".format(self.name))
+        if isinstance(slider, str):
+            slider = self._slider_names.index(slider)
+        return self._slider_values[(frame % self._num_frames) * len(self._slider_names) + slider]
+
+    def get_frame_difference(self, frame_a, frame_b):
+        """Returns how different two frames are: the largest difference between any of their values.
+
+        :type frame_a: int
+        :type frame_b: int
+        :rtype: float
+        """
+        if not self._num_frames:
+            return 0.0
+        frame_size = len(self._joint_names) * JOINT_STRIDE
+        a = self._get_offset(frame_a, 0)
+        b = self._get_offset(frame_b, 0)
+        difference = max((abs(x - y) for x, y in zip(self._transforms[a:a + frame_size],
+                                                     self._transforms[b:b + frame_size])), default=0.0)
+        if self._slider_names:
+            num_sliders = len(self._slider_names)
+            a = (frame_a % self._num_frames) * num_sliders
+            b = (frame_b % self._num_frames) * num_sliders
+            difference = max(difference, max(abs(x - y) for x, y in zip(self._slider_values[a:a + num_sliders],
+                                                                        self._slider_values[b:b + num_sliders])))
+        return difference
+
+    def get_duplicate_frames(self, tolerance=DUPLICATE_FRAME_TOLERANCE):
+        """Returns the frames that are identical to the frame before them, i.e. held poses.
+
+        :param tolerance: The largest difference between two frames' values for them to count as identical.
+        :type tolerance: float
+        :rtype: list[int]
+        """
+        return [frame for frame in range(1, self._num_frames)
+                if self.get_frame_difference(frame - 1, frame) <= tolerance]
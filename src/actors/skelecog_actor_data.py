@@ -1,5 +1,6 @@
 from src.actors.cog_actor_data import *
 from panda3d.core import Texture
+import src.util.asset_cache as asset_cache
 
 SKELECOG_MODELS = {"a": Filename("phase_5/models/char/ttr_r_ene_cga_skelecog.bam"),
                    "b": Filename("phase_5/models/char/ttr_r_ene_cgb_skelecog.bam"),
@@ -10,13 +11,20 @@ TIE_DICT = {"sell": "phase_5/maps/cog_robot_tie_sales.jpg",
             "law":  "phase_5/maps/cog_robot_tie_legal.jpg",
             "boss": "phase_5/maps/cog_robot_tie_boss.jpg",}
 
+_skelecog_data_cache = {}  # CogActorData -> SkelecogActorData, see make_skelecog_data_from_cog_data()
+
+
 def make_skelecog_data_from_cog_data(cog_data):
-    """Method that creates a SkelecogActorData instance from CogActorData"""
-    name = cog_data.get_name()
-    department = cog_data.get_data("department")
-    suit_type = cog_data.get_data("suit_type")
-    scale = cog_data.get_data("scale")
-    return SkelecogActorData(name, department, suit_type, scale)
+    """Method that returns a SkelecogActorData instance for a CogActorData. The instance is created the first time and
+    the same instance is returned on every call after that.
+    """
+    if cog_data not in _skelecog_data_cache:
+        name = cog_data.get_name()
+        department = cog_data.get_data("department")
+        suit_type = cog_data.get_data("suit_type")
+        scale = cog_data.get_data("scale")
+        _skelecog_data_cache[cog_data] = SkelecogActorData(name, department, suit_type, scale)
+    return _skelecog_data_cache[cog_data]
 
 
 class SkelecogActorData(CogActorData):
@@ -37,6 +45,17 @@ class SkelecogActorData(CogActorData):
         """
         super().__init__(name, department, suit_type, scale)
 
+    def get_asset_paths(self):
+        """Returns the paths of the models and textures generate_actor will load, so they can be loaded ahead of time.
+
+        :return: A tuple S where S[0] is a list of model paths the Actor is built from, S[1] is a list of model
+            template paths read through the asset cache and S[2] is a list of texture paths.
+        :rtype: tuple
+        """
+        model_paths = [SKELECOG_MODELS[self.get_data("suit_type")]]
+        texture_paths = [TIE_DICT[self.get_data("department")]]
+        return model_paths, [COG_ICONS], texture_paths
+
     def generate_actor(self):
         """Returns an actor based on the data within this class.
 
@@ -47,18 +66,19 @@ class SkelecogActorData(CogActorData):
         suit_type = self.get_data("suit_type")
         scale = self.get_data("scale")
 
+        self.load_animations()
         cog = Actor(SKELECOG_MODELS[suit_type], SUIT_ANIMATION_DICTS[suit_type])
 
         # Load and attach insignia
         chest_null = cog.find("**/jnt_M_attachMeter_01")
-        icons = loader.load_model(COG_ICONS)
+        icons = asset_cache.get_model(COG_ICONS)
         medallion = icons.find('**/' + MEDALLION_NAME_DICT[department]).copy_to(chest_null)
         medallion.set_pos_hpr_scale(*COG_ICON_POS_HPR_SCALE)
         medallion.set_color(MEDALLION_COLORS[department])
 
         # generate tie
         tie = cog.find('**/tie')
-        tie_texture = loader.load_texture(TIE_DICT[department])
+        tie_texture = asset_cache.get_texture(TIE_DICT[department])
         tie_texture.set_minfilter(Texture.FTLinearMipmapLinear)
         tie_texture.set_magfilter(Texture.FTLinear)
         tie.set_texture(tie_texture, 1)
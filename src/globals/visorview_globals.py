@@ -1,5 +1,6 @@
 import os
 import posixpath
+from panda3d.core import ConfigVariableInt, ConfigVariableBool, ConfigVariableString
 
 DEFAULT_POS = (0, 0, 0)
 DEFAULT_HPR = (180, 0, 0)
@@ -7,9 +8,55 @@ DEFAULT_HPR = (180, 0, 0)
 DEFAULT_CAMERA_NODE_POS = (0, 0, 4.2)
 DEFAULT_CAMERA_POS = (0, -20, 0)
 
+# lose animations have their own body type and viewing them on the wrong model = unpleasant
+HIDDEN_ANIMATIONS = ("lose", "lose_zero")
+
 SCREENSHOT_DIR = "screenshots"
+SCREENSHOT_QUEUE_SIZE = 32  # captured screenshots that may wait to be written before capturing blocks
+HIGH_RESOLUTION_MAX_TILE_SIZE = 2048  # larger high resolution screenshots are rendered in tiles
+JOINT_TABLE_CACHE_SIZE = 16  # joint transform tables each ActorManager keeps, least recently used are dropped
+EXPORT_DIR = "exports"
+BATCH_RENDER_DIR = "renders"
+# config for rendering without a window or GPU, using the software renderer
+HEADLESS_PRC_DATA = """
+window-type offscreen
+load-display p3tinydisplay
+audio-library-name null
+framebuffer-multisample 0
+multisamples 0
+"""
 
 SHADOW_MODEL = posixpath.join("phase_3","models","props","drop_shadow.bam")
 SHADOW_SCALE = 0.45
 SHADOW_COLOR = (0.0, 0.0, 0.0, 0.5)
 
+CACHE_DIR = "cache"
+ANIMATION_INDEX_FILE = os.path.join(CACHE_DIR, "animation_index.json")
+RENDER_CACHE_DIR = os.path.join(CACHE_DIR, "renders")
+
+ACTOR_POOL_SIZE = ConfigVariableInt("visorview-actor-pool-size", 8,
+                                    "The number of recently viewed actors to keep built in memory.")
+PRECOMPUTE_JOINT_TABLES = ConfigVariableBool("visorview-precompute-joint-tables", False,
+                                             "Whether to build a table of every joint transform of an animation when "
+                                             "it's posed.")
+ANIMATION_CACHE_SIZE = ConfigVariableInt("visorview-animation-cache-size", 64,
+                                         "The memory, in megabytes, that loaded animations shared between actors may "
+                                         "use before the least recently played are released.")
+SCREENSHOT_BURST_FRAMES = ConfigVariableInt("visorview-screenshot-burst-frames", 30,
+                                            "The number of consecutive frames captured by a screenshot burst.")
+HIGH_RESOLUTION_SCREENSHOT_SIZE = ConfigVariableInt("visorview-high-resolution-screenshot-size", "4096 4096",
+                                                    "The width and height of high resolution screenshots.")
+EXPORT_FRAME_SIZE = ConfigVariableInt("visorview-export-frame-size", "512 512",
+                                      "The width and height of each frame of exported animations.")
+PROFILING = ConfigVariableBool("visorview-profiling", False,
+                               "Whether to time loading, building and capturing, writing a Chrome trace on exit.")
+PROFILING_TRACE_FILE = ConfigVariableString("visorview-profiling-trace-file", "profile-trace.json",
+                                            "The file the Chrome trace is written to when profiling.")
+RENDER_SERVER_PORT = ConfigVariableInt("visorview-render-server-port", 7665,
+                                       "The localhost port the render server listens on.")
+RENDER_SERVER_QUEUE_SIZE = ConfigVariableInt("visorview-render-server-queue-size", 16,
+                                             "The number of render jobs that may wait before the render server stops "
+                                             "reading new ones.")
+RENDER_CACHE_SIZE = ConfigVariableInt("visorview-render-cache-size", 256,
+                                      "The disk space, in megabytes, that cached renders may use before the least "
+                                      "recently used are deleted.")
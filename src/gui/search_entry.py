@@ -0,0 +1,69 @@
+from direct.gui.DirectGui import DirectEntry
+
+
+class SearchEntry(DirectEntry):
+    """A text entry that calls changeCommand with its text after every keystroke.
+
+    While it has focus, keyboard and mouse button events are thrown with eventPrefix prepended to their names, so
+    typing doesn't trigger the application's hotkeys. Pressing escape removes the focus.
+    """
+
+    def __init__(self, parent=None, **kw):
+        """Initializes the SearchEntry. Takes the same keywords as DirectEntry, as well as changeCommand and
+        eventPrefix.
+        """
+        optiondefs = (
+            ('changeCommand', None, None),
+            ('eventPrefix', 'search-', None),
+        )
+        self.defineoptions(kw, optiondefs)
+        DirectEntry.__init__(self, parent)
+        self.initialiseoptions(SearchEntry)
+
+        self._previous_prefix = None
+        self.accept(self.guiItem.get_type_event(), self._on_change)
+        self.accept(self.guiItem.get_erase_event(), self._on_change)
+        self.accept(self["eventPrefix"] + "escape", self.set_focus, [False])
+
+    def set_focus(self, focus):
+        """Gives focus to or removes focus from the entry.
+
+        :type focus: bool
+        """
+        self["focus"] = focus
+
+    def clear(self):
+        """Clears the text in the entry without calling changeCommand."""
+        self.enterText("")
+
+    def focusInCommandFunc(self):
+        button_thrower = _get_button_thrower()
+        if self._previous_prefix is None and button_thrower is not None:
+            self._previous_prefix = button_thrower.get_prefix()
+            button_thrower.set_prefix(self["eventPrefix"])
+        DirectEntry.focusInCommandFunc(self)
+
+    def focusOutCommandFunc(self):
+        self._restore_prefix()
+        DirectEntry.focusOutCommandFunc(self)
+
+    def _restore_prefix(self):
+        """Stops prepending eventPrefix to event names."""
+        button_thrower = _get_button_thrower()
+        if self._previous_prefix is not None and button_thrower is not None:
+            button_thrower.set_prefix(self._previous_prefix)
+        self._previous_prefix = None
+
+    def _on_change(self, *args):
+        """Called after every keystroke; passes the entry's text to changeCommand."""
+        if self["changeCommand"] is not None:
+            self["changeCommand"](self.get())
+
+    def destroy(self):
+        self._restore_prefix()
+        DirectEntry.destroy(self)
+
+
+def _get_button_thrower():
+    """Returns the ButtonThrower of the main window, or None if there is no window."""
+    return base.buttonThrowers[0].node() if base.buttonThrowers else None
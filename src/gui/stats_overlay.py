@@ -0,0 +1,72 @@
+from panda3d.core import TextNode
+from direct.gui.OnscreenText import OnscreenText
+from direct.showbase.DirectObject import DirectObject
+from src.actors.animation_cache import get_animation_cache
+
+UPDATE_INTERVAL = 0.5  # seconds between updates of the overlay's text
+
+
+class StatsOverlay(DirectObject):
+    """Text in the top right corner of the screen showing the frame time, the time taken by the last actor build,
+    the hit rates of the actor pool and animation cache, as recorded by a Profiler, and the memory used by joint
+    transform tables.
+    """
+
+    def __init__(self, profiler, actor=None):
+        """Initializes the StatsOverlay. It starts hidden.
+
+        :param profiler: The profiler to read timers and counters from.
+        :type profiler: Profiler
+        :param actor: The actor whose joint transform tables are reported. If None, they aren't.
+        :type actor: ActorManager
+        """
+        DirectObject.__init__(self)
+        self._profiler = profiler
+        self._actor = actor
+        self._text = OnscreenText(text="", parent=base.a2dTopRight, pos=(-0.05, -0.08), scale=0.05,
+                                  align=TextNode.ARight, fg=(1, 1, 1, 1), shadow=(0, 0, 0, 1), mayChange=True)
+        self._text.hide()
+        self._is_visible = False
+
+    def toggle(self):
+        """Shows the overlay if it's hidden, or hides it if it's shown."""
+        self.set_visible(not self._is_visible)
+
+    def set_visible(self, is_visible):
+        """Shows or hides the overlay. It's only updated while shown.
+
+        :type is_visible: bool
+        """
+        self._is_visible = is_visible
+        if is_visible:
+            self._update()
+            self._text.show()
+            taskMgr.doMethodLater(UPDATE_INTERVAL, self._update_task, "stats_overlay_update")
+        else:
+            self._text.hide()
+            taskMgr.remove("stats_overlay_update")
+
+    def _update_task(self, task):
+        self._update()
+        return task.again
+
+    def _update(self):
+        """Refreshes the overlay's text."""
+        frame_rate = globalClock.get_average_frame_rate()
+        build_time = self._profiler.get_last_duration("ActorManager._build_actor")
+        animation_cache = get_animation_cache()
+        lines = [
+            "frame time: {:.2f} ms".format(1000 / frame_rate if frame_rate else 0),
+            "last build: {}".format("{:.1f} ms".format(build_time * 1000) if build_time is not None else "-"),
+            "actor pool hits: {:.0%}".format(self._profiler.get_hit_rate("actor_pool")),
+            "animation cache hits: {:.0%} ({} loaded, {:.1f} MB)".format(
+                animation_cache.get_hit_rate(), animation_cache.get_num_animations(),
+                animation_cache.get_memory_usage() / (1024 * 1024)),
+        ]
+        if self._actor is not None:
+            lines.append("joint tables: {:.1f} MB".format(self._actor.get_joint_table_memory_usage() / (1024 * 1024)))
+        self._text.setText("\n".join(lines))
+
+    def destroy(self):
+        taskMgr.remove("stats_overlay_update")
+        self._text.destroy()
@@ -0,0 +1,72 @@
+from panda3d.core import TextNode
+from direct.gui.DirectGui import DirectFrame, DirectSlider, DirectLabel
+
+
+class TimelineBar(DirectFrame):
+    """A slider for scrubbing through the frames of an animation. Dragging it calls command with the frame under the
+    thumb, which is fractional unless the thumb sits exactly on a frame. The last frame blends back into the first, as
+    the animation would when looping.
+    """
+
+    def __init__(self, parent=None, **kw):
+        """Initializes the TimelineBar. Takes the same keywords as DirectFrame, as well as command."""
+        optiondefs = (
+            ('command', None, None),
+            ('relief', None, None),
+        )
+        self.defineoptions(kw, optiondefs)
+        DirectFrame.__init__(self, parent)
+
+        self._num_frames = 1
+        # the slider reports changes through events, so moves made by set_frame() are only recognizable by value
+        self._value = 0
+        self.slider = self.createcomponent("slider", (), None, DirectSlider, (self,),
+                                           range=(0, 1), value=0, pageSize=1, scale=(1.1, 1, 0.6),
+                                           command=self._on_slider_moved)
+        self.label = self.createcomponent("label", (), None, DirectLabel, (self,),
+                                          text="", text_scale=0.06, text_align=TextNode.ALeft, relief=None,
+                                          pos=(1.15, 0, -0.02))
+        self.initialiseoptions(TimelineBar)
+
+    def set_num_frames(self, num_frames):
+        """Sets the number of frames in the animation being scrubbed through.
+
+        :param num_frames: The number of frames.
+        :type num_frames: int
+        """
+        self._num_frames = max(1, num_frames)
+        self.slider["range"] = (0, self._num_frames)
+        self._value = self.slider.guiItem.get_value()
+
+    def set_frame(self, frame):
+        """Moves the thumb to a frame without calling command.
+
+        :param frame: The frame, which may be fractional.
+        :type frame: float
+        """
+        self.slider["value"] = frame
+        self._value = self.slider.guiItem.get_value()
+        self._update_label(frame)
+
+    def get_frame(self):
+        """Returns the frame under the thumb.
+
+        :rtype: float
+        """
+        return self.slider["value"] % self._num_frames
+
+    def _update_label(self, frame):
+        """Shows the frame under the thumb next to the bar."""
+        text = "{:.2f} / {}".format(frame % self._num_frames, self._num_frames)
+        if self.label["text"] != text:
+            self.label["text"] = text
+
+    def _on_slider_moved(self):
+        """Called whenever the slider's value changes."""
+        if self.slider.guiItem.get_value() == self._value:
+            return
+        self._value = self.slider.guiItem.get_value()
+        frame = self.get_frame()
+        self._update_label(frame)
+        if self["command"] is not None:
+            self["command"](frame)
@@ -0,0 +1,105 @@
+from panda3d.core import TextNode
+from direct.gui.DirectGui import DirectFrame, DirectButton
+from direct.gui import DirectGuiGlobals as DGG
+
+
+class VirtualScrollList(DirectFrame):
+    """A scrolled list of text buttons that only ever creates numItemsVisible buttons. Items are plain data, and the
+    buttons are rebound to whichever items are in view as the list scrolls, so setting a list of hundreds of items
+    creates no widgets at all.
+
+    Items are (text, command, extraArgs) tuples. Items with a command of None are shown as labels.
+    """
+
+    def __init__(self, parent=None, **kw):
+        """Initializes the VirtualScrollList. Takes the same incButton_*, decButton_* and itemFrame_* keywords as
+        DirectScrolledList, as well as numItemsVisible, forceHeight and itemTextScale.
+        """
+        optiondefs = (
+            ('numItemsVisible', 15, None),
+            ('forceHeight', 0.11, None),
+            ('itemTextScale', 0.1, None),
+        )
+        self.defineoptions(kw, optiondefs)
+        DirectFrame.__init__(self, parent)
+
+        self._items = []
+        self._index = 0
+
+        self.incButton = self.createcomponent("incButton", (), None, DirectButton, (self,),
+                                              command=self.scroll_by, extraArgs=[1])
+        self.decButton = self.createcomponent("decButton", (), None, DirectButton, (self,),
+                                              command=self.scroll_by, extraArgs=[-1])
+        self.itemFrame = self.createcomponent("itemFrame", (), None, DirectFrame, (self,), relief=None)
+
+        # the only item widgets this list will ever have
+        self._buttons = []
+        for i in range(self["numItemsVisible"]):
+            button = DirectButton(parent=self.itemFrame, text="", text_scale=self["itemTextScale"],
+                                  text_align=TextNode.ALeft, relief=None, suppressMouse=False,
+                                  pos=(0, 0, -i * self["forceHeight"]))
+            button.hide()
+            self._buttons.append(button)
+
+        self.initialiseoptions(VirtualScrollList)
+        self.refresh()
+
+    def set_items(self, items):
+        """Replaces the items in the list and scrolls back to the top.
+
+        :param items: A list of (text, command, extraArgs) tuples.
+        :type items: list[tuple]
+        """
+        self._items = items
+        self._index = 0
+        self.refresh()
+
+    def get_items(self):
+        """Returns the items in the list.
+
+        :rtype: list[tuple]
+        """
+        return self._items
+
+    def scroll_by(self, delta):
+        """Scrolls the list by a number of items.
+
+        :param delta: The number of items to scroll by; negative values scroll up.
+        :type delta: int
+        """
+        self.scroll_to(self._index + delta)
+
+    def scroll_to(self, index):
+        """Scrolls the list so the item at index is at the top, as far as possible.
+
+        :param index: The index of the item to show at the top.
+        :type index: int
+        """
+        self._index = max(0, min(index, len(self._items) - self["numItemsVisible"]))
+        self.refresh()
+
+    def refresh(self):
+        """Rebinds the buttons to the items currently in view."""
+        for i, button in enumerate(self._buttons):
+            item_index = self._index + i
+            if item_index >= len(self._items):
+                button.hide()
+                continue
+            text, command, extra_args = self._items[item_index]
+            # only touch what changed; setting the text regenerates the button's geometry
+            if button["text"] != text:
+                button["text"] = text
+            button["command"] = command
+            button["extraArgs"] = extra_args
+            button.show()
+
+        can_scroll = len(self._items) > self["numItemsVisible"]
+        self.decButton["state"] = DGG.NORMAL if can_scroll and self._index > 0 else DGG.DISABLED
+        self.incButton["state"] = DGG.NORMAL if can_scroll and self._index < len(self._items) - len(self._buttons) \
+            else DGG.DISABLED
+
+    def destroy(self):
+        for button in self._buttons:
+            button.destroy()
+        self._buttons = []
+        DirectFrame.destroy(self)
@@ -0,0 +1,312 @@
+"""Exports every frame of an actor's animation as a sprite sheet or an animated PNG.
+
+Frames are rendered one at a time through HighResolutionCapture (offscreen, transparent background) and handed
+straight to the output, so the animation is never held in memory as a whole. Frames on which no joint moves (held
+poses) are found from the actor's joint transform tables and not rendered at all; the previous frame is reused.
+Identical consecutive frames are also detected by hash and only stored once: a sprite sheet maps them to the same cell,
+and an animated PNG shows the previous frame for longer.
+"""
+import os
+import json
+import hashlib
+from math import ceil, sqrt
+from panda3d.core import Texture, PNMImage, Filename
+from src.util.apng_writer import APNGWriter
+from src.util.high_resolution_capture import HighResolutionCapture
+from src.actors.joint_transform_table import DUPLICATE_FRAME_TOLERANCE
+
+DEFAULT_FPS = 24
+
+
+class AnimationExporter:
+    """Renders the frames of an ActorManager's animations and writes them to sprite sheets or animated PNGs."""
+
+    def __init__(self, actor, width, height, capture=None):
+        """Initializes the AnimationExporter.
+
+        :param actor: The actor to export animations from.
+        :type actor: ActorManager
+        :param width: The width of each frame.
+        :type width: int
+        :param height: The height of each frame.
+        :type height: int
+        :param capture: The capture used to render frames. If None, a new HighResolutionCapture is made.
+        :type capture: HighResolutionCapture
+        """
+        self._actor = actor
+        self.width = width
+        self.height = height
+        self._capture = capture if capture is not None else HighResolutionCapture()
+
+    def get_part_animations(self, animation):
+        """Returns the parts an animation would be played on: every part that has an animation of that name.
+
+        :param animation: The animation name.
+        :type animation: str
+        :return: A dict of animation names with actor parts as keys.
+        :rtype: dict
+        """
+        return {part: animation for part in self._actor.get_actor_parts()
+                if animation in (self._actor.get_actor_animations(part) or [])}
+
+    def _iterate_frames(self, part_animations):
+        """Poses the given parts on each frame of their animations in turn, yielding the rendered frames. Parts with
+        shorter animations loop until the longest animation has finished. The actor's previous animations are
+        restored afterwards.
+
+        :param part_animations: A dict of animation names with actor parts as keys, or a single animation name to
+            play on every part that has it.
+        :type part_animations: dict | str
+        :return: A generator of (frame index, number of frames, PNMImage) tuples.
+        """
+        if isinstance(part_animations, str):
+            part_animations = self.get_part_animations(part_animations)
+        previous_state = self._get_animation_state()
+        try:
+            posed_parts = self._actor.pose_animations(part_animations)
+            num_frames = max([self._actor.get_num_frames(part) for part in posed_parts] or [0])
+            held_frames = [_get_held_frames(self._actor.get_joint_transform_table(part)) for part in posed_parts]
+            image = None
+            for frame in range(num_frames):
+                if frame > 0:
+                    for part in posed_parts:
+                        self._actor.increment_pose(1, part)
+                # parts with shorter animations loop, so each part is on its own frame
+                if image is None or not all(held is not None and frame % part_frames in held
+                                            for held, part_frames in held_frames):
+                    image = self._capture.capture(self.width, self.height)
+                yield frame, num_frames, image
+        finally:
+            self._restore_animation_state(previous_state)
+
+    def _get_fps(self, part_animations):
+        """Returns the frame rate to export at: that of the first animation that can be played."""
+        if isinstance(part_animations, str):
+            part_animations = self.get_part_animations(part_animations)
+        for part in part_animations:
+            frame_rate = self._actor.get_frame_rate(part)
+            if frame_rate:
+                return frame_rate
+        return DEFAULT_FPS
+
+    def export(self, part_animations, apng_path=None, sprite_sheet_path=None, columns=None):
+        """Exports an animation as a looping animated PNG, a sprite sheet, or both. Each frame is only rendered once,
+        however many outputs it's written to.
+
+        :param part_animations: A dict of animation names with actor parts as keys, or a single animation name to
+            play on every part that has it.
+        :type part_animations: dict | str
+        :param apng_path: The path to write the animated PNG to. If None, no animated PNG is written.
+        :type apng_path: str
+        :param sprite_sheet_path: The path to write the sprite sheet to. If None, no sprite sheet is written.
+        :type sprite_sheet_path: str
+        :param columns: The number of columns in the sprite sheet's grid. If None, the grid is made roughly square.
+        :type columns: int
+        :return: A tuple S where S[0] is the number of frames in the animation, S[1] is the number of distinct frames
+            stored in the animated PNG and S[2] the number of distinct frames stored in the sprite sheet.
+        :rtype: tuple
+        """
+        if isinstance(part_animations, str):
+            part_animations = self.get_part_animations(part_animations)
+        for path in (apng_path, sprite_sheet_path):
+            if path is not None:
+                _make_parent_dirs(path)
+        writer = None
+        sheet = None
+        num_frames = 0
+        try:
+            for _, total_frames, image in self._iterate_frames(part_animations):
+                if num_frames == 0:
+                    # the animation is posed by now, so its frame rate can be read
+                    fps = self._get_fps(part_animations)
+                    if apng_path is not None:
+                        writer = APNGWriter(apng_path, self.width, self.height, fps)
+                    if sprite_sheet_path is not None:
+                        sheet = _SpriteSheet(self.width, self.height, total_frames, fps, columns)
+                if writer is not None:
+                    writer.add_frame(_get_rgba_rows(image))
+                if sheet is not None:
+                    sheet.add_frame(image)
+                num_frames += 1
+        finally:
+            if writer is not None:
+                writer.close()
+        if sheet is not None:
+            sheet.write(sprite_sheet_path, part_animations)
+        return (num_frames, writer.get_frame_count() if writer is not None else 0,
+                sheet.get_cell_count() if sheet is not None else 0)
+
+    def export_apng(self, part_animations, path):
+        """Exports an animation as a looping animated PNG.
+
+        :param part_animations: A dict of animation names with actor parts as keys, or a single animation name to
+            play on every part that has it.
+        :type part_animations: dict | str
+        :param path: The path to write the animated PNG to.
+        :type path: str
+        :return: A tuple S where S[0] is the number of frames in the animation and S[1] is the number of distinct
+            frames that were stored.
+        :rtype: tuple
+        """
+        num_frames, frame_count, _ = self.export(part_animations, apng_path=path)
+        return num_frames, frame_count
+
+    def export_sprite_sheet(self, part_animations, path, columns=None):
+        """Exports an animation as a sprite sheet: a grid of frames, left to right and top to bottom. A JSON file
+        describing the sheet is written next to it (path + ".json"), mapping each frame to its cell in the grid.
+
+        :param part_animations: A dict of animation names with actor parts as keys, or a single animation name to
+            play on every part that has it.
+        :type part_animations: dict | str
+        :param path: The path to write the sprite sheet to.
+        :type path: str
+        :param columns: The number of columns in the grid. If None, the grid is made roughly square.
+        :type columns: int
+        :return: A tuple S where S[0] is the number of frames in the animation and S[1] is the number of distinct
+            frames that were stored.
+        :rtype: tuple
+        """
+        num_frames, _, cell_count = self.export(part_animations, sprite_sheet_path=path, columns=columns)
+        return num_frames, cell_count
+
+    def _get_animation_state(self):
+        """Returns what each part of the actor is currently doing, so it can be restored after an export.
+
+        :return: A dict of (animation, frame, is posed) tuples with actor parts as keys.
+        :rtype: dict
+        """
+        return {part: (self._actor.get_current_animation(part), self._actor.get_current_frame(part),
+                       self._actor.is_posed(part))
+                for part in self._actor.get_actor_parts()}
+
+    def _restore_animation_state(self, state):
+        """Restores the actor to a state returned by _get_animation_state()."""
+        for part, (animation, frame, is_posed) in state.items():
+            if animation is None:
+                self._actor.set_pose_mode(False, part)
+            elif is_posed:
+                self._actor.pose_animations({part: animation})
+                self._actor.increment_pose(frame or 0, part)
+            else:
+                self._actor.animate(animation, part, frame)
+
+
+class _SpriteSheet:
+    """A sprite sheet being filled in frame by frame. Identical consecutive frames share a cell."""
+
+    def __init__(self, width, height, num_frames, fps, columns=None):
+        """Initializes the _SpriteSheet with room for every frame.
+
+        :param width: The width of each frame.
+        :type width: int
+        :param height: The height of each frame.
+        :type height: int
+        :param num_frames: The number of frames in the animation.
+        :type num_frames: int
+        :param fps: The frame rate of the animation.
+        :type fps: float
+        :param columns: The number of columns in the grid. If None, the grid is made roughly square.
+        :type columns: int
+        """
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.columns = columns if columns is not None else max(1, ceil(sqrt(num_frames)))
+        rows = max(1, ceil(num_frames / self.columns))
+        self._image = PNMImage(self.columns * width, rows * height, 4)
+        self._cells = []  # the cell each frame is drawn in
+        self._cell_count = 0
+        self._previous_hash = None
+
+    def add_frame(self, image):
+        """Adds the next frame to the sheet.
+
+        :type image: PNMImage
+        """
+        frame_hash = _hash_image(image)
+        if frame_hash == self._previous_hash:
+            self._cells.append(self._cells[-1])
+            return
+        self._previous_hash = frame_hash
+        self._image.copy_sub_image(image, (self._cell_count % self.columns) * self.width,
+                                   (self._cell_count // self.columns) * self.height, 0, 0)
+        self._cells.append(self._cell_count)
+        self._cell_count += 1
+
+    def get_cell_count(self):
+        """Returns the number of distinct frames stored in the sheet.
+
+        :rtype: int
+        """
+        return self._cell_count
+
+    def write(self, path, part_animations):
+        """Writes the sheet to path and its description to path + ".json".
+
+        :param path: The path to write the sprite sheet to.
+        :type path: str
+        :param part_animations: A dict of animation names with actor parts as keys, for the description.
+        :type part_animations: dict
+        """
+        sheet = self._image
+        # drop the rows that went unused because of duplicate frames
+        used_rows = ceil(self._cell_count / self.columns)
+        if used_rows * self.height < sheet.get_y_size():
+            cropped = PNMImage(sheet.get_x_size(), used_rows * self.height, 4)
+            cropped.copy_sub_image(sheet, 0, 0, 0, 0)
+            sheet = cropped
+        sheet.write(Filename.from_os_specific(path))
+        with open(path + ".json", "w") as f:
+            json.dump({"frame_width": self.width,
+                       "frame_height": self.height,
+                       "columns": self.columns,
+                       "cells": self._cell_count,
+                       "fps": self.fps,
+                       "animations": part_animations,
+                       "frames": self._cells}, f, indent=1)
+
+
+def _make_parent_dirs(path):
+    """Creates the directory a file will be written to, if necessary."""
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+
+def _get_held_frames(table):
+    """Returns the frames of an animation on which nothing moves since the frame before, including the first frame if
+    the animation loops back to it seamlessly.
+
+    :type table: JointTransformTable
+    :return: A tuple S where S[0] is the set of held frames (None if there's no table) and S[1] the number of frames.
+    :rtype: tuple
+    """
+    if table is None or not table.get_num_frames():
+        return None, 1
+    held = set(table.get_duplicate_frames())
+    if table.get_frame_difference(-1, 0) <= DUPLICATE_FRAME_TOLERANCE:
+        held.add(0)
+    return held, table.get_num_frames()
+
+
+def _get_rgba_rows(image):
+    """Returns a PNMImage's pixels as rows of RGBA bytes, top to bottom.
+
+    :type image: PNMImage
+    :rtype: list[bytes]
+    """
+    texture = Texture()
+    texture.load(image)
+    data = bytes(texture.get_ram_image_as("RGBA"))
+    row_size = image.get_x_size() * 4
+    # textures store their rows bottom to top
+    return [data[i:i + row_size] for i in range(len(data) - row_size, -1, -row_size)]
+
+
+def _hash_image(image):
+    """Returns a hash of a PNMImage's pixels.
+
+    :type image: PNMImage
+    :rtype: bytes
+    """
+    return hashlib.blake2b(b"".join(_get_rgba_rows(image)), digest_size=16).digest()
@@ -0,0 +1,105 @@
+"""Persistent index of the animation files found within the mounted phase files.
+
+Looking up animations means listing the character directories of every mounted multifile, which is slow. The results
+of every lookup are stored on disk alongside the path, size and modification time of each mounted multifile; on later
+starts the lookups are answered from the index without touching the VFS. If any of the mounted multifiles change (i.e.
+after a game patch) the index is discarded and rebuilt.
+"""
+import json
+import os
+import posixpath
+from panda3d.core import VirtualFileSystem, VirtualFileMountMultifile
+import src.util.vfs_scanner as vfs_scanner
+import src.globals.visorview_globals as visorview_globals
+
+INDEX_VERSION = 1
+
+_index = None  # the loaded index, see _get_index()
+
+
+def get_mount_signature():
+    """Returns a list describing every multifile currently mounted to the VFS, used to tell if the index is stale.
+
+    :return: A list of [path, size, mtime] lists, one per mounted multifile.
+    :rtype: list[list]
+    """
+    signature = []
+    vfs = VirtualFileSystem.get_global_ptr()
+    for mount in vfs.get_mounts():
+        if not isinstance(mount, VirtualFileMountMultifile):
+            continue
+        path = mount.get_multifile().get_multifile_name().to_os_specific()
+        try:
+            stat = os.stat(path)
+            signature.append([path, stat.st_size, stat.st_mtime_ns])
+        except OSError:
+            signature.append([path, None, None])
+    return signature
+
+
+def _get_index():
+    """Returns the animation index, loading it from disk the first time it is needed. A fresh index is created if the
+    one on disk is missing, unreadable or stale.
+
+    :return: The animation index.
+    :rtype: dict
+    """
+    global _index
+    if _index is not None:
+        return _index
+
+    signature = get_mount_signature()
+    try:
+        with open(visorview_globals.ANIMATION_INDEX_FILE, "r") as f:
+            index = json.load(f)
+        if index.get("version") != INDEX_VERSION or index.get("mounts") != signature:
+            index = None
+    except (OSError, ValueError):
+        index = None
+
+    if index is None:
+        index = {"version": INDEX_VERSION, "mounts": signature, "animations": {}}
+    _index = index
+    return _index
+
+
+def _save_index():
+    """Writes the animation index to disk. Failing to do so is not fatal; the index will simply be rebuilt next time."""
+    path = visorview_globals.ANIMATION_INDEX_FILE
+    temp_path = path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp_path, "w") as f:
+            json.dump(_index, f)
+        os.replace(temp_path, path)
+    except OSError:
+        pass
+
+
+def get_animation_paths(prefix):
+    """Returns the paths of every animation in the phase files that begins with the given prefix.
+
+    :param prefix: The prefix of the animation filenames, i.e. "ttr_a_ene_cga_"
+    :type prefix: str
+    :return: A list of VFS paths to the matching animations.
+    :rtype: list[str]
+    """
+    animations = _get_index()["animations"]
+    if prefix not in animations:
+        animations[prefix] = vfs_scanner.find(prefix)
+        _save_index()
+    return list(animations[prefix])
+
+
+def get_animation_dict(prefix):
+    """Returns a dictionary of animations that begin with the given prefix, suitable for passing to an Actor.
+
+    :param prefix: The prefix of the animation filenames, i.e. "ttr_a_ene_cga_". It is stripped from the names.
+    :type prefix: str
+    :return: A dict with animation names as keys and VFS paths as values.
+    :rtype: dict
+    """
+    animation_dict = {}
+    for path in get_animation_paths(prefix):
+        animation_dict[posixpath.basename(path)[len(prefix):-4]] = path
+    return animation_dict
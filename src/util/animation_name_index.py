@@ -0,0 +1,86 @@
+"""The animation names shown in the animation menu, sorted, filtered and indexed for searching once per set of
+animations.
+
+Actors that share their animations (every cog of a suit type, every goon, the bosses' parts) share one entry, keyed by
+ActorManager.get_animation_set_key().
+"""
+from bisect import bisect_left
+import src.globals.visorview_globals as visorview_globals
+
+
+class AnimationNameIndex:
+    """Caches the sorted, filtered list of animation names for each set of animations, and searches them by prefix and
+    substring.
+    """
+
+    def __init__(self):
+        """Initializes the AnimationNameIndex."""
+        self._names = {}
+        self._folded_names = {}  # sorted (lowercase name, name) tuples, for prefix searches
+        self._last_search = {}  # the (query, results) of the last search of each key, narrowed by the next search
+
+    def get_names(self, key, names):
+        """Returns the animation names to list for a set of animations, sorted and without hidden animations.
+
+        :param key: The key identifying the set of animations, from ActorManager.get_animation_set_key().
+        :param names: The set's animation names; only used the first time a key is seen.
+        :type names: list[str]
+        :rtype: list[str]
+        """
+        if key not in self._names:
+            self._names[key] = sorted(name for name in (names or []) if name not in visorview_globals.HIDDEN_ANIMATIONS)
+            self._folded_names[key] = sorted((name.lower(), name) for name in self._names[key])
+        return self._names[key]
+
+    def search(self, key, names, query):
+        """Returns the animation names in a set of animations that contain a query, ignoring case. Names that start
+        with the query come first, followed by the names that only contain it, each in sorted order.
+
+        Searching for a query that extends the previous query for the same key (as it does while it's being typed)
+        only looks through the previous results.
+
+        :param key: The key identifying the set of animations, from ActorManager.get_animation_set_key().
+        :param names: The set's animation names; only used the first time a key is seen.
+        :type names: list[str]
+        :param query: The text to search for.
+        :type query: str
+        :rtype: list[str]
+        """
+        all_names = self.get_names(key, names)
+        query = query.strip().lower()
+        if not query:
+            return all_names
+
+        last_query, last_results = self._last_search.get(key, (None, None))
+        if last_query == query:
+            return last_results
+        if last_query is not None and query.startswith(last_query):
+            # a longer query can only match names the shorter one matched
+            prefixed = [name for name in last_results if name.lower().startswith(query)]
+            contained = sorted(name for name in last_results
+                               if query in name.lower() and not name.lower().startswith(query))
+        else:
+            prefixed = self._get_prefixed(key, query)
+            prefixed_set = set(prefixed)
+            contained = [name for name in all_names if name not in prefixed_set and query in name.lower()]
+
+        results = prefixed + contained
+        self._last_search[key] = (query, results)
+        return results
+
+    def _get_prefixed(self, key, query):
+        """Returns the names in a set of animations that start with a lowercase query, in sorted order."""
+        folded_names = self._folded_names[key]
+        prefixed = []
+        for i in range(bisect_left(folded_names, (query,)), len(folded_names)):
+            folded, name = folded_names[i]
+            if not folded.startswith(query):
+                break
+            prefixed.append(name)
+        return sorted(prefixed)
+
+    def clear(self):
+        """Forgets every cached list."""
+        self._names = {}
+        self._folded_names = {}
+        self._last_search = {}
@@ -0,0 +1,130 @@
+"""A minimal streaming writer for animated PNGs (APNG), as Panda3D can only write still images.
+
+Frames are compressed and written as they are added, so only the most recent frame is held in memory. A frame that is
+identical to the one before it is not stored again; the previous frame is shown for longer instead.
+"""
+import struct
+import zlib
+import hashlib
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+COLOR_TYPE_RGBA = 6
+DISPOSE_OP_NONE = 0
+BLEND_OP_SOURCE = 0
+MAX_DELAY = 0xffff  # fcTL stores a frame's delay as an unsigned 16 bit fraction
+
+
+class APNGWriter:
+    """Writes RGBA frames of a fixed size to an animated PNG file."""
+
+    def __init__(self, path, width, height, fps, num_plays=0, compression_level=6):
+        """Initializes the APNGWriter and writes the file header.
+
+        :param path: The path to write the animation to.
+        :type path: str
+        :param width: The width of each frame.
+        :type width: int
+        :param height: The height of each frame.
+        :type height: int
+        :param fps: The frame rate of the animation.
+        :type fps: float
+        :param num_plays: The number of times the animation plays; 0 loops forever.
+        :type num_plays: int
+        :param compression_level: The zlib compression level, from 0 to 9.
+        :type compression_level: int
+        """
+        self.width = width
+        self.height = height
+        # delays are stored as a fraction of a second; keep a few decimals of the frame rate
+        self._delay_denominator = 1000
+        self._frame_delay = min(MAX_DELAY, int(round(self._delay_denominator / fps))) if fps else 100
+        self._compression_level = compression_level
+        self._num_plays = num_plays
+        self._sequence_number = 0
+        self._frame_count = 0  # frames written to the file, after deduplication
+        self._pending = None  # the (hash, compressed data, delay) of the last frame, written once the next one differs
+
+        self._file = open(path, "wb")
+        self._file.write(PNG_SIGNATURE)
+        self._write_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, COLOR_TYPE_RGBA, 0, 0, 0))
+        # the frame count isn't known yet; it's filled in by close()
+        self._actl_position = self._file.tell()
+        self._write_chunk(b"acTL", struct.pack(">II", 0, num_plays))
+
+    def add_frame(self, rows):
+        """Adds a frame to the animation.
+
+        :param rows: The frame's rows of RGBA pixels, top to bottom, each width * 4 bytes long.
+        :type rows: list[bytes]
+        :return: False if the frame was identical to the previous one, and only extended its delay.
+        :rtype: bool
+        """
+        frame_hash = hashlib.blake2b(digest_size=16)
+        for row in rows:
+            frame_hash.update(row)
+        frame_hash = frame_hash.digest()
+        if self._pending is not None and self._pending[0] == frame_hash:
+            if self._pending[2] + self._frame_delay <= MAX_DELAY:
+                self._pending[2] += self._frame_delay
+                return False
+            # the delay can't get any longer, so write the frame and show it again as the next one
+            _, data, _ = self._pending
+            self._flush_pending()
+            self._pending = [frame_hash, data, self._frame_delay]
+            return False
+
+        self._flush_pending()
+        compressor = zlib.compressobj(self._compression_level)
+        data = [compressor.compress(b"\x00" + row) for row in rows]  # filter type 0 (none) for every row
+        data.append(compressor.flush())
+        self._pending = [frame_hash, b"".join(data), self._frame_delay]
+        return True
+
+    def _flush_pending(self):
+        """Writes the pending frame to the file."""
+        if self._pending is None:
+            return
+        _, data, delay = self._pending
+        self._write_chunk(b"fcTL", struct.pack(">IIIIIHHBB", self._next_sequence_number(), self.width, self.height,
+                                               0, 0, delay, self._delay_denominator, DISPOSE_OP_NONE,
+                                               BLEND_OP_SOURCE))
+        if self._frame_count == 0:
+            # the first frame doubles as the still image shown by viewers without APNG support
+            self._write_chunk(b"IDAT", data)
+        else:
+            self._write_chunk(b"fdAT", struct.pack(">I", self._next_sequence_number()) + data)
+        self._frame_count += 1
+        self._pending = None
+
+    def _next_sequence_number(self):
+        """Returns the next sequence number for fcTL and fdAT chunks."""
+        self._sequence_number += 1
+        return self._sequence_number - 1
+
+    def _write_chunk(self, chunk_type, data):
+        """Writes a PNG chunk to the file."""
+        self._file.write(struct.pack(">I", len(data)))
+        self._file.write(chunk_type)
+        self._file.write(data)
+        self._file.write(struct.pack(">I", zlib.crc32(chunk_type + data) & 0xffffffff))
+
+    def get_frame_count(self):
+        """Returns the number of distinct frames added so far.
+
+        :rtype: int
+        """
+        return self._frame_count + (1 if self._pending is not None else 0)
+
+    def close(self):
+        """Writes the last frame and the end of the file, then fills in the frame count and closes the file."""
+        self._flush_pending()
+        self._write_chunk(b"IEND", b"")
+        self._file.seek(self._actl_position)
+        self._write_chunk(b"acTL", struct.pack(">II", self._frame_count, self._num_plays))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
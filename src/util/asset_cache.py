@@ -0,0 +1,122 @@
+"""Cache of the shared models and textures used to build actors, such as head models, cog icons and suit textures.
+
+Most cogs share a handful of head files, one icon file and a few sets of textures, so only one copy of each is ever
+loaded. Models are kept as templates: callers should copy what they need out of them and never modify or remove the
+templates themselves.
+"""
+
+
+class AssetCache:
+    """Keeps one loaded copy of each model template and texture, counting cache hits and misses."""
+
+    def __init__(self):
+        """Initializes the AssetCache."""
+        self._models = {}
+        self._textures = {}
+        self._model_hits = 0
+        self._model_misses = 0
+        self._texture_hits = 0
+        self._texture_misses = 0
+
+    def get_model(self, path):
+        """Returns the template for a model, loading it if necessary. Do not modify or remove the returned NodePath.
+
+        :param path: Path to the model.
+        :type path: str | Filename
+        :rtype: NodePath
+        """
+        key = str(path)
+        if key in self._models:
+            self._model_hits += 1
+        else:
+            self._model_misses += 1
+            self._models[key] = loader.load_model(path)
+        return self._models[key]
+
+    def get_texture(self, path):
+        """Returns a texture, loading it if necessary. The texture is shared between everything that uses it.
+
+        :param path: Path to the texture.
+        :type path: str | Filename
+        :rtype: Texture
+        """
+        key = str(path)
+        if key in self._textures:
+            self._texture_hits += 1
+        else:
+            self._texture_misses += 1
+            self._textures[key] = loader.load_texture(path)
+        return self._textures[key]
+
+    def store_model(self, path, model):
+        """Stores a model that was loaded elsewhere (i.e. by the prefetcher) as a template, if none exists yet. This
+        does not count as a hit or miss.
+
+        :param path: Path to the model.
+        :type path: str | Filename
+        :param model: The loaded model.
+        :type model: NodePath
+        """
+        self._models.setdefault(str(path), model)
+
+    def store_texture(self, path, texture):
+        """Stores a texture that was loaded elsewhere (i.e. by the prefetcher), if none exists yet. This does not count
+        as a hit or miss.
+
+        :param path: Path to the texture.
+        :type path: str | Filename
+        :param texture: The loaded texture.
+        :type texture: Texture
+        """
+        self._textures.setdefault(str(path), texture)
+
+    def get_stats(self):
+        """Returns the cache's hit/miss counters and the number of assets it holds.
+
+        :rtype: dict
+        """
+        return {"model_hits": self._model_hits,
+                "model_misses": self._model_misses,
+                "texture_hits": self._texture_hits,
+                "texture_misses": self._texture_misses,
+                "models": len(self._models),
+                "textures": len(self._textures)}
+
+    def clear(self):
+        """Releases every cached asset and resets the counters."""
+        for model in self._models.values():
+            model.remove_node()
+        self._models = {}
+        self._textures = {}
+        self._model_hits = 0
+        self._model_misses = 0
+        self._texture_hits = 0
+        self._texture_misses = 0
+
+
+_cache = AssetCache()
+
+
+def get_model(path):
+    """Returns a model template from the shared cache. See AssetCache.get_model()."""
+    return _cache.get_model(path)
+
+
+def get_texture(path):
+    """Returns a texture from the shared cache. See AssetCache.get_texture()."""
+    return _cache.get_texture(path)
+
+
+def store_model(path, model):
+    """Stores a model in the shared cache. See AssetCache.store_model()."""
+    _cache.store_model(path, model)
+
+
+def store_texture(path, texture):
+    """Stores a texture in the shared cache. See AssetCache.store_texture()."""
+    _cache.store_texture(path, texture)
+
+
+def get_stats():
+    """Returns the shared cache's counters. See AssetCache.get_stats()."""
+    return _cache.get_stats()
@@ -0,0 +1,340 @@
+"""Headless batch rendering of every frame of every animation on a set of actors.
+
+Jobs are queued per actor and processed in order: the actor is built once, then every animation is posed frame by
+frame through ActorManager.set_pose_mode() and ActorManager.increment_pose(), exactly as pose mode does in the viewer.
+Each frame is written to <output dir>/<set>/<actor>/<animation>/<frame>.png, and every rendered animation is
+recorded in a manifest that can be written to <output dir>/manifest.json. With a RenderCache, frames that have been
+rendered before (i.e. by an earlier export) are copied from the cache instead of rendered.
+
+Requires a running ShowBase with a window or offscreen buffer (base.win) and mounted phase files.
+"""
+import os
+import re
+import json
+from collections import deque
+from timeit import default_timer
+from panda3d.core import NodePath, Filename, PNMImage
+import src.globals.visorview_globals as visorview_globals
+from src.actors.actor_manager import ActorManager
+from src.globals.actor_globals import ACTORS
+from src.actors.skelecog_actor_data import make_skelecog_data_from_cog_data
+from src.util.render_cache import get_render_key, refresh_mount_signature, encode_png, decode_png
+
+SKIPPED_ANIMATIONS = visorview_globals.HIDDEN_ANIMATIONS
+RENDER_CLEAR_COLOR = (0, 0, 0, 0)
+MANIFEST_FILE = "manifest.json"
+
+
+def get_safe_name(name):
+    """Returns a version of a name that is safe to use as a file or directory name.
+
+    :param name: The name, i.e. an actor's name.
+    :type name: str
+    :rtype: str
+    """
+    return re.sub(r"[^\w\-.()]+", "_", name).strip("_")
+
+
+def get_render_jobs(set_names, is_skelecog=False, animations=None):
+    """Returns a RenderJob for every (actor, animation) pair in the given sets, using the same animation names the
+    viewer lists. Useful for splitting an export into small pieces of work.
+
+    :param set_names: The names of the actor sets in ACTORS, i.e. ["sellbots", "bosses"].
+    :type set_names: list[str]
+    :param is_skelecog: If True, cogs will be rendered as skelecogs and other actors skipped.
+    :type is_skelecog: bool
+    :param animations: The animations to render. If None, every animation is rendered.
+    :type animations: list[str]
+    :rtype: list[RenderJob]
+    """
+    jobs = []
+    for set_name in set_names:
+        actor_set = ACTORS[set_name]
+        actor_set.load_animations()
+        for index in range(len(actor_set)):
+            actor_data = actor_set[index]
+            if is_skelecog:
+                if actor_data.get_type() != "cog":
+                    continue
+                actor_data = make_skelecog_data_from_cog_data(actor_data)
+            names = set()
+            for part_names in (actor_data.get_animation_names() or {}).values():
+                names.update(part_names)
+            for name in sorted(names):
+                if name in SKIPPED_ANIMATIONS or (animations is not None and name not in animations):
+                    continue
+                jobs.append(RenderJob(set_name, index, is_skelecog, [name]))
+    return jobs
+
+
+def write_manifest(entries, output_dir):
+    """Writes a manifest of rendered animations to <output_dir>/manifest.json, sorted by set, actor and animation.
+
+    :param entries: Manifest entries, as returned by BatchRenderer.get_manifest().
+    :type entries: list[dict]
+    :param output_dir: The directory the renders were written to.
+    :type output_dir: str
+    :return: The path to the manifest.
+    :rtype: str
+    """
+    entries = sorted(entries, key=lambda entry: (entry["set"], entry["actor"], entry["animation"]))
+    manifest = {"frames": sum(entry["frames"] for entry in entries), "animations": entries}
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=1)
+    return path
+
+
+class RenderJob:
+    """A request to render every frame of an actor's animations."""
+
+    def __init__(self, set_name, index, is_skelecog=False, animations=None):
+        """Initializes the RenderJob.
+
+        :param set_name: The name of the actor set in ACTORS, i.e. "sellbots".
+        :type set_name: str
+        :param index: The index of the actor within the set.
+        :type index: int
+        :param is_skelecog: If True, the actor will be rendered as a skelecog when possible.
+        :type is_skelecog: bool
+        :param animations: The animations to render. If None, every animation is rendered.
+        :type animations: list[str]
+        """
+        self.set_name = set_name
+        self.index = index
+        self.is_skelecog = is_skelecog
+        self.animations = animations
+
+    def get_actor_data(self):
+        """Returns the ActorData this job renders.
+
+        :rtype: ActorData
+        """
+        return ACTORS[self.set_name][self.index]
+
+    def get_output_name(self):
+        """Returns the name of the directory this job's renders are written to, within its set's directory.
+
+        :rtype: str
+        """
+        name = self.get_actor_data().get_name()
+        if self.is_skelecog and self.get_actor_data().get_type() == "cog":
+            name += " (Skelecog)"
+        return get_safe_name(name)
+
+
+class BatchRenderer:
+    """Renders queued RenderJobs frame by frame to image files, keeping track of throughput."""
+
+    def __init__(self, output_dir=visorview_globals.BATCH_RENDER_DIR, image_format="png", render_cache=None):
+        """Initializes the BatchRenderer, its ActorManager and the camera.
+
+        :param output_dir: The directory renders are written to.
+        :type output_dir: str
+        :param image_format: The file extension of the written images, i.e. "png" or "jpg".
+        :type image_format: str
+        :param render_cache: The cache frames are looked up in and stored to. If None, every frame is rendered.
+        :type render_cache: RenderCache
+        """
+        self.output_dir = output_dir
+        self.image_format = image_format
+        self._render_cache = render_cache
+        self._queue = deque()
+        self._frame_count = 0
+        self._render_time = 0.0
+        self._manifest = []
+        self._current_actor = None  # (set name, index, is skelecog) of the actor that is currently built
+
+        self._actor = ActorManager()
+        self._actor.reparent_to(render)
+        # every actor is only visited once, so there's no use in keeping them around
+        self._actor.set_actor_pool_size(0)
+
+        # frame actors the same way the viewer's default camera does
+        self._camera_node = NodePath("batch_camera_node")
+        self._camera_node.reparent_to(render)
+        self._camera_node.set_pos(*visorview_globals.DEFAULT_CAMERA_NODE_POS)
+        camera.reparent_to(self._camera_node)
+        camera.set_pos_hpr(*visorview_globals.DEFAULT_CAMERA_POS, 0, 0, 0)
+        base.win.set_clear_color(RENDER_CLEAR_COLOR)
+
+    def add_job(self, job):
+        """Adds a job to the end of the queue.
+
+        :param job: The job to add.
+        :type job: RenderJob
+        """
+        self._queue.append(job)
+
+    def queue_actor_set(self, set_name, is_skelecog=False, animations=None):
+        """Queues a job for every actor in a set.
+
+        :param set_name: The name of the actor set in ACTORS, i.e. "sellbots".
+        :type set_name: str
+        :param is_skelecog: If True, cogs will be rendered as skelecogs.
+        :type is_skelecog: bool
+        :param animations: The animations to render. If None, every animation is rendered.
+        :type animations: list[str]
+        """
+        actor_set = ACTORS[set_name]
+        actor_set.load_animations()
+        for index in range(len(actor_set)):
+            if is_skelecog and actor_set[index].get_type() != "cog":
+                continue
+            self.add_job(RenderJob(set_name, index, is_skelecog, animations))
+
+    def get_queue_length(self):
+        """Returns the number of jobs waiting in the queue.
+
+        :rtype: int
+        """
+        return len(self._queue)
+
+    def run(self, verbose=True):
+        """Processes every job in the queue.
+
+        :param verbose: If True, progress is printed after each job.
+        :type verbose: bool
+        :return: The number of frames rendered.
+        :rtype: int
+        """
+        total_jobs = len(self._queue)
+        frame_count = 0
+        refresh_mount_signature()
+        while self._queue:
+            job = self._queue.popleft()
+            start = default_timer()
+            job_frames = self.render_job(job)
+            job_time = default_timer() - start
+            frame_count += job_frames
+            if verbose:
+                print("[{}/{}] {}/{}: {} frames in {:.2f} s ({:.1f} fps)".format(
+                    total_jobs - len(self._queue), total_jobs, job.set_name, job.get_output_name(), job_frames,
+                    job_time, job_frames / job_time if job_time > 0 else 0.0))
+        return frame_count
+
+    def render_job(self, job):
+        """Renders every frame of every requested animation for a job.
+
+        :param job: The job to render.
+        :type job: RenderJob
+        :return: The number of frames rendered.
+        :rtype: int
+        """
+        start = default_timer()
+        # consecutive jobs often share an actor (one job per animation), so only rebuild it when it changes
+        actor_key = (job.set_name, job.index, job.is_skelecog)
+        if actor_key != self._current_actor:
+            self._actor.set_actor_data(job.get_actor_data())
+            self._actor.set_is_skelecog(job.is_skelecog)
+            self._current_actor = actor_key
+        job_dir = os.path.join(self.output_dir, job.set_name, job.get_output_name())
+
+        # multi-part actors (the bosses) have animations for each part, so pose every part that has the animation
+        parts = self._actor.get_actor_parts()
+        animation_parts = {}
+        for part in parts:
+            for animation in self._actor.get_actor_animations(part):
+                animation_parts.setdefault(animation, []).append(part)
+
+        frame_count = 0
+        for animation in sorted(animation_parts.keys()):
+            if animation in SKIPPED_ANIMATIONS or (job.animations is not None and animation not in job.animations):
+                continue
+            animation_dir = os.path.join(job_dir, get_safe_name(animation))
+            num_frames = self._render_animation(animation, animation_parts[animation], animation_dir)
+            if num_frames:
+                self._manifest.append({"set": job.set_name,
+                                       "actor": job.get_actor_data().get_name(),
+                                       "animation": animation,
+                                       "is_skelecog": job.is_skelecog,
+                                       "frames": num_frames,
+                                       "directory": os.path.relpath(animation_dir, self.output_dir),
+                                       "format": self.image_format})
+            frame_count += num_frames
+
+        self._frame_count += frame_count
+        self._render_time += default_timer() - start
+        return frame_count
+
+    def _render_animation(self, animation, parts, animation_dir):
+        """Poses the given parts on each frame of an animation in turn and writes each frame to a file.
+
+        :param animation: The animation to render.
+        :type animation: str
+        :param parts: The parts to pose.
+        :type parts: list[str]
+        :param animation_dir: The directory to write the frames to.
+        :type animation_dir: str
+        :return: The number of frames rendered.
+        :rtype: int
+        """
+        posed_parts = self._actor.pose_animations({part: animation for part in parts})
+        if not posed_parts:
+            return 0
+        num_frames = max(self._actor.get_num_frames(part) for part in posed_parts)
+        if not os.path.exists(animation_dir):
+            os.makedirs(animation_dir)
+
+        for frame in range(num_frames):
+            if frame > 0:
+                for part in posed_parts:
+                    self._actor.increment_pose(1, part)
+            path = os.path.join(animation_dir, "{:04d}.{}".format(frame, self.image_format))
+            self._write_frame(path)
+        return num_frames
+
+    def _write_frame(self, path):
+        """Renders the current frame and writes it to path, or copies it from the render cache if it's there."""
+        if self._render_cache is None:
+            base.graphics_engine.render_frame()
+            base.win.save_screenshot(Filename.from_os_specific(path))
+            return
+        key = get_render_key(self._actor, base.win.get_x_size(), base.win.get_y_size())
+        data = self._render_cache.get(key) if key is not None else None
+        if data is None:
+            base.graphics_engine.render_frame()
+            image = PNMImage()
+            base.win.get_screenshot().store(image)
+            data = encode_png(image)
+            if key is not None:
+                self._render_cache.put(key, data)
+        else:
+            image = None
+        if self.image_format.lower() == "png":
+            with open(path, "wb") as f:
+                f.write(data)
+        else:
+            image = decode_png(data) if image is None else image
+            image.write(Filename.from_os_specific(path))
+
+    def get_manifest(self):
+        """Returns an entry for every animation rendered so far, with the directory its frames were written to
+        (relative to the output directory) and the number of frames.
+
+        :rtype: list[dict]
+        """
+        return list(self._manifest)
+
+    def get_frame_count(self):
+        """Returns the total number of frames rendered so far.
+
+        :rtype: int
+        """
+        return self._frame_count
+
+    def get_render_time(self):
+        """Returns the total time spent rendering jobs so far, in seconds.
+
+        :rtype: float
+        """
+        return self._render_time
+
+    def get_frames_per_second(self):
+        """Returns the overall throughput so far, in frames written per second.
+
+        :rtype: float
+        """
+        return self._frame_count / self._render_time if self._render_time > 0 else 0.0
@@ -0,0 +1,136 @@
+"""Screenshots rendered into a separate offscreen buffer, at any resolution and with a transparent background.
+
+The live window is never resized or re-cleared. Resolutions beyond what a single buffer can hold are rendered in
+tiles: each tile narrows the camera's film to its own section of the image, and the tiles are stitched back together.
+The buffer is created on the first capture and kept (inactive) for the next one, unless the tile size changes.
+"""
+from math import ceil
+from panda3d.core import FrameBufferProperties, WindowProperties, GraphicsPipe, GraphicsOutput
+from panda3d.core import Texture, PNMImage, Camera
+import src.globals.visorview_globals as visorview_globals
+from src.util.profiler import profile
+
+CAPTURE_CLEAR_COLOR = (0, 0, 0, 0)
+
+
+class HighResolutionCapture:
+    """Renders what a camera sees into an offscreen buffer at a requested resolution, tiling if necessary."""
+
+    def __init__(self, source_camera=None, max_tile_size=visorview_globals.HIGH_RESOLUTION_MAX_TILE_SIZE):
+        """Initializes the HighResolutionCapture. No buffer is created until the first capture.
+
+        :param source_camera: The camera whose view is captured. If None, base.cam is used.
+        :type source_camera: NodePath
+        :param max_tile_size: The largest width or height to render in one piece.
+        :type max_tile_size: int
+        """
+        self._source_camera = source_camera if source_camera is not None else base.cam
+        self._max_tile_size = max_tile_size
+        self._buffer = None
+        self._buffer_size = None
+        self._texture = None
+        self._camera = None
+
+    def get_tile_size(self, width, height):
+        """Returns the size of the tiles a capture of the given resolution is rendered in.
+
+        :param width: The width of the capture.
+        :type width: int
+        :param height: The height of the capture.
+        :type height: int
+        :return: A tuple of the tile width and height.
+        :rtype: tuple
+        """
+        max_size = self._max_tile_size
+        gsg = base.win.get_gsg()
+        if gsg is not None and gsg.get_max_texture_dimension() > 0:
+            max_size = min(max_size, gsg.get_max_texture_dimension())
+        return min(width, max_size), min(height, max_size)
+
+    def _get_buffer(self, width, height):
+        """Returns an offscreen buffer of the given size, reusing the previous one if it matches.
+
+        :rtype: GraphicsOutput
+        """
+        if self._buffer is not None and self._buffer_size == (width, height):
+            return self._buffer
+        self.release()
+
+        fb_properties = FrameBufferProperties(FrameBufferProperties.get_default())
+        fb_properties.set_rgba_bits(8, 8, 8, 8)
+        window_properties = WindowProperties.size(width, height)
+        self._buffer = base.graphics_engine.make_output(base.pipe, "high_resolution_capture_buffer", -1,
+                                                        fb_properties, window_properties,
+                                                        GraphicsPipe.BF_refuse_window, base.win.get_gsg(), base.win)
+        if self._buffer is None:
+            raise RuntimeError("Could not create a {}x{} offscreen buffer.".format(width, height))
+        self._buffer_size = (width, height)
+        self._buffer.set_clear_color_active(True)
+        self._buffer.set_clear_color(CAPTURE_CLEAR_COLOR)
+        self._texture = Texture("high_resolution_capture")
+        self._buffer.add_render_texture(self._texture, GraphicsOutput.RTM_copy_ram)
+
+        # a camera that follows the source camera, with its own lens so it can be narrowed to each tile
+        source_node = self._source_camera.node()
+        camera_node = Camera("high_resolution_capture_camera", source_node.get_lens().make_copy())
+        camera_node.set_initial_state(source_node.get_initial_state())
+        camera_node.set_camera_mask(source_node.get_camera_mask())
+        self._camera = self._source_camera.attach_new_node(camera_node)
+        self._buffer.make_display_region().set_camera(self._camera)
+        self._buffer.set_active(False)
+        return self._buffer
+
+    @profile()
+    def capture(self, width, height):
+        """Renders the source camera's view at the given resolution and returns it. The camera's field of view is
+        kept horizontally, as if the window was resized to the given aspect ratio.
+
+        :param width: The width of the capture.
+        :type width: int
+        :param height: The height of the capture.
+        :type height: int
+        :return: The captured image, with an alpha channel.
+        :rtype: PNMImage
+        """
+        tile_width, tile_height = self.get_tile_size(width, height)
+        buffer = self._get_buffer(tile_width, tile_height)
+
+        lens = self._source_camera.node().get_lens().make_copy()
+        lens.set_aspect_ratio(width / height)
+        film_width, film_height = lens.get_film_size()
+        film_offset = lens.get_film_offset()
+        pixel_width, pixel_height = film_width / width, film_height / height
+
+        image = PNMImage(width, height, 4)
+        tile = PNMImage()
+        buffer.set_active(True)
+        try:
+            for row in range(ceil(height / tile_height)):
+                for column in range(ceil(width / tile_width)):
+                    # narrow the film to this tile; film y runs up while image rows run down
+                    tile_lens = lens.make_copy()
+                    tile_lens.set_film_size(tile_width * pixel_width, tile_height * pixel_height)
+                    # keep the focal length, so the smaller film narrows the field of view rather than scaling it
+                    tile_lens.set_focal_length(lens.get_focal_length())
+                    tile_lens.set_film_offset(
+                        film_offset[0] + ((column + 0.5) * tile_width - width / 2) * pixel_width,
+                        film_offset[1] + (height / 2 - (row + 0.5) * tile_height) * pixel_height)
+                    self._camera.node().set_lens(tile_lens)
+                    base.graphics_engine.render_frame()
+                    self._texture.store(tile)
+                    x, y = column * tile_width, row * tile_height
+                    image.copy_sub_image(tile, x, y, 0, 0, min(tile_width, width - x), min(tile_height, height - y))
+        finally:
+            buffer.set_active(False)
+        return image
+
+    def release(self):
+        """Frees the offscreen buffer. It will be recreated by the next capture."""
+        if self._buffer is None:
+            return
+        self._camera.remove_node()
+        base.graphics_engine.remove_window(self._buffer)
+        self._buffer = None
+        self._buffer_size = None
+        self._texture = None
+        self._camera = None
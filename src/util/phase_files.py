@@ -0,0 +1,85 @@
+"""Functions for mounting the Toontown Rewritten phase files to the VFS.
+
+The phase files are opened (and their indexes read) concurrently, which matters when the install directory lives on
+a slow or network-mounted drive. They are then mounted in order, so files in later phases take priority exactly as
+they would if they were mounted one at a time.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from timeit import default_timer
+from panda3d.core import VirtualFileSystem, Multifile, Filename
+from src.util.profiler import profile
+
+PHASE_FILES = ("3.5", "3", "4", "5", "5.5", "6", "7", "8", "9", "10", "11", "12", "13", "14")
+MAX_MOUNT_WORKERS = 8
+
+
+def get_phase_file_path(phase_file_dir, phase):
+    """Returns the path to a phase file within an install directory.
+
+    :param phase_file_dir: The Toontown Rewritten install directory.
+    :type phase_file_dir: Filename
+    :param phase: The phase, i.e. "3.5"
+    :type phase: str
+    :rtype: Filename
+    """
+    return phase_file_dir / Filename("phase_" + phase + ".mf")
+
+
+def _open_phase_file(path):
+    """Opens a phase file for reading.
+
+    :param path: Path to the phase file.
+    :type path: Filename
+    :return: A tuple of the opened Multifile (None on failure) and the time taken in seconds.
+    :rtype: tuple
+    """
+    start = default_timer()
+    multifile = Multifile()
+    if not multifile.open_read(path):
+        multifile = None
+    return multifile, default_timer() - start
+
+
+@profile()
+def mount_phase_files(phase_file_dir, phase_files=PHASE_FILES):
+    """Opens and validates the phase files concurrently, then mounts them to the VFS in order. Nothing is mounted
+    unless every phase file could be opened.
+
+    :param phase_file_dir: The Toontown Rewritten install directory.
+    :type phase_file_dir: Filename
+    :param phase_files: The phases to mount.
+    :type phase_files: tuple[str]
+    :return: A tuple S where S[0] is True if every phase file was mounted, S[1] is a dict of the time in seconds taken
+        to open and mount each phase, and S[2] is the total time taken in seconds.
+    :rtype: tuple
+    """
+    start = default_timer()
+    vfs = VirtualFileSystem.get_global_ptr()
+    paths = [get_phase_file_path(phase_file_dir, phase) for phase in phase_files]
+    with ThreadPoolExecutor(max_workers=min(MAX_MOUNT_WORKERS, len(paths))) as executor:
+        results = list(executor.map(_open_phase_file, paths))
+
+    mount_times = {}
+    if any(multifile is None for multifile, _ in results):
+        for phase, (multifile, open_time) in zip(phase_files, results):
+            mount_times[phase] = open_time
+        return False, mount_times, default_timer() - start
+
+    for phase, (multifile, open_time) in zip(phase_files, results):
+        mount_start = default_timer()
+        vfs.mount(multifile, ".", VirtualFileSystem.MF_read_only)
+        mount_times[phase] = open_time + (default_timer() - mount_start)
+    return True, mount_times, default_timer() - start
+
+
+def print_mount_report(mount_times, total_time):
+    """Prints the time taken to mount each phase file, and in total.
+
+    :param mount_times: A dict of phases and the time taken to mount them in seconds, from mount_phase_files().
+    :type mount_times: dict
+    :param total_time: The total time taken in seconds, from mount_phase_files().
+    :type total_time: float
+    """
+    for phase, mount_time in mount_times.items():
+        print("Mounted phase_{}.mf in {:.1f} ms".format(phase, mount_time * 1000))
+    print("Mounted {} phase files in {:.1f} ms".format(len(mount_times), total_time * 1000))
@@ -0,0 +1,226 @@
+"""Opt-in instrumentation: named timers and counters, written out as a Chrome trace (open it in chrome://tracing or
+https://ui.perfetto.dev).
+
+Profiling is enabled with visorview-profiling in VisorConfig.prc, which has to be loaded before this module is first
+imported. When it's off, profile() hands functions back undecorated and timer() returns a shared context manager that
+does nothing, so instrumented code runs exactly as it would without instrumentation.
+"""
+import os
+import json
+import atexit
+import threading
+import multiprocessing
+from functools import wraps
+from contextlib import nullcontext
+from timeit import default_timer
+import src.globals.visorview_globals as visorview_globals
+
+TRACE_CATEGORY = "visorview"
+
+_NULL_TIMER = nullcontext()
+_profiler = None
+_is_configured = False
+
+
+class Profiler:
+    """Records timers and counters as Chrome trace events, and keeps their latest values for display."""
+
+    def __init__(self):
+        """Initializes the Profiler."""
+        self._start = default_timer()
+        self._events = []
+        self._lock = threading.Lock()
+        self._last_durations = {}
+        self._total_durations = {}
+        self._call_counts = {}
+        self._counters = {}
+
+    def _get_timestamp(self, time):
+        """Returns a default_timer() time as microseconds since the profiler was created, as trace events expect."""
+        return (time - self._start) * 1000000
+
+    def add_duration(self, name, start, end, args=None):
+        """Records a timed stage.
+
+        :param name: The name of the stage.
+        :type name: str
+        :param start: The time the stage started, from default_timer().
+        :type start: float
+        :param end: The time the stage ended, from default_timer().
+        :type end: float
+        :param args: Extra details to show with the stage in the trace.
+        :type args: dict
+        """
+        event = {"name": name, "cat": TRACE_CATEGORY, "ph": "X", "ts": self._get_timestamp(start),
+                 "dur": (end - start) * 1000000, "pid": os.getpid(), "tid": threading.get_ident()}
+        if args:
+            event["args"] = args
+        with self._lock:
+            self._events.append(event)
+            self._last_durations[name] = end - start
+            self._total_durations[name] = self._total_durations.get(name, 0) + (end - start)
+            self._call_counts[name] = self._call_counts.get(name, 0) + 1
+
+    def timer(self, name, args=None):
+        """Returns a context manager that records the time spent inside it as a stage.
+
+        :param name: The name of the stage.
+        :type name: str
+        :param args: Extra details to show with the stage in the trace.
+        :type args: dict
+        """
+        return _Timer(self, name, args)
+
+    def count(self, name, amount=1):
+        """Increments a counter.
+
+        :param name: The name of the counter.
+        :type name: str
+        :param amount: The amount to increment it by.
+        :type amount: int
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+            self._events.append({"name": name, "cat": TRACE_CATEGORY, "ph": "C",
+                                 "ts": self._get_timestamp(default_timer()), "pid": os.getpid(),
+                                 "args": {"value": self._counters[name]}})
+
+    def get_last_duration(self, name):
+        """Returns how long a stage took the last time it ran, in seconds, or None if it hasn't run.
+
+        :rtype: float
+        """
+        return self._last_durations.get(name)
+
+    def get_total_duration(self, name):
+        """Returns how long a stage has taken over every time it ran, in seconds.
+
+        :rtype: float
+        """
+        return self._total_durations.get(name, 0)
+
+    def get_call_count(self, name):
+        """Returns the number of times a stage has run.
+
+        :rtype: int
+        """
+        return self._call_counts.get(name, 0)
+
+    def get_counter(self, name):
+        """Returns the value of a counter.
+
+        :rtype: int
+        """
+        return self._counters.get(name, 0)
+
+    def get_hit_rate(self, name):
+        """Returns the fraction of hits of a pair of counters named name + ".hits" and name + ".misses".
+
+        :rtype: float
+        """
+        hits = self.get_counter(name + ".hits")
+        lookups = hits + self.get_counter(name + ".misses")
+        return hits / lookups if lookups else 0.0
+
+    def write_trace(self, path):
+        """Writes everything recorded so far to a Chrome trace file.
+
+        :param path: The path to write the trace to.
+        :type path: str
+        """
+        with self._lock:
+            events = list(self._events)
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+class _Timer:
+    """Context manager returned by Profiler.timer()."""
+
+    def __init__(self, profiler, name, args):
+        self._profiler = profiler
+        self._name = name
+        self._args = args
+        self._start = None
+
+    def __enter__(self):
+        self._start = default_timer()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._profiler.add_duration(self._name, self._start, default_timer(), self._args)
+
+
+def get_profiler():
+    """Returns the profiler, or None if profiling is disabled. The trace is written when the program exits.
+
+    :rtype: Profiler
+    """
+    global _profiler, _is_configured
+    if not _is_configured:
+        _is_configured = True
+        if visorview_globals.PROFILING.get_value():
+            _profiler = Profiler()
+            atexit.register(_profiler.write_trace, _get_trace_path())
+    return _profiler
+
+
+def _get_trace_path():
+    """Returns the path to write this process's trace to; worker processes each get their own file."""
+    path = visorview_globals.PROFILING_TRACE_FILE.get_value()
+    if multiprocessing.parent_process() is not None:
+        root, extension = os.path.splitext(path)
+        path = "{}-{}{}".format(root, os.getpid(), extension)
+    return path
+
+
+def timer(name, args=None):
+    """Returns a context manager that records the time spent inside it as a stage, if profiling is enabled.
+
+    :param name: The name of the stage.
+    :type name: str
+    :param args: Extra details to show with the stage in the trace.
+    :type args: dict
+    """
+    profiler = get_profiler()
+    return profiler.timer(name, args) if profiler is not None else _NULL_TIMER
+
+
+def count(name, amount=1):
+    """Increments a counter, if profiling is enabled.
+
+    :param name: The name of the counter.
+    :type name: str
+    :param amount: The amount to increment it by.
+    :type amount: int
+    """
+    profiler = get_profiler()
+    if profiler is not None:
+        profiler.count(name, amount)
+
+
+def profile(name=None):
+    """Decorator that records every call of a function as a stage, if profiling is enabled. If it isn't, the function
+    is returned as it is.
+
+    :param name: The name of the stage. If None, the function's qualified name is used.
+    :type name: str
+    """
+    def decorator(function):
+        profiler = get_profiler()
+        if profiler is None:
+            return function
+        stage_name = name if name is not None else function.__qualname__
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            start = default_timer()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profiler.add_duration(stage_name, start, default_timer())
+        return wrapper
+    return decorator
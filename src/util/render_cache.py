@@ -0,0 +1,315 @@
+"""A persistent cache of rendered images, so rendering the same actor, pose and camera twice only renders it once.
+
+Renders are stored on disk as PNG files named after a hash of everything that affects how they look: the actor's
+state from ActorManager.get_scene_state() (its ActorData fields, skelecog and visibility flags, head rotation and the
+animation and frame of each part), the camera's transform and lens, the background color, the size of the image, the
+graphics pipe and framebuffer properties (i.e. antialiasing) and the mounted phase files. Any change to these gives a
+different key, so entries never have to be invalidated; after a game patch the old renders are simply never asked for
+again, and are deleted once the cache goes over its size limit, least recently used first. A cache
+hit is read straight from disk without rendering anything.
+
+Several processes (i.e. batch render workers) may share a cache directory. Each keeps its own index, but looks on disk
+for renders it doesn't know about and re-reads the directory before evicting, so between them they stay within the
+size limit. Renders read by other processes don't count as recently used until the directory is read again.
+"""
+import os
+import json
+import hashlib
+from collections import OrderedDict
+from panda3d.core import PNMImage, StringStream
+import src.globals.visorview_globals as visorview_globals
+from src.util.animation_index import get_mount_signature
+from src.util.profiler import count
+
+RENDER_CACHE_VERSION = 1
+RENDER_FILE_EXTENSION = ".png"
+FLOAT_PRECISION = 5  # decimal places floats are rounded to, so tiny numerical differences don't change the key
+
+_render_cache = None
+_mount_signature = None  # see refresh_mount_signature()
+
+
+def get_render_cache():
+    """Returns the render cache shared by this process, creating it if necessary.
+
+    :return: The render cache, or None if it is disabled.
+    :rtype: RenderCache
+    """
+    global _render_cache
+    size = visorview_globals.RENDER_CACHE_SIZE.get_value()
+    if size <= 0:
+        return None
+    if _render_cache is None:
+        _render_cache = RenderCache(visorview_globals.RENDER_CACHE_DIR, size * 1024 * 1024)
+    return _render_cache
+
+
+def refresh_mount_signature():
+    """Records the phase files that are currently mounted, for the keys built by get_render_key(). Stat-ing every
+    multifile is too slow to do for each frame, so this is done once after mounting (the first key built does it
+    automatically) and should be called again at the start of a run if the phase files may have changed.
+    """
+    global _mount_signature
+    _mount_signature = get_mount_signature()
+
+
+def _get_canonical_value(value):
+    """Returns a value as something json can encode the same way every time, rounding floats and turning Panda3D
+    vectors and other sequences into lists."""
+    if isinstance(value, float):
+        return round(value, FLOAT_PRECISION)
+    if isinstance(value, dict):
+        return {str(key): _get_canonical_value(item) for key, item in value.items()}
+    if isinstance(value, (str, int, bool)) or value is None:
+        return value
+    try:
+        return [_get_canonical_value(item) for item in value]
+    except TypeError:
+        return repr(value)
+
+
+def get_render_key(actor_manager, width, height, camera_np=None):
+    """Returns the key a render of an actor is cached under.
+
+    :param actor_manager: The actor being rendered.
+    :type actor_manager: ActorManager
+    :param width: The width of the render.
+    :type width: int
+    :param height: The height of the render.
+    :type height: int
+    :param camera_np: The camera the actor is rendered with. If None, base.cam is used.
+    :type camera_np: NodePath
+    :return: A hex digest, or None if the render can't be cached because the actor is animating.
+    :rtype: str
+    """
+    actor_state = actor_manager.get_scene_state()
+    if actor_state is None:
+        return None
+    if _mount_signature is None:
+        refresh_mount_signature()
+    camera_np = base.cam if camera_np is None else camera_np
+    lens = camera_np.node().get_lens()
+    camera_matrix = camera_np.get_mat(actor_manager)
+    state = {"version": RENDER_CACHE_VERSION,
+             "actor": actor_state,
+             "camera": [list(camera_matrix.get_row(row)) for row in range(4)],
+             "lens": [lens.get_type().get_name(), lens.get_fov()[0], lens.get_near(), lens.get_far(),
+                      list(lens.get_film_offset())],
+             "background": list(base.win.get_clear_color()),
+             "size": [width, height],
+             "pipe": base.pipe.get_type().get_name() if base.pipe is not None else None,
+             # antialiasing and the like change every pixel, so renders made with other settings don't match
+             "framebuffer": str(base.win.get_fb_properties()),
+             "mounts": _mount_signature}
+    encoded_state = json.dumps(_get_canonical_value(state), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded_state.encode("utf-8")).hexdigest()
+
+
+def encode_png(image):
+    """Encodes an image as PNG.
+
+    :type image: PNMImage
+    :rtype: bytes
+    """
+    stream = StringStream()
+    if not image.write(stream, "render" + RENDER_FILE_EXTENSION):
+        raise ValueError("Failed to encode the render as PNG")
+    return stream.get_data()
+
+
+def decode_png(data):
+    """Decodes a PNG image.
+
+    :type data: bytes
+    :rtype: PNMImage
+    """
+    image = PNMImage()
+    if not image.read(StringStream(data), "render" + RENDER_FILE_EXTENSION):
+        raise ValueError("Failed to decode a cached render")
+    return image
+
+
+class RenderCache:
+    """A least recently used cache of PNG renders on disk, with a limit on the disk space they may use."""
+
+    def __init__(self, directory, max_size):
+        """Initializes the RenderCache, picking up the renders already in its directory.
+
+        :param directory: The directory renders are stored in.
+        :type directory: str
+        :param max_size: The number of bytes the cached renders may use.
+        :type max_size: int
+        """
+        self._directory = directory
+        self._max_size = max(0, max_size)
+        self._renders = OrderedDict()  # sizes of the cached renders in bytes, keyed by render key
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._sync()
+        self._evict()
+
+    def _get_path(self, key):
+        """Returns the path a render is stored at."""
+        return os.path.join(self._directory, key + RENDER_FILE_EXTENSION)
+
+    def _sync(self):
+        """Brings the index up to date with the renders in the directory, which other processes sharing it may have
+        added to or deleted from. Renders new to the index are ordered by modification time, after the ones it already
+        has; files are touched whenever they're read, so this is the order they were last used in.
+        """
+        try:
+            names = os.listdir(self._directory)
+        except OSError:
+            names = []
+        keys = {name[:-len(RENDER_FILE_EXTENSION)] for name in names if name.endswith(RENDER_FILE_EXTENSION)}
+        for key in [key for key in self._renders if key not in keys]:
+            self._forget(key)
+        entries = []
+        for key in keys:
+            if key in self._renders:
+                continue
+            try:
+                stat = os.stat(self._get_path(key))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, key, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._renders[key] = size
+            self._size += size
+
+    def get(self, key):
+        """Returns a cached render, marking it as the most recently used. Renders stored by other processes sharing
+        the directory are found as well.
+
+        :param key: The key the render was stored under, from get_render_key().
+        :type key: str
+        :return: The render's PNG data, or None if it isn't cached.
+        :rtype: bytes
+        """
+        path = self._get_path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            # never stored, or deleted from under us by another process sharing the directory
+            if key in self._renders:
+                self._forget(key)
+            self._misses += 1
+            count("render_cache.misses")
+            return None
+        self._hits += 1
+        count("render_cache.hits")
+        if key in self._renders:
+            self._renders.move_to_end(key)
+        else:
+            self._renders[key] = len(data)
+            self._size += len(data)
+        return data
+
+    def put(self, key, data):
+        """Caches a render as the most recently used, deleting the least recently used renders if the cache goes over
+        its size limit. Failing to write the render is not fatal; it will simply be rendered again next time.
+
+        The directory is re-read first, so renders stored by other processes count towards the limit too. This only
+        happens after something has been rendered, which takes far longer.
+
+        :param key: The key to store the render under, from get_render_key().
+        :type key: str
+        :param data: The render's PNG data.
+        :type data: bytes
+        """
+        if len(data) > self._max_size:
+            return
+        path = self._get_path(key)
+        temp_path = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            return
+        self._sync()
+        if key in self._renders:
+            self._forget(key)
+        self._renders[key] = len(data)
+        self._size += len(data)
+        self._evict()
+
+    def __contains__(self, key):
+        return key in self._renders or os.path.isfile(self._get_path(key))
+
+    def _forget(self, key):
+        """Removes a render from the index, leaving its file alone."""
+        self._size -= self._renders.pop(key)
+
+    def _remove(self, key):
+        """Removes a render from the cache and deletes its file."""
+        self._forget(key)
+        try:
+            os.remove(self._get_path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Deletes the least recently used renders until the cache fits its size limit."""
+        while self._renders and self._size > self._max_size:
+            self._remove(next(iter(self._renders)))
+
+    def set_max_size(self, max_size):
+        """Sets the number of bytes the cached renders may use, deleting renders if necessary.
+
+        :param max_size: The size limit in bytes.
+        :type max_size: int
+        """
+        self._max_size = max(0, max_size)
+        self._sync()
+        self._evict()
+
+    def get_max_size(self):
+        """Returns the number of bytes the cached renders may use.
+
+        :rtype: int
+        """
+        return self._max_size
+
+    def get_size(self):
+        """Returns the number of bytes the cached renders use.
+
+        :rtype: int
+        """
+        return self._size
+
+    def get_num_renders(self):
+        """Returns the number of cached renders.
+
+        :rtype: int
+        """
+        return len(self._renders)
+
+    def get_hit_rate(self):
+        """Returns the fraction of lookups that found their render in the cache.
+
+        :rtype: float
+        """
+        lookups = self._hits + self._misses
+        return self._hits / lookups if lookups else 0.0
+
+    def get_stats(self):
+        """Returns the cache's hit/miss counters, the number of renders it holds and their size.
+
+        :rtype: dict
+        """
+        return {"hits": self._hits,
+                "misses": self._misses,
+                "renders": len(self._renders),
+                "size": self._size,
+                "max_size": self._max_size}
+
+    def clear(self):
+        """Deletes every cached render, including those stored by other processes sharing the directory."""
+        self._sync()
+        while self._renders:
+            self._remove(next(iter(self._renders)))
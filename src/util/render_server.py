@@ -0,0 +1,205 @@
+"""A long-lived server that renders actors on request, so other tools don't have to launch VisorView per image.
+
+The server keeps the phase files mounted and recently rendered actors pooled in a ScriptSession, and accepts render
+jobs over a TCP socket on localhost (or a Unix socket). Every request is one line of JSON:
+    {"id": 1, "set": "sellbots", "actor": "Cold Caller", "animation": "neutral", "frame": 12,
+     "camera": {"pos": [0, -20, 4], "hpr": [0, 0, 0], "fov": 40}, "width": 512, "height": 512}
+Only "set" and "actor" are required; see get_job_commands() for the rest. Each request is answered by a line of JSON
+with "status" ("ok" or "error"), the request's "id" and the "size" of the PNG that follows it in bytes (0 on error,
+with the reason under "error"). A connection may send any number of requests without waiting for the answers, which
+come back in the same order. {"metrics": true} is answered with the server's metrics instead of a render.
+
+Jobs from every connection wait in one bounded queue and are rendered one at a time on the main thread, which Panda3D
+requires. When the queue is full, the server stops reading from connections until it has room again, which slows
+clients down rather than letting work pile up. If the session has a render cache, jobs that have been rendered before
+are answered from it without rendering.
+"""
+import json
+import asyncio
+from collections import deque
+from timeit import default_timer
+from src.util.profiler import timer
+
+LATENCY_SAMPLES = 1000  # the most recent jobs the latency metrics are computed from
+REQUEST_LINE_LIMIT = 1024 * 1024
+DEFAULT_CAMERA_FOV = 40
+
+
+def get_job_commands(job):
+    """Returns the ScriptSession commands that render a job. Every setting the job leaves out is reset to its default,
+    so nothing carries over from the previous job.
+
+    :param job: A render request. "set" and "actor" name the actor; "skelecog", "head", "body" and "shadow" are
+        booleans; "head_rotation" is in degrees; "animation" is posed on "frame" (default 0) of "part" (default every
+        part with the animation); "camera" holds any of "pos", "hpr" and "fov"; "width" and "height" default to the
+        window's size; "background" is an (r, g, b, a) list.
+    :type job: dict
+    :rtype: list[dict]
+    """
+    if "set" not in job or "actor" not in job:
+        raise ValueError("A render job needs a 'set' and an 'actor'")
+    commands = [{"command": "set_skelecog", "is_skelecog": bool(job.get("skelecog", False))},
+                {"command": "select_actor", "set_name": job["set"], "actor": job["actor"]},
+                {"command": "set_head_visibility", "is_head": bool(job.get("head", True))},
+                {"command": "set_body_visibility", "is_body": bool(job.get("body", True))},
+                {"command": "set_shadow_visibility", "is_shadow": bool(job.get("shadow", True))},
+                {"command": "set_head_rotation", "h": job.get("head_rotation", 0)}]
+    if job.get("animation") is not None:
+        commands.append({"command": "pose", "animation": job["animation"], "frame": job.get("frame", 0),
+                         "part": job.get("part")})
+    camera = job.get("camera") or {}
+    commands += [{"command": "reset_camera"},
+                 {"command": "set_camera", "pos": camera.get("pos"), "hpr": camera.get("hpr"),
+                  "fov": camera.get("fov", DEFAULT_CAMERA_FOV)},
+                 {"command": "set_background", "color": job.get("background", (0, 0, 0, 0))},
+                 {"command": "capture_png", "width": job.get("width"), "height": job.get("height")}]
+    return commands
+
+
+class RenderServer:
+    """Accepts render jobs over a socket and renders them through a ScriptSession, one at a time."""
+
+    def __init__(self, session, max_queue_size=16):
+        """Initializes the RenderServer. Nothing is served until serve() is called.
+
+        :param session: The session to render with.
+        :type session: ScriptSession
+        :param max_queue_size: The number of jobs that may wait to be rendered before the server stops reading new
+            ones.
+        :type max_queue_size: int
+        """
+        self._session = session
+        self._max_queue_size = max_queue_size
+        self._queue = None  # created in serve(), as it belongs to the event loop
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._render_times = deque(maxlen=LATENCY_SAMPLES)
+        self._max_queue_depth = 0
+        self._completed_count = 0
+        self._failed_count = 0
+        self._connection_count = 0
+
+    async def serve(self, host="127.0.0.1", port=0, unix_path=None, ready_callback=None):
+        """Serves until cancelled.
+
+        :param host: The address to listen on. Ignored if unix_path is given.
+        :type host: str
+        :param port: The port to listen on; 0 picks a free port. Ignored if unix_path is given.
+        :type port: int
+        :param unix_path: The path of a Unix socket to listen on instead of a TCP port.
+        :type unix_path: str
+        :param ready_callback: Called with the server's address (a (host, port) tuple, or the Unix socket's path) once
+            it is listening.
+        """
+        self._queue = asyncio.Queue(self._max_queue_size)
+        if unix_path is not None:
+            server = await asyncio.start_unix_server(self._handle_connection, unix_path, limit=REQUEST_LINE_LIMIT)
+        else:
+            server = await asyncio.start_server(self._handle_connection, host, port, limit=REQUEST_LINE_LIMIT)
+        renderer = asyncio.ensure_future(self._render_loop())
+        try:
+            async with server:
+                if ready_callback is not None:
+                    ready_callback(server.sockets[0].getsockname())
+                await server.serve_forever()
+        finally:
+            renderer.cancel()
+
+    async def _handle_connection(self, reader, writer):
+        """Reads jobs from a connection and queues them, while writing their results back in order."""
+        self._connection_count += 1
+        results = asyncio.Queue()  # futures of this connection's jobs, in the order they were received
+        responder = asyncio.ensure_future(self._write_results(results, writer))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                future = asyncio.get_running_loop().create_future()
+                await results.put(future)
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("A request must be a JSON object")
+                except ValueError as e:
+                    future.set_result(({"status": "error", "error": "Invalid request: {}".format(e)}, b""))
+                    continue
+                if request.get("metrics"):
+                    future.set_result(({"status": "ok", "id": request.get("id"), "metrics": self.get_metrics()},
+                                       b""))
+                    continue
+                # blocks while the queue is full, which stops this connection from being read
+                await self._queue.put((request, future, default_timer()))
+                self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            await results.put(None)
+            await responder
+            self._connection_count -= 1
+
+    async def _write_results(self, results, writer):
+        """Writes the results of a connection's jobs as they complete, in the order the jobs were received."""
+        try:
+            while True:
+                future = await results.get()
+                if future is None:
+                    break
+                header, data = await future
+                header["size"] = len(data)
+                writer.write(json.dumps(header).encode() + b"\n" + data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _render_loop(self):
+        """Renders queued jobs one at a time."""
+        while True:
+            job, future, queued_time = await self._queue.get()
+            try:
+                start = default_timer()
+                with timer("RenderServer.render", {"actor": str(job.get("actor"))}):
+                    data = self._session.run(get_job_commands(job))[-1]
+                self._render_times.append(default_timer() - start)
+            except Exception as e:
+                self._failed_count += 1
+                result = {"status": "error", "id": job.get("id"), "error": str(e)}, b""
+            else:
+                self._completed_count += 1
+                latency = default_timer() - queued_time
+                self._latencies.append(latency)
+                result = {"status": "ok", "id": job.get("id"), "latency_ms": latency * 1000}, data
+            if not future.done():
+                future.set_result(result)
+            self._queue.task_done()
+            # let connections read and write between renders
+            await asyncio.sleep(0)
+
+    def get_queue_depth(self):
+        """Returns the number of jobs waiting to be rendered.
+
+        :rtype: int
+        """
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def get_metrics(self):
+        """Returns the server's queue depth, job counts, latencies and render cache counters. Latencies run from a job
+        being queued to its PNG being ready, and are computed from the most recent jobs.
+
+        :rtype: dict
+        """
+        metrics = {"queue_depth": self.get_queue_depth(),
+                   "max_queue_depth": self._max_queue_depth,
+                   "queue_size": self._max_queue_size,
+                   "connections": self._connection_count,
+                   "completed": self._completed_count,
+                   "failed": self._failed_count}
+        for name, times in (("latency", self._latencies), ("render", self._render_times)):
+            sorted_times = sorted(times)
+            for percentile in (50, 90, 99):
+                index = min(len(sorted_times) - 1, int(len(sorted_times) * percentile / 100))
+                metrics["{}_p{}_ms".format(name, percentile)] = sorted_times[index] * 1000 if sorted_times else None
+        render_cache = self._session.get_render_cache()
+        metrics["render_cache"] = render_cache.get_stats() if render_cache is not None else None
+        return metrics
@@ -0,0 +1,171 @@
+"""Screenshots that are encoded and written to disk on a background thread.
+
+Only the framebuffer readback happens on the main thread; the copied image is handed to a writer thread through a
+bounded queue, which does the PNG encoding and file writes. If the queue is full, capturing waits for the writer to
+catch up rather than dropping images.
+"""
+import os
+import atexit
+import queue
+import threading
+from panda3d.core import Filename, Texture, GraphicsOutput
+from direct.task import Task
+import src.globals.visorview_globals as visorview_globals
+from src.util.profiler import profile, timer
+
+BURST_TASK_NAME = "screenshot_burst_task"
+BURST_TASK_SORT = 51  # after igLoop (50), so each frame is copied once it has been rendered
+
+
+class ScreenshotWriter:
+    """Captures screenshots of a window and writes them to disk on a background thread. Also supports capturing a
+    burst of consecutive frames while the scene keeps animating.
+    """
+
+    def __init__(self, window=None, max_queue_size=visorview_globals.SCREENSHOT_QUEUE_SIZE):
+        """Initializes the ScreenshotWriter and starts its writer thread.
+
+        :param window: The window or buffer to capture. If None, base.win is used.
+        :type window: GraphicsOutput
+        :param max_queue_size: The number of captured images that may wait to be written at once.
+        :type max_queue_size: int
+        """
+        self._window = window if window is not None else base.win
+        self._queue = queue.Queue(max_queue_size)
+        self._burst_texture = None
+        self._burst_frames = 0
+        self._burst_paths = []
+        self._burst_callback = None
+        self._written_count = 0
+        self._failed_count = 0
+
+        self._thread = threading.Thread(target=self._write_loop, name="screenshot_writer", daemon=True)
+        self._thread.start()
+        # don't lose queued screenshots when the program exits
+        atexit.register(self.flush)
+
+    @profile()
+    def capture(self, path):
+        """Copies the most recently rendered frame into memory and queues it to be written to path.
+
+        :param path: The path to write the image to. The format is chosen by the extension.
+        :type path: str
+        """
+        self.submit(self._window.get_screenshot(), path)
+
+    def submit(self, image, path):
+        """Queues an image to be written. Blocks if the queue is full.
+
+        :param image: A texture holding the image in RAM, or a PNMImage.
+        :type image: Texture | PNMImage
+        :param path: The path to write the image to.
+        :type path: str
+        """
+        self._queue.put((image, path))
+
+    def start_burst(self, paths, callback=None):
+        """Captures consecutive rendered frames, one for each path given, without interrupting the main loop. Each
+        frame is copied to RAM as part of rendering it, then queued like any other screenshot.
+
+        :param paths: The paths to write each frame to, in order.
+        :type paths: list[str]
+        :param callback: Called with no arguments once the last frame has been captured.
+        :type callback: function
+        :return: False if a burst is already in progress.
+        :rtype: bool
+        """
+        if self.is_burst_active() or not paths:
+            return False
+        self._burst_texture = Texture("screenshot_burst")
+        self._window.add_render_texture(self._burst_texture, GraphicsOutput.RTM_copy_ram)
+        self._burst_paths = list(paths)
+        self._burst_frames = 0
+        self._burst_callback = callback
+        taskMgr.add(self._burst_task, BURST_TASK_NAME, sort=BURST_TASK_SORT)
+        return True
+
+    def is_burst_active(self):
+        """Returns whether a burst is currently being captured.
+
+        :rtype: bool
+        """
+        return self._burst_texture is not None
+
+    def _burst_task(self, task):
+        """Task that queues a copy of each newly rendered frame until the burst is complete."""
+        if not self._burst_texture.has_ram_image():
+            # nothing has been rendered into the texture yet
+            return Task.cont
+        # each render allocates a new RAM image, so the copy won't be overwritten by the next frame
+        self.submit(self._burst_texture.make_copy(), self._burst_paths[self._burst_frames])
+        self._burst_frames += 1
+        if self._burst_frames < len(self._burst_paths):
+            return Task.cont
+
+        self._remove_burst_texture()
+        self._burst_paths = []
+        if self._burst_callback is not None:
+            callback = self._burst_callback
+            self._burst_callback = None
+            callback()
+        return Task.done
+
+    def _remove_burst_texture(self):
+        """Stops copying frames into the burst texture. GraphicsOutput can only clear all of its render textures, so
+        any others are added back afterwards.
+        """
+        others = []
+        for i in range(self._window.count_textures()):
+            texture = self._window.get_texture(i)
+            if texture != self._burst_texture:
+                others.append((texture, self._window.get_rtm_mode(i)))
+        self._window.clear_render_textures()
+        for texture, mode in others:
+            self._window.add_render_texture(texture, mode)
+        self._burst_texture = None
+
+    def _write_loop(self):
+        """Writer thread: encodes and writes queued images, one at a time."""
+        while True:
+            image, path = self._queue.get()
+            try:
+                directory = os.path.dirname(path)
+                if directory and not os.path.exists(directory):
+                    os.makedirs(directory, exist_ok=True)
+                with timer("write_screenshot"):
+                    is_written = image.write(Filename.from_os_specific(path))
+                if is_written:
+                    self._written_count += 1
+                else:
+                    self._failed_count += 1
+                    print("Failed to write screenshot '{}'".format(path))
+            except Exception as e:
+                self._failed_count += 1
+                print("Failed to write screenshot '{}': {!r}".format(path, e))
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Blocks until every queued image has been written."""
+        self._queue.join()
+
+    def get_pending_count(self):
+        """Returns the number of images waiting to be written.
+
+        :rtype: int
+        """
+        return self._queue.qsize()
+
+    def get_written_count(self):
+        """Returns the number of images written so far.
+
+        :rtype: int
+        """
+        return self._written_count
+
+    def get_failed_count(self):
+        """Returns the number of images that could not be written.
+
+        :rtype: int
+        """
+        return self._failed_count
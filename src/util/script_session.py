@@ -0,0 +1,343 @@
+"""Programmatic control of VisorView, for pipelines and other tools that would otherwise have to fake keystrokes.
+
+A ScriptSession wraps an ActorManager and a camera and exposes what the viewer's key bindings do as methods: picking an
+actor, toggling skelecogs and visibility, animating or posing, moving the camera and capturing. Changing the scene
+never renders a frame; a frame is only rendered when an image is captured, so any number of changes followed by a
+capture costs a single render rather than a frame per change. With a RenderCache, capturing a posed actor that has
+been captured before with the same camera and size doesn't render at all; the image is read back from the cache.
+
+run() executes a list of commands, each a dict naming a method and its arguments, i.e.
+    [{"command": "select_actor", "set_name": "sellbots", "actor": "Cold Caller"},
+     {"command": "pose", "animation": "neutral", "frame": 12},
+     {"command": "capture", "path": "cold-caller.png"}]
+which is how run_script.py drives a session from a JSON file.
+
+Requires mounted phase files and a running ShowBase with a window or offscreen buffer (base.win); see
+start_headless_session() to set both up without a window.
+"""
+import os
+from panda3d.core import NodePath, PNMImage, VBase4, loadPrcFileData
+import src.globals.visorview_globals as visorview_globals
+from src.actors.actor_manager import ActorManager
+from src.globals.actor_globals import ACTORS
+from src.util.screenshot_writer import ScreenshotWriter
+from src.util.high_resolution_capture import HighResolutionCapture
+from src.util.render_cache import get_render_cache, get_render_key, refresh_mount_signature, encode_png, decode_png
+
+DEFAULT_SIZE = (800, 600)
+CAPTURE_CLEAR_COLOR = (0, 0, 0, 0)
+# the methods run() may call
+COMMANDS = ("select_actor", "set_skelecog", "set_head_visibility", "set_body_visibility", "set_shadow_visibility",
+            "set_head_rotation", "set_animation_smoothing", "animate", "pose", "set_camera", "reset_camera",
+            "set_background", "capture", "capture_png")
+
+
+def start_headless_session(install_dir, size=DEFAULT_SIZE):
+    """Mounts the phase files and starts a ShowBase that renders offscreen with the software renderer, then returns a
+    session for it. VisorConfig.prc should already be loaded.
+
+    :param install_dir: The Toontown Rewritten install directory.
+    :type install_dir: Filename
+    :param size: The width and height of the offscreen buffer, which is the size of regular captures.
+    :type size: tuple
+    :rtype: ScriptSession
+    """
+    from src.util.phase_files import mount_phase_files
+    from direct.showbase.ShowBase import ShowBase
+
+    loadPrcFileData("", visorview_globals.HEADLESS_PRC_DATA)
+    loadPrcFileData("", "win-size {} {}".format(*size))
+    is_success, _, _ = mount_phase_files(install_dir)
+    if not is_success:
+        raise OSError("Failed to mount the phase files in '{}'.".format(install_dir.to_os_specific()))
+    refresh_mount_signature()
+    ShowBase()
+    return ScriptSession(get_render_cache())
+
+
+class ScriptSession:
+    """Drives an ActorManager and the camera through method calls or lists of commands."""
+
+    def __init__(self, render_cache=None):
+        """Initializes the ScriptSession, its ActorManager and the camera.
+
+        :param render_cache: The cache captures are looked up in and stored to. If None, every capture is rendered.
+        :type render_cache: RenderCache
+        """
+        self.actor = ActorManager()
+        self.actor.reparent_to(render)
+        self._set_name = None
+        self._actor_index = None
+
+        # frame actors the same way the viewer's default camera does
+        self._camera_node = NodePath("script_camera_node")
+        self._camera_node.reparent_to(render)
+        self.reset_camera()
+        base.win.set_clear_color(CAPTURE_CLEAR_COLOR)
+
+        self._screenshot_writer = None  # created by the first capture written to a file
+        self._high_resolution_capture = None  # created by the first capture at a size other than the window's
+        self._render_cache = render_cache
+
+    def select_actor(self, set_name, actor):
+        """Builds an actor, keeping the current skelecog and visibility settings.
+
+        :param set_name: The name of the actor set in ACTORS, i.e. "sellbots".
+        :type set_name: str
+        :param actor: The actor's name, i.e. "Cold Caller", or its index within the set.
+        :type actor: str | int
+        """
+        if set_name not in ACTORS:
+            raise ValueError("Unknown actor set '{}'; expected one of: {}".format(set_name, ", ".join(ACTORS)))
+        actor_set = ACTORS[set_name]
+        if isinstance(actor, str):
+            names = actor_set.get_names()
+            if actor not in names:
+                raise ValueError("No actor named '{}' in '{}'".format(actor, set_name))
+            index = names.index(actor)
+        elif 0 <= actor < len(actor_set):
+            index = actor
+        else:
+            raise ValueError("No actor {} in '{}', which has {} actors".format(actor, set_name, len(actor_set)))
+        self._set_name = set_name
+        self._actor_index = index
+        self.actor.set_actor_data(actor_set[index])
+
+    def get_selected_actor(self):
+        """Returns the set name and index of the selected actor, or None if no actor has been selected.
+
+        :rtype: tuple
+        """
+        return (self._set_name, self._actor_index) if self._set_name is not None else None
+
+    def _require_actor(self):
+        """Raises an error if no actor has been selected yet."""
+        if self._set_name is None:
+            raise RuntimeError("No actor has been selected; call select_actor() first.")
+
+    def set_skelecog(self, is_skelecog):
+        """Shows cogs as skelecogs or not. Other actors are unaffected. Carries over to actors selected later.
+
+        :type is_skelecog: bool
+        """
+        self.actor.set_is_skelecog(is_skelecog)
+
+    def set_head_visibility(self, is_head):
+        """Shows or hides the actor's head.
+
+        :type is_head: bool
+        """
+        self.actor.set_head_visibility(is_head)
+
+    def set_body_visibility(self, is_body):
+        """Shows or hides the actor's body.
+
+        :type is_body: bool
+        """
+        self.actor.set_body_visibility(is_body)
+
+    def set_shadow_visibility(self, is_shadow):
+        """Shows or hides the actor's drop shadow.
+
+        :type is_shadow: bool
+        """
+        self.actor.set_shadow_visibility(is_shadow)
+
+    def set_head_rotation(self, h):
+        """Turns the actor's head, i.e. 180 to face backwards.
+
+        :param h: The rotation of the head in degrees.
+        :type h: float
+        """
+        self._require_actor()
+        self.actor.set_head_rotation(h)
+
+    def set_animation_smoothing(self, is_smooth):
+        """Sets whether animations blend between frames.
+
+        :type is_smooth: bool
+        """
+        self.actor.set_animation_smoothing(is_smooth)
+
+    def _get_animation_parts(self, animation, part):
+        """Returns the parts to play an animation on: the given part, or every part that has the animation."""
+        self._require_actor()
+        parts = [part] if part is not None else self.actor.get_actor_parts()
+        parts = [part for part in parts if animation in (self.actor.get_actor_animations(part) or [])]
+        if not parts:
+            raise ValueError("The selected actor has no animation '{}'".format(animation))
+        return parts
+
+    def pose(self, animation, frame=0, part=None):
+        """Poses the actor on a frame of an animation. Unlike in the viewer, the animation is loaded right away.
+
+        :param animation: The animation to pose.
+        :type animation: str
+        :param frame: The frame to pose on. Fractional frames blend between the two frames around them.
+        :type frame: float
+        :param part: The part to pose. If None, every part that has the animation is posed.
+        :type part: str
+        :return: The parts that were posed.
+        :rtype: list[str]
+        """
+        parts = self._get_animation_parts(animation, part)
+        posed_parts = self.actor.pose_animations({part: animation for part in parts})
+        for part in posed_parts:
+            self.actor.set_pose_frame(frame, part)
+        return posed_parts
+
+    def animate(self, animation, part=None):
+        """Loops an animation from its first frame. Unlike in the viewer, the animation is loaded right away.
+
+        :param animation: The animation to loop.
+        :type animation: str
+        :param part: The part to animate. If None, every part that has the animation is animated.
+        :type part: str
+        :return: The parts that were animated.
+        :rtype: list[str]
+        """
+        posed_parts = self.pose(animation, 0, part)
+        for part in posed_parts:
+            # the animation is bound by now, so this loops it right away; leaving pose mode would hang on the frame
+            self.actor.animate(animation, part)
+        return posed_parts
+
+    def set_camera(self, pos=None, hpr=None, fov=None):
+        """Moves the camera. Anything not given is left as it is.
+
+        :param pos: The camera's position, relative to the scene.
+        :type pos: tuple
+        :param hpr: The camera's rotation, relative to the scene.
+        :type hpr: tuple
+        :param fov: The camera's horizontal field of view in degrees.
+        :type fov: float
+        """
+        if pos is not None:
+            camera.set_pos(render, *pos)
+        if hpr is not None:
+            camera.set_hpr(render, *hpr)
+        if fov is not None:
+            base.camLens.set_fov(fov)
+
+    def reset_camera(self):
+        """Moves the camera back to where the viewer starts it."""
+        self._camera_node.set_pos_hpr(*visorview_globals.DEFAULT_CAMERA_NODE_POS, 0, 0, 0)
+        camera.reparent_to(self._camera_node)
+        camera.set_pos_hpr(*visorview_globals.DEFAULT_CAMERA_POS, 0, 0, 0)
+
+    def set_background(self, color):
+        """Sets the color behind the actor in captures. Captures have a transparent background by default.
+
+        :param color: An (r, g, b, a) tuple.
+        :type color: tuple
+        """
+        color = VBase4(*color)
+        if color == base.win.get_clear_color():
+            # keep the offscreen buffer, as a render server sets the background on every job
+            return
+        base.win.set_clear_color(color)
+        if self._high_resolution_capture is not None:
+            self._high_resolution_capture.release()
+            self._high_resolution_capture = None
+
+    def _render(self, width, height):
+        """Renders a frame at the given size and returns it."""
+        if (width, height) == (base.win.get_x_size(), base.win.get_y_size()):
+            base.graphics_engine.render_frame()
+            image = PNMImage()
+            base.win.get_screenshot().store(image)
+            return image
+        if self._high_resolution_capture is None:
+            self._high_resolution_capture = HighResolutionCapture()
+        return self._high_resolution_capture.capture(width, height)
+
+    def capture(self, path=None, width=None, height=None):
+        """Renders a frame and captures it. Captures at the size of the window only render once; other sizes are
+        rendered offscreen, in tiles if they are very large. Cached captures are not rendered.
+
+        :param path: The path to write the image to, in the background. The format is chosen by the extension. If
+            None, the image is returned instead.
+        :type path: str
+        :param width: The width of the image. Defaults to the window's width.
+        :type width: int
+        :param height: The height of the image. Defaults to the window's height.
+        :type height: int
+        :return: The path the image is written to, or the image if no path was given.
+        :rtype: str | PNMImage
+        """
+        width = base.win.get_x_size() if width is None else width
+        height = base.win.get_y_size() if height is None else height
+        key = get_render_key(self.actor, width, height) if self._render_cache is not None else None
+        data = self._render_cache.get(key) if key is not None else None
+        if data is not None:
+            image = decode_png(data) if path is None or not path.lower().endswith(".png") else None
+        else:
+            image = self._render(width, height)
+            if key is not None:
+                data = encode_png(image)
+                self._render_cache.put(key, data)
+        if path is None:
+            return image
+        if data is not None and path.lower().endswith(".png"):
+            # already encoded, so there's nothing left for the writer thread to do
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+            return path
+        if self._screenshot_writer is None:
+            self._screenshot_writer = ScreenshotWriter()
+        self._screenshot_writer.submit(image, path)
+        return path
+
+    def capture_png(self, width=None, height=None):
+        """Renders a frame and returns it encoded as PNG, or returns the cached PNG without rendering.
+
+        :param width: The width of the image. Defaults to the window's width.
+        :type width: int
+        :param height: The height of the image. Defaults to the window's height.
+        :type height: int
+        :rtype: bytes
+        """
+        width = base.win.get_x_size() if width is None else width
+        height = base.win.get_y_size() if height is None else height
+        key = get_render_key(self.actor, width, height) if self._render_cache is not None else None
+        data = self._render_cache.get(key) if key is not None else None
+        if data is None:
+            data = encode_png(self._render(width, height))
+            if key is not None:
+                self._render_cache.put(key, data)
+        return data
+
+    def get_render_cache(self):
+        """Returns the cache captures are looked up in, if any.
+
+        :rtype: RenderCache
+        """
+        return self._render_cache
+
+    def flush(self):
+        """Blocks until every captured image has been written."""
+        if self._screenshot_writer is not None:
+            self._screenshot_writer.flush()
+
+    def run(self, commands):
+        """Runs a list of commands in order, then waits for every captured image to be written.
+
+        :param commands: Dicts with the name of a method in COMMANDS under "command" and its arguments under the
+            names of its parameters.
+        :type commands: list[dict]
+        :return: The result of every command, in order.
+        :rtype: list
+        """
+        results = []
+        for i, command in enumerate(commands):
+            arguments = dict(command)
+            name = arguments.pop("command", None)
+            if name not in COMMANDS:
+                raise ValueError("Command {} has an unknown command name '{}'; expected one of: {}".format(
+                    i, name, ", ".join(COMMANDS)))
+            results.append(getattr(self, name)(**arguments))
+        self.flush()
+        return results
@@ -0,0 +1,193 @@
+"""Batch rendering sharded across a pool of worker processes.
+
+Software rendering is CPU-bound and a single Panda3D process only uses one core, so the (actor, animation) jobs of an
+export are split into shards and handed to worker processes. Each worker mounts the phase files and opens its own
+offscreen buffer once, then renders whichever shards it is given. The coordinator merges the manifests of every shard
+and retries shards whose worker failed or crashed.
+
+Workers are started with the 'spawn' method, so they never inherit a half-initialized Panda3D from the coordinator.
+Panda3D (beyond panda3d.core) and the rest of VisorView are only imported inside the worker initializer, after the
+config has been loaded, as main.py does.
+"""
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from timeit import default_timer
+from panda3d.core import loadPrcFile, loadPrcFileData, Filename
+import src.globals.visorview_globals as visorview_globals
+
+SHARDS_PER_WORKER = 4  # more, smaller shards balance better when some actors have far more frames than others
+MAX_SHARD_ATTEMPTS = 3
+
+_renderer = None  # each worker's BatchRenderer
+
+
+def _init_worker(install_dir, output_dir, size, image_format):
+    """Initializer for worker processes: loads the config, mounts the phase files, opens an offscreen buffer and
+    creates the worker's BatchRenderer.
+
+    :param install_dir: The Toontown Rewritten install directory.
+    :type install_dir: str
+    :param output_dir: The directory renders are written to.
+    :type output_dir: str
+    :param size: The width and height of the rendered images.
+    :type size: tuple[int]
+    :param image_format: The file extension of the written images.
+    :type image_format: str
+    """
+    global _renderer
+    loadPrcFile("VisorConfig.prc")
+    loadPrcFileData("", visorview_globals.HEADLESS_PRC_DATA)
+    loadPrcFileData("", "win-size {} {}".format(*size))
+
+    from src.util.phase_files import mount_phase_files
+    is_success, _, _ = mount_phase_files(Filename.from_os_specific(install_dir))
+    if not is_success:
+        raise RuntimeError("Failed to mount the phase files in '{}'.".format(install_dir))
+
+    from direct.showbase.ShowBase import ShowBase
+    from src.util.batch_renderer import BatchRenderer
+    from src.util.render_cache import get_render_cache
+    ShowBase()
+    _renderer = BatchRenderer(output_dir, image_format, get_render_cache())
+
+
+def _render_shard(jobs):
+    """Renders a shard of jobs in a worker process.
+
+    :param jobs: The jobs to render.
+    :type jobs: list[RenderJob]
+    :return: A tuple S where S[0] is the shard's manifest entries and S[1] is the number of frames rendered.
+    :rtype: tuple
+    """
+    manifest_start = len(_renderer.get_manifest())
+    frame_count = sum(_renderer.render_job(job) for job in jobs)
+    return _renderer.get_manifest()[manifest_start:], frame_count
+
+
+def make_shards(jobs, shard_count):
+    """Splits a list of jobs into contiguous shards of roughly equal length. Jobs are kept in order, so the animations
+    of one actor mostly land in the same shard and the actor is only built once.
+
+    :param jobs: The jobs to split.
+    :type jobs: list
+    :param shard_count: The number of shards to split the jobs into, at most.
+    :type shard_count: int
+    :rtype: list[list]
+    """
+    shard_count = max(1, min(shard_count, len(jobs)))
+    shards = []
+    for i in range(shard_count):
+        shard = jobs[len(jobs) * i // shard_count:len(jobs) * (i + 1) // shard_count]
+        if shard:
+            shards.append(shard)
+    return shards
+
+
+class ShardedRenderer:
+    """Coordinates rendering a list of jobs across a pool of worker processes."""
+
+    def __init__(self, install_dir, output_dir=visorview_globals.BATCH_RENDER_DIR, size=(800, 600),
+                 image_format="png", workers=None):
+        """Initializes the ShardedRenderer.
+
+        :param install_dir: The Toontown Rewritten install directory.
+        :type install_dir: Filename
+        :param output_dir: The directory renders are written to.
+        :type output_dir: str
+        :param size: The width and height of the rendered images.
+        :type size: tuple[int]
+        :param image_format: The file extension of the written images, i.e. "png" or "jpg".
+        :type image_format: str
+        :param workers: The number of worker processes. If None, one per CPU core is used.
+        :type workers: int
+        """
+        self.install_dir = install_dir
+        self.output_dir = output_dir
+        self.size = tuple(size)
+        self.image_format = image_format
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self._manifest = []
+        self._frame_count = 0
+        self._render_time = 0.0
+        self._failed_shards = []
+
+    def run(self, jobs, verbose=True):
+        """Renders every job, retrying failed shards up to MAX_SHARD_ATTEMPTS times each. Shards that fail on every
+        attempt are skipped; see get_failed_shards().
+
+        :param jobs: The jobs to render.
+        :type jobs: list[RenderJob]
+        :param verbose: If True, progress is printed after each shard.
+        :type verbose: bool
+        :return: The number of frames rendered.
+        :rtype: int
+        """
+        start = default_timer()
+        shards = make_shards(jobs, self.workers * SHARDS_PER_WORKER)
+        pending = [(shard, 1) for shard in shards]
+        finished = 0
+        while pending:
+            # a crashed worker breaks the whole pool, so each round of retries gets a fresh one
+            failed = []
+            context = multiprocessing.get_context("spawn")
+            init_args = (self.install_dir.to_os_specific(), self.output_dir, self.size, self.image_format)
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(pending)), mp_context=context,
+                                     initializer=_init_worker, initargs=init_args) as executor:
+                futures = [(executor.submit(_render_shard, shard), shard, attempt) for shard, attempt in pending]
+                for future, shard, attempt in futures:
+                    # a worker crashing outright surfaces here as BrokenProcessPool
+                    try:
+                        entries, frame_count = future.result()
+                    except Exception as e:
+                        if verbose:
+                            print("Shard of {} jobs failed on attempt {}: {!r}".format(len(shard), attempt, e))
+                        if attempt < MAX_SHARD_ATTEMPTS:
+                            failed.append((shard, attempt + 1))
+                        else:
+                            self._failed_shards.append(shard)
+                        continue
+                    self._manifest.extend(entries)
+                    self._frame_count += frame_count
+                    finished += 1
+                    if verbose:
+                        print("[{}/{}] shard of {} jobs: {} frames".format(finished, len(shards), len(shard),
+                                                                         frame_count))
+            pending = failed
+        self._render_time += default_timer() - start
+        return self._frame_count
+
+    def get_manifest(self):
+        """Returns the merged manifest entries of every finished shard.
+
+        :rtype: list[dict]
+        """
+        return list(self._manifest)
+
+    def get_failed_shards(self):
+        """Returns the shards that failed on every attempt.
+
+        :rtype: list[list[RenderJob]]
+        """
+        return list(self._failed_shards)
+
+    def get_frame_count(self):
+        """Returns the total number of frames rendered.
+
+        :rtype: int
+        """
+        return self._frame_count
+
+    def get_render_time(self):
+        """Returns the wall-clock time spent rendering, in seconds, including starting the workers.
+
+        :rtype: float
+        """
+        return self._render_time
+
+    def get_frames_per_second(self):
+        """Returns the overall throughput, in frames written per second.
+
+        :rtype: float
+        """
+        return self._frame_count / self._render_time if self._render_time > 0 else 0.0
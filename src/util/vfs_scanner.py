@@ -0,0 +1,74 @@
+"""Single-pass scanner for directories in the VFS. Rather than walking the phase files once per glob pattern, every
+matching directory is listed once and kept as a sorted list of names, which prefix queries are answered from with a
+binary search.
+"""
+import posixpath
+from bisect import bisect_left
+from panda3d.core import VirtualFileSystem, Filename
+import src.util.vfs_glob as glob
+
+CHARACTER_DIRECTORIES = posixpath.join("phase_*", "models", "char")
+
+
+class VfsScanner:
+    """Lists every VFS directory matching a glob pattern once and answers prefix queries from memory."""
+
+    def __init__(self, directory_pattern=CHARACTER_DIRECTORIES):
+        """Initializes the scanner. Nothing is listed until the first query.
+
+        :param directory_pattern: A glob pattern matching the directories to scan, i.e. "phase_*/models/char"
+        :type directory_pattern: str
+        """
+        self._directory_pattern = directory_pattern
+        self._listing = None  # list of (directory, sorted names) tuples, see scan()
+
+    def scan(self):
+        """Lists every directory matching the pattern, replacing anything scanned previously."""
+        vfs = VirtualFileSystem.get_global_ptr()
+        self._listing = []
+        for directory in glob.glob(self._directory_pattern):
+            files = vfs.scan_directory(Filename(directory))
+            if files is None:
+                continue
+            names = [file.get_filename().get_basename() for file in files]
+            names = [name for name in names if not name.startswith(".")]
+            names.sort()
+            self._listing.append((directory, names))
+
+    def find(self, prefix, extension=".bam"):
+        """Returns the paths of every file in the scanned directories that begins with prefix and ends with extension.
+
+        :param prefix: The start of the filename, i.e. "ttr_a_ene_cga_"
+        :type prefix: str
+        :param extension: The end of the filename.
+        :type extension: str
+        :return: A list of VFS paths, ordered by directory then name.
+        :rtype: list[str]
+        """
+        if self._listing is None:
+            self.scan()
+
+        paths = []
+        for directory, names in self._listing:
+            i = bisect_left(names, prefix)
+            while i < len(names) and names[i].startswith(prefix):
+                if names[i].endswith(extension):
+                    paths.append(posixpath.join(directory, names[i]))
+                i += 1
+        return paths
+
+
+_scanner = VfsScanner()
+
+
+def find(prefix, extension=".bam"):
+    """Queries the shared scanner for the phase files' character directories. See VfsScanner.find().
+
+    :param prefix: The start of the filename, i.e. "ttr_a_ene_cga_"
+    :type prefix: str
+    :param extension: The end of the filename.
+    :type extension: str
+    :return: A list of VFS paths, ordered by directory then name.
+    :rtype: list[str]
+    """
+    return _scanner.find(prefix, extension)
@@ -3,11 +3,20 @@ import src.globals.visorview_globals as visorview_globals
 import os
 from datetime import datetime
 from panda3d.core import AntialiasAttrib
-from panda3d.core import TextNode
 from direct.showbase.ShowBase import ShowBase
 from direct.gui.DirectGui import *
 from src.util.camera import Camera
 from src.actors.actor_manager import ActorManager
+from src.actors.actor_prefetcher import ActorPrefetcher
+from src.util.screenshot_writer import ScreenshotWriter
+from src.util.high_resolution_capture import HighResolutionCapture
+from src.util.animation_exporter import AnimationExporter
+from src.util.animation_name_index import AnimationNameIndex
+from src.gui.virtual_scroll_list import VirtualScrollList
+from src.gui.search_entry import SearchEntry
+from src.gui.timeline_bar import TimelineBar
+from src.gui.stats_overlay import StatsOverlay
+from src.util.profiler import get_profiler, profile
 from src.globals.actor_globals import ACTORS, COG_SET_NAMES
 
 
@@ -22,23 +31,36 @@ class VisorView(ShowBase):
         self.camera_controller = Camera()
 
         # initialize the gui
-        self.animation_scroll_list = DirectScrolledList(
+        self.animation_scroll_list = VirtualScrollList(
             incButton_pos=(-1, 0, -.1), incButton_text="DN", incButton_text_scale=0.1,
             incButton_borderWidth=(0.05, 0.05),
             decButton_pos=(-1, 0, .1), decButton_text="UP", decButton_text_scale=0.1,
             decButton_borderWidth=(0.05, 0.05),
             itemFrame_pos=(-.8, 0, 0.8), forceHeight=.11, numItemsVisible=15)
         self.animation_scroll_list.hide()
+        self.animation_search_entry = SearchEntry(
+            pos=(-.8, 0, .91), scale=0.07, width=12, numLines=1, initialText="",
+            changeCommand=self.filter_animation_list, command=self.animate_first_search_result)
+        self.animation_search_entry.hide()
+        self.animation_name_index = AnimationNameIndex()
         self.available_animations = []
+        self.animation_list_part = None  # the part the animation list targets, None when it's listing parts
+        self.animation_list_back_button = False
+        self.timeline_bar = TimelineBar(pos=(-.1, 0, -.9), command=self.scrub_pose)
+        self.timeline_bar.hide()
         self.is_animation_scroll = False
         self.is_pose_scroll = False
         self.is_scroll_visible = False
-
         # initialize our actor
         self.actors = ACTORS["supervisors"]
         self.cog_set_index = 0
         self.actor = ActorManager()
         self.actor.reparent_to(render)
+        # only available when profiling, which is what records the stats
+        self.stats_overlay = StatsOverlay(get_profiler(), self.actor) if get_profiler() is not None else None
+        self.prefetcher = ActorPrefetcher()
+        self.screenshot_writer = ScreenshotWriter()
+        self.high_resolution_capture = HighResolutionCapture()
         self.index = 0
         self.current_pose_part = None
         self.build_cog()
@@ -67,30 +89,90 @@ class VisorView(ShowBase):
         self.accept("b", self.actor.toggle_animation_smoothing)
         self.accept("h", self.actor.flip_head)
         self.accept("f9", self.take_screenshot)
+        self.accept("shift-f9", self.take_screenshot_burst)
+        self.accept("control-f9", self.take_high_resolution_screenshot)
+        self.accept("f10", self.export_current_animation)
         self.accept("control-z", self.reset_camera_pos)
         self.accept("wheel_up", self.scroll_up)
         self.accept("wheel_down", self.scroll_down)
-
-    def take_screenshot(self):
-        """Function that takes a screenshot of the ShowBase window and saves it to the screenshot directory as
-        defined in visorview_globals.py.
+        if self.stats_overlay is not None:
+            self.accept("f3", self.stats_overlay.toggle)
+        # the search entry renames events while it's being typed in, but scrolling should still work
+        self.accept(self.animation_search_entry["eventPrefix"] + "wheel_up", self.scroll_up)
+        self.accept(self.animation_search_entry["eventPrefix"] + "wheel_down", self.scroll_down)
+
+    def get_screenshot_name(self, suffix=""):
+        """Returns a path for a new screenshot of the current cog within the screenshot directory as defined in
+        visorview_globals.py.
+
+        :param suffix: Added to the end of the file name, before the extension.
+        :type suffix: str
+        :rtype: str
         """
-        path = visorview_globals.SCREENSHOT_DIR
-        if not os.path.exists(path):
-            os.makedirs(path)
-
         current_cog = self.actors[self.index].get_name()
 
         now = datetime.now()
         date_string = now.strftime("%d-%m-%Y-%H-%M-%S")
-        screenshot_name = os.path.join(path, "ss-{}-{}.png".format(current_cog, date_string))
+        return os.path.join(visorview_globals.SCREENSHOT_DIR, "ss-{}-{}{}.png".format(current_cog, date_string, suffix))
 
+    @profile()
+    def take_screenshot(self):
+        """Function that takes a screenshot of the ShowBase window and saves it to the screenshot directory as
+        defined in visorview_globals.py. The image is encoded and written in the background.
+        """
         # set the background to pure black for a frame and prevent any issues with blending in the screenshot
         base.win.set_clear_color((0, 0, 0, 0))
         base.graphics_engine.render_frame()
-        base.screenshot(screenshot_name, False)
+        self.screenshot_writer.capture(self.get_screenshot_name())
         base.win.set_clear_color((.412, .412, .412, 0))
 
+    def take_screenshot_burst(self):
+        """Function that captures a number of consecutive frames, as defined in VisorConfig.prc, while the actor keeps
+        animating. The frames are saved to the screenshot directory in the background.
+        """
+        frame_count = visorview_globals.SCREENSHOT_BURST_FRAMES.get_value()
+        paths = [self.get_screenshot_name("-{:03d}".format(i)) for i in range(frame_count)]
+        # the background stays pure black for the length of the burst
+        if self.screenshot_writer.start_burst(paths, lambda: base.win.set_clear_color((.412, .412, .412, 0))):
+            base.win.set_clear_color((0, 0, 0, 0))
+
+    @profile()
+    def take_high_resolution_screenshot(self, width=None, height=None):
+        """Function that renders the current view into an offscreen buffer at a given resolution, with a transparent
+        background, and saves it to the screenshot directory. The window itself is left untouched.
+
+        :param width: The width of the screenshot. Defaults to the size defined in VisorConfig.prc.
+        :type width: int
+        :param height: The height of the screenshot. Defaults to the size defined in VisorConfig.prc.
+        :type height: int
+        """
+        width = visorview_globals.HIGH_RESOLUTION_SCREENSHOT_SIZE[0] if width is None else width
+        height = visorview_globals.HIGH_RESOLUTION_SCREENSHOT_SIZE[1] if height is None else height
+        image = self.high_resolution_capture.capture(width, height)
+        self.screenshot_writer.submit(image, self.get_screenshot_name("-{}x{}".format(width, height)))
+
+    @profile()
+    def export_current_animation(self):
+        """Function that exports the actor's current animation(s), as an animated PNG and a sprite sheet, to the
+        export directory as defined in visorview_globals.py. Multi-part actors are exported with each part playing
+        its current animation.
+        """
+        part_animations = {}
+        for part in self.actor.get_actor_parts():
+            animation = self.actor.get_current_animation(part)
+            if animation is not None:
+                part_animations[part] = animation
+        if not part_animations:
+            return
+
+        current_cog = self.actors[self.index].get_name()
+        date_string = datetime.now().strftime("%d-%m-%Y-%H-%M-%S")
+        name = "{}-{}-{}".format(current_cog, "-".join(sorted(set(part_animations.values()))), date_string)
+        exporter = AnimationExporter(self.actor, visorview_globals.EXPORT_FRAME_SIZE[0],
+                                     visorview_globals.EXPORT_FRAME_SIZE[1], self.high_resolution_capture)
+        exporter.export(part_animations, os.path.join(visorview_globals.EXPORT_DIR, name + ".png"),
+                        os.path.join(visorview_globals.EXPORT_DIR, name + "-sheet.png"))
+
     def enable_mouse_cam(self):
         """Enables movement of the camera via the mouse."""
         self.camera_controller.enable()
@@ -109,18 +191,20 @@ class VisorView(ShowBase):
         the animation list.
         """
         if self.is_scroll_visible:
-            self.animation_scroll_list.scrollBy(-1)
+            self.animation_scroll_list.scroll_by(-1)
         elif self.actor.is_posed(self.current_pose_part) and self.current_pose_part is not None:
             self.actor.increment_pose(1, self.current_pose_part)
+            self.timeline_bar.set_frame(self.actor.get_current_frame(self.current_pose_part))
 
     def scroll_down(self):
         """Function that should be called when the mousewheel is scrolled down, used for functionality in pose mode
         and the animation list.
         """
         if self.is_scroll_visible:
-            self.animation_scroll_list.scrollBy(1)
+            self.animation_scroll_list.scroll_by(1)
         elif self.actor.is_posed(self.current_pose_part) and self.current_pose_part is not None:
             self.actor.increment_pose(-1, self.current_pose_part)
+            self.timeline_bar.set_frame(self.actor.get_current_frame(self.current_pose_part))
 
     def build_cog(self):
         """Function that swaps to the actor based on the current index."""
@@ -134,6 +218,22 @@ class VisorView(ShowBase):
             self.toggle_posing()
 
         self.actor.set_actor_data(self.actors[self.index])
+        self.prefetcher.prefetch(self.get_neighbouring_actors(), self.actor.is_skelecog())
+
+    def get_neighbouring_actors(self):
+        """Returns the actors the user is likely to view next: the previous and next actors in the current set, and
+        the actors that would be shown by switching to the previous or next set.
+
+        :return: A list of ActorData.
+        :rtype: list[ActorData]
+        """
+        neighbours = [self.actors[(self.index - 1) % len(self.actors)],
+                      self.actors[(self.index + 1) % len(self.actors)]]
+        for offset in (-1, 1):
+            actor_set = ACTORS[COG_SET_NAMES[(self.cog_set_index + offset) % len(COG_SET_NAMES)]]
+            # switch_actor_set keeps the current index where possible
+            neighbours.append(actor_set[min(self.index, len(actor_set) - 1)])
+        return neighbours
 
     def cycle(self, is_left=False, department=False):
         """Function that rotates to the next cog in the list of cogs defined in visorview_globals.py.
@@ -168,6 +268,8 @@ class VisorView(ShowBase):
         if name not in ACTORS.keys():
             return
         self.actors = ACTORS[name]
+        # animation discovery is deferred until a set is first selected
+        self.actors.load_animations()
         self.cog_set_index = COG_SET_NAMES.index(name)
         if self.index >= len(self.actors):
             self.index = len(self.actors) - 1
@@ -179,8 +281,10 @@ class VisorView(ShowBase):
         :param for_posing: When true, the buttons will instead enable pose mode for that part.
         :type for_posing: bool
         """
-        self.animation_scroll_list.removeAndDestroyAllItems()
         parts = self.actor.get_actor_parts()
+        self.animation_list_part = None
+        self.animation_search_entry.set_focus(False)
+        self.animation_search_entry.hide()
 
         if not for_posing and len(parts) < 2:
             # no need to select part when we only have one
@@ -189,13 +293,9 @@ class VisorView(ShowBase):
 
         method = self.start_posing_part if for_posing else self.add_animations_to_list
         label = "POSE PART" if for_posing else "ANIMATE PART"
-        text = DirectLabel(text=label, text_scale=0.1, text_align=TextNode.ALeft, relief=None)
-        self.animation_scroll_list.addItem(text)
-
-        for part in parts:
-            new_button = DirectButton(text=part, text_scale=0.1, text_align=TextNode.ALeft, relief=None,
-                                      suppressMouse=False, command=method, extraArgs=[part])
-            self.animation_scroll_list.addItem(new_button)
+        items = [(label, None, [])]
+        items += [(part, method, [part]) for part in parts]
+        self.animation_scroll_list.set_items(items)
 
     def add_animations_to_list(self, part='modelRoot', want_back_button=True):
         """Function that clears the animation list and adds animations to it, targeting on a specified part.
@@ -205,21 +305,40 @@ class VisorView(ShowBase):
         :param want_back_button: When true, a back button will be added that goes back to the list of actor parts.
         :type want_back_button: bool
         """
-        self.available_animations = self.actor.get_actor_animations(part)
-        self.available_animations.sort()
-        self.animation_scroll_list.removeAndDestroyAllItems()
-
-        if want_back_button:
-            back_button = DirectButton(text="<- BACK", text_scale=0.1, text_align=TextNode.ALeft, relief=None,
-                                       suppressMouse=False, command=self.add_actor_parts_to_list)
-            self.animation_scroll_list.addItem(back_button)
-
-        for i in self.available_animations:
-            if not i == "lose" and not i == "lose_zero":
-                # lose animations have their own body type and viewing them on the wrong model = unpleasant
-                new_button = DirectButton(text=i, text_scale=0.1, text_align=TextNode.ALeft, relief=None,
-                                          suppressMouse=False, command=self.animate_actor, extraArgs=[i, part])
-                self.animation_scroll_list.addItem(new_button)
+        self.animation_list_part = part
+        self.animation_list_back_button = want_back_button
+        self.animation_search_entry.show()
+        self.animation_search_entry.set_focus(True)
+        self.filter_animation_list(self.animation_search_entry.get())
+
+    def filter_animation_list(self, query):
+        """Function that fills the animation list with the animations matching a search query. Called by the search
+        entry after every keystroke; only the text of the list's buttons is changed.
+
+        :param query: The text to search for. Every animation is listed if it's empty.
+        :type query: str
+        """
+        part = self.animation_list_part
+        if part is None:
+            return
+        # sorted, filtered and indexed once per set of animations, rather than every time the list is opened
+        self.available_animations = self.animation_name_index.search(self.actor.get_animation_set_key(part),
+                                                                     self.actor.get_actor_animations(part), query)
+        items = []
+        if self.animation_list_back_button:
+            items.append(("<- BACK", self.add_actor_parts_to_list, []))
+        items += [(animation, self.animate_actor, [animation, part]) for animation in self.available_animations]
+        self.animation_scroll_list.set_items(items)
+
+    def animate_first_search_result(self, query=None):
+        """Function called when enter is pressed in the search entry; plays the first animation in the list.
+
+        :param query: The text in the search entry.
+        :type query: str
+        """
+        if self.animation_list_part is not None and self.available_animations:
+            self.animate_actor(self.available_animations[0], self.animation_list_part)
+        self.animation_search_entry.set_focus(False)
 
     def animate_actor(self, animation, part=None):
         """Method that calls an animation on our actor and disables posing controls if necessary.
@@ -250,12 +369,15 @@ class VisorView(ShowBase):
         """
         if state:
             # we'll be making it visible so prepare the items and disable cam
+            self.animation_search_entry.clear()
             self.add_actor_parts_to_list(for_posing)
             self.animation_scroll_list.show()
             self.disable_mouse_cam()
             self.is_scroll_visible = True
         else:
             self.animation_scroll_list.hide()
+            self.animation_search_entry.set_focus(False)
+            self.animation_search_entry.hide()
             self.enable_mouse_cam()
             self.is_scroll_visible = False
         if for_posing:
@@ -274,6 +396,7 @@ class VisorView(ShowBase):
         """
         if self.current_pose_part is not None:
             self.current_pose_part = None
+            self.timeline_bar.hide()
             return
         parts = self.actor.get_actor_parts()
         if len(parts) > 1:
@@ -290,6 +413,20 @@ class VisorView(ShowBase):
         self.actor.set_pose_mode(True, part)
         self.current_pose_part = part
         self.set_animation_scroll_visibility(False, True)
+        num_frames = self.actor.get_num_frames(part)
+        if num_frames:
+            self.timeline_bar.set_num_frames(num_frames)
+            self.timeline_bar.set_frame(self.actor.get_current_frame(part))
+            self.timeline_bar.show()
+
+    def scrub_pose(self, frame):
+        """Function called when the timeline bar is dragged; poses the posed part on the frame under the thumb.
+
+        :param frame: The frame to pose on, which may be fractional.
+        :type frame: float
+        """
+        if self.current_pose_part is not None:
+            self.actor.set_pose_frame(frame, self.current_pose_part)
 
 
 app = VisorView()